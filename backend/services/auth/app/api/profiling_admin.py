@@ -0,0 +1,43 @@
+"""
+Profiler Admin Endpoints
+/admin/profile for the process-wide profiler (see app.core.profiling)
+"""
+import hmac
+from typing import Any, Callable, Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.profiling import profiler
+
+
+def require_token(token: Optional[str], expected: Optional[str]) -> None:
+    """404 while no token is configured, 403 unless token matches it (constant time)"""
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if token is None or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+
+def admin_router(admin_token: Callable[[], Optional[str]], **kwargs: Any) -> APIRouter:
+    """
+    /admin/profile endpoints for the process-wide profiler
+    admin_token() is read per request; kwargs go to APIRouter (e.g. tags)
+    """
+    router = APIRouter(**kwargs)
+
+    @router.get("/admin/profile", include_in_schema=False)
+    async def profile_snapshot(x_admin_token: Optional[str] = Header(None)):
+        """Per-stage histograms and the slow-request flight recorder"""
+        require_token(x_admin_token, admin_token())
+        return profiler.snapshot()
+
+    @router.put("/admin/profile/sample-rate", include_in_schema=False)
+    async def set_profile_sample_rate(rate: float, x_admin_token: Optional[str] = Header(None)):
+        """Change the sampling rate at runtime (0 turns spans off)"""
+        require_token(x_admin_token, admin_token())
+        if not 0.0 <= rate <= 1.0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="rate must be in [0, 1]")
+        profiler.sample_rate = rate
+        return {"sample_rate": rate}
+
+    return router
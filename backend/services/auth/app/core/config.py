@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     ALLOWED_HOSTS: str = "*"
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
+    COMPRESSION_MINIMUM_SIZE: int = 1400  # Roughly one MTU - smaller bodies go uncompressed
+    COMPRESSION_CACHED_PATHS: str = "/api/openapi.json,/.well-known/jwks.json"
 
     # ==================== Database ====================
     DATABASE_URL: PostgresDsn
@@ -38,12 +40,21 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
     DB_ECHO: bool = False
+    DATABASE_REPLICA_URLS: str = ""  # Comma-separated read replica DSNs
+    DB_REPLICA_HEALTH_CHECK_INTERVAL: int = 10  # Seconds between replica pings
+    DB_REPLICA_HEALTH_CHECK_TIMEOUT: float = 2.0
 
     # ==================== Redis ====================
     REDIS_URL: RedisDsn
     REDIS_MAX_CONNECTIONS: int = 50
     REDIS_DECODE_RESPONSES: bool = True
 
+    # ==================== Messaging ====================
+    RABBITMQ_URL: Optional[str] = None  # Outbox relay is disabled without it
+    OUTBOX_EXCHANGE: str = "betcha.events"
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1.0  # Idle poll; local commits wake the relay sooner
+
     # ==================== JWT ====================
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "RS256"
@@ -62,6 +73,10 @@ class Settings(BaseSettings):
     PASSWORD_REQUIRE_SPECIAL: bool = True
     MAX_LOGIN_ATTEMPTS: int = 5
     LOCKOUT_DURATION_MINUTES: int = 15
+    LOCKOUT_SYNC_INTERVAL_SECONDS: int = 60  # Redis lockout counters -> users rows
+    LOGIN_HISTORY_FLUSH_SECONDS: int = 5  # Buffered failed sign-ins -> login_history
+    EMAIL_FILTER_ERROR_RATE: float = 0.01  # Bloom filter of registered emails
+    EMAIL_FILTER_REBUILD_SECONDS: int = 300
 
     # ==================== Rate Limiting ====================
     RATE_LIMIT_ENABLED: bool = True
@@ -94,6 +109,17 @@ class Settings(BaseSettings):
     SENTRY_ENVIRONMENT: Optional[str] = None
     SENTRY_TRACES_SAMPLE_RATE: float = 0.1
 
+    # ==================== Health Checks ====================
+    READINESS_CACHE_SECONDS: float = 2.0
+    READINESS_CHECK_TIMEOUT: float = 1.0
+    READINESS_POOL_SATURATION: float = 0.9  # Checked-out share of pool reported as degraded
+
+    # ==================== Profiling ====================
+    PROFILER_SAMPLE_RATE: float = Field(default=0.0, ge=0.0, le=1.0)  # 0 disables stage spans
+    PROFILER_SLOW_THRESHOLD_MS: float = 500.0  # Sampled requests slower than this are kept
+    PROFILER_CAPACITY: int = 256  # Flight recorder size
+    PROFILER_ADMIN_TOKEN: Optional[str] = None  # /admin/profile is disabled without it
+
     # ==================== Compliance ====================
     ENABLE_AUDIT_LOGS: bool = True
     ENABLE_LOGIN_HISTORY: bool = True
@@ -108,6 +134,17 @@ class Settings(BaseSettings):
             return v.replace("postgresql://", "postgresql+asyncpg://", 1)
         return v
 
+    @field_validator("DATABASE_REPLICA_URLS")
+    @classmethod
+    def validate_database_replica_urls(cls, v: str) -> str:
+        """Ensure replica URLs use asyncpg driver"""
+        urls = [url.strip() for url in v.split(",") if url.strip()]
+        return ",".join(
+            url.replace("postgresql://", "postgresql+asyncpg://", 1)
+            if url.startswith("postgresql://") else url
+            for url in urls
+        )
+
     @field_validator("ENVIRONMENT")
     @classmethod
     def validate_environment(cls, v: str) -> str:
@@ -126,6 +163,11 @@ class Settings(BaseSettings):
         """Check if running in development"""
         return self.ENVIRONMENT == "development"
 
+    @property
+    def database_replica_urls(self) -> list[str]:
+        """Read replica DSNs (empty when all traffic goes to the primary)"""
+        return [url for url in self.DATABASE_REPLICA_URLS.split(",") if url]
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -1,43 +1,216 @@
 """
 Database Configuration and Session Management
 Uses SQLAlchemy 2.0 async engine
+
+Engines and the session factory are created lazily on first use (or in the
+app lifespan via init_db), so importing this module - from tests, Alembic or
+a freshly forked worker - never reads settings or builds a connection pool.
 """
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+from typing import Any, AsyncGenerator, List, Optional
 
+from sqlalchemy import Select, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.pool import NullPool
 
 from app.core.config import get_settings
+from app.core.profiling import instrument_engine, span
+
+logger = logging.getLogger(__name__)
 
 # ==================== Configuration ====================
-settings = get_settings()
-
-# Create async engine
-engine: AsyncEngine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=settings.DB_ECHO,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,  # Verify connection before using
-    poolclass=NullPool if settings.is_development else None,
-)
+_engine: Optional[AsyncEngine] = None
+_replicas: Optional["ReplicaSet"] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the service pool settings"""
+    settings = get_settings()
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,  # Verify connection before using
+        poolclass=NullPool if settings.is_development else None,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+def get_engine() -> AsyncEngine:
+    """Primary engine (all writes), created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(str(get_settings().DATABASE_URL))
+    return _engine
+
+
+# ==================== Read Replicas ====================
+class ReplicaSet:
+    """
+    Round-robin selection over read replicas
+    Replicas failing the periodic health check are skipped until they recover
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        check_interval: float,
+        check_timeout: float,
+    ):
+        self.engines = engines
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._healthy: List[AsyncEngine] = list(engines)
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Next healthy replica, or None when reads must go to the primary"""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def _ping(self, replica: AsyncEngine) -> bool:
+        try:
+            async with replica.connect() as conn:
+                await asyncio.wait_for(
+                    conn.execute(text("SELECT 1")),
+                    timeout=self.check_timeout,
+                )
+            return True
+        except Exception as e:
+            logger.warning("Read replica health check failed: %s", e)
+            return False
+
+    async def check_health(self) -> None:
+        """Ping every replica concurrently and refresh the healthy set"""
+        results = await asyncio.gather(*(self._ping(e) for e in self.engines))
+        self._healthy = [e for e, ok in zip(self.engines, results) if ok]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_health()
+
+    async def start(self) -> None:
+        """Run an initial health check and start the background checker"""
+        if not self.engines:
+            return
+        await self.check_health()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop health checks and dispose replica engines"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+
+def get_replicas() -> ReplicaSet:
+    """Read replica set, created on first use (empty without DATABASE_REPLICA_URLS)"""
+    global _replicas
+    if _replicas is None:
+        settings = get_settings()
+        _replicas = ReplicaSet(
+            [_create_engine(url) for url in settings.database_replica_urls],
+            check_interval=settings.DB_REPLICA_HEALTH_CHECK_INTERVAL,
+            check_timeout=settings.DB_REPLICA_HEALTH_CHECK_TIMEOUT,
+        )
+    return _replicas
+
+# Session.info keys used for routing
+_PRIMARY_KEY = "use_primary"
+_REPLICA_KEY = "replica"
+
+# Execution option marking a SELECT as safe to serve from a (possibly lagging) replica
+REPLICA_OPTION = "replica_ok"
 
-# Create session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+
+def replica_read(stmt: Select) -> Select:
+    """
+    Mark a read as safe to serve from a replica
+
+    Only for reads whose result never feeds a write in the same request -
+    everything unmarked (writes, flushes, locking and read-then-write
+    queries) goes to the primary.
+    """
+    return stmt.execution_options(**{REPLICA_OPTION: True})
+
+
+def _replica_ok(clause: Any) -> bool:
+    if clause is None or not hasattr(clause, "get_execution_options"):
+        return False
+    return bool(clause.get_execution_options().get(REPLICA_OPTION))
+
+
+class RoutingSession(Session):
+    """
+    Session that sends statements marked with replica_read() to a replica
+
+    The first statement that goes to the primary pins the rest of the
+    session there, so a request reads its own writes. The replica is chosen
+    once per session so a request sees a single snapshot source.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw) -> Engine:
+        if self.info.get(_PRIMARY_KEY) or not _replica_ok(clause):
+            self.info[_PRIMARY_KEY] = True
+            return get_engine().sync_engine
+
+        replica = self.info.get(_REPLICA_KEY)
+        if replica is None:
+            replica = get_replicas().choose() or get_engine()
+            self.info[_REPLICA_KEY] = replica
+        return replica.sync_engine
+
+
+def use_primary(session: AsyncSession) -> None:
+    """
+    Pin the rest of this session to the primary
+    Overrides replica_read() for later statements (e.g. after a read-only prelude)
+    """
+    session.info[_PRIMARY_KEY] = True
+
+
+def on_primary(session: AsyncSession) -> bool:
+    """Whether this session's statements now all go to the primary"""
+    return bool(session.info.get(_PRIMARY_KEY))
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Session factory, created on first use"""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+    return _sessionmaker
 
 # Base class for models
 Base = declarative_base()
@@ -49,10 +222,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     Dependency for FastAPI endpoints
     Provides database session with automatic cleanup
     """
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
-            await session.commit()
+            with span("db.commit"):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -66,14 +240,25 @@ async def init_db() -> None:
     Initialize database connection
     Create tables if they don't exist (for development only)
     """
-    async with engine.begin() as conn:
+    settings = get_settings()
+    get_sessionmaker()
+
+    async with get_engine().begin() as conn:
         if settings.is_development:
             # Create tables (use Alembic migrations in production)
             await conn.run_sync(Base.metadata.create_all)
 
+    await get_replicas().start()
+
 
 async def close_db() -> None:
     """
     Close database connections
+    Resets the lazy accessors so a later init_db starts from a clean state
     """
-    await engine.dispose()
+    global _engine, _replicas, _sessionmaker
+    if _replicas is not None:
+        await _replicas.close()
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = _replicas = _sessionmaker = None
@@ -0,0 +1,273 @@
+"""
+Transactional Outbox
+Domain events written with the change that caused them, relayed to AMQP
+
+enqueue() adds an outbox_events row to the caller's session, so the event
+commits or rolls back with the signup/login it describes - no event for
+a change that didn't happen, no change without its event. A relay task
+claims committed rows in batches (FOR UPDATE SKIP LOCKED, so every worker
+can run one), publishes them with publisher confirms and deletes them once
+the broker has acknowledged the whole batch.
+
+The table is created by the alembic/ migrations (alembic upgrade head).
+
+Delivery is at-least-once: a crash between the confirm and the delete
+republishes the batch. Consumers dedupe on the AMQP message_id (the event
+id). Ordering holds within one relay batch, not across workers.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import aio_pika
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, Uuid, delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import Base, RoutingSession, get_sessionmaker, use_primary
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_ENQUEUED_KEY = "outbox_enqueued"  # Session.info flag: wake the relay after commit
+
+
+class OutboxEvent(Base):
+    """Event waiting to be published (deleted once the broker confirms it)"""
+    __tablename__ = "outbox_events"
+
+    # Relay order (SQLite only autoincrements INTEGER keys - used by the tests)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_id = Column(Uuid(as_uuid=True), nullable=False, default=uuid4)  # Native UUID on Postgres
+    routing_key = Column(String(128), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON, encoded at enqueue time
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)  # UUID, Decimal
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default).decode()
+    return json.dumps(payload, default=_default, separators=(",", ":"))
+
+
+def enqueue(session: AsyncSession, routing_key: str, payload: Dict[str, Any]) -> OutboxEvent:
+    """
+    Add an event to the session's pending changes
+
+    Call before the commit of the change it describes; nothing is published
+    unless that commit succeeds.
+    """
+    outbox_event = OutboxEvent(
+        event_id=uuid4(),
+        routing_key=routing_key,
+        payload=_encode(payload),
+        created_at=datetime.utcnow(),
+    )
+    session.add(outbox_event)
+    session.info[_ENQUEUED_KEY] = True
+    return outbox_event
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _wake_relay(session) -> None:
+    if session.info.pop(_ENQUEUED_KEY, False) and _relay is not None:
+        _relay.wake()
+
+
+# ==================== Brokers ====================
+class OutboxMessage:
+    """One event as handed to a broker"""
+    __slots__ = ("event_id", "routing_key", "body", "created_at")
+
+    def __init__(self, event_id: str, routing_key: str, body: bytes, created_at: datetime):
+        self.event_id = event_id
+        self.routing_key = routing_key
+        self.body = body
+        self.created_at = created_at
+
+
+class AMQPBroker:
+    """
+    Publishes to a durable topic exchange with publisher confirms
+
+    A batch is sent without waiting between messages; publish() returns
+    once every message is confirmed and raises if any is nacked.
+    """
+
+    def __init__(self, url: str, exchange: str):
+        self.url = url
+        self.exchange_name = exchange
+        self._connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+        self._exchange: Optional[aio_pika.abc.AbstractExchange] = None
+
+    async def connect(self) -> None:
+        self._connection = await aio_pika.connect_robust(self.url)
+        channel = await self._connection.channel(publisher_confirms=True)
+        self._exchange = await channel.declare_exchange(
+            self.exchange_name, aio_pika.ExchangeType.TOPIC, durable=True
+        )
+
+    async def publish(self, messages: List[OutboxMessage]) -> None:
+        await asyncio.gather(*(
+            self._exchange.publish(
+                aio_pika.Message(
+                    message.body,
+                    message_id=message.event_id,
+                    content_type="application/json",
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                    timestamp=message.created_at,
+                ),
+                routing_key=message.routing_key,
+                mandatory=False,  # Events nobody subscribes to yet are dropped, not returned
+            )
+            for message in messages
+        ))
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+        self._connection = self._exchange = None
+
+
+class InMemoryBroker:
+    """
+    Broker stand-in for tests and local runs without RabbitMQ
+
+    Keeps published messages in order; fail_next makes the next N
+    publish() calls raise, as a dropped connection or nack would.
+    """
+
+    def __init__(self):
+        self.messages: List[OutboxMessage] = []
+        self.fail_next = 0
+
+    async def connect(self) -> None:
+        pass
+
+    async def publish(self, messages: List[OutboxMessage]) -> None:
+        if self.fail_next:
+            self.fail_next -= 1
+            raise ConnectionError("Broker unavailable")
+        self.messages.extend(messages)
+
+    async def close(self) -> None:
+        pass
+
+
+# ==================== Relay ====================
+_CLAIM = (
+    select(OutboxEvent.id, OutboxEvent.event_id, OutboxEvent.routing_key, OutboxEvent.payload, OutboxEvent.created_at)
+    .order_by(OutboxEvent.id)
+    .with_for_update(skip_locked=True)
+)
+
+
+class OutboxRelay:
+    """
+    Moves committed outbox rows to the broker
+
+    Polls every poll_seconds when idle; a local commit that enqueued events
+    wakes it immediately. Broker errors leave the rows in place for the
+    next attempt.
+    """
+
+    def __init__(
+        self,
+        broker: Any,
+        batch_size: int = 100,
+        poll_seconds: float = 1.0,
+        sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None,
+    ):
+        self.broker = broker
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._sessionmaker = sessionmaker
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def relay_once(self) -> int:
+        """Publish and delete one batch; returns events relayed"""
+        async with (self._sessionmaker or get_sessionmaker())() as db:
+            use_primary(db)
+            rows = (await db.execute(_CLAIM.limit(self.batch_size))).all()
+            if not rows:
+                return 0
+            await self.broker.publish([
+                OutboxMessage(str(row.event_id), row.routing_key, row.payload.encode(), row.created_at)
+                for row in rows
+            ])
+            # Confirmed - only now drop the rows (a failure above rolls back and unlocks them)
+            await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+            await db.commit()
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                while await self.relay_once() == self.batch_size:
+                    pass  # Backlog: keep draining
+            except Exception as e:
+                logger.error(f"Outbox relay failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        await self.broker.connect()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.broker.close()
+
+
+# ==================== Lifecycle Management ====================
+_relay: Optional[OutboxRelay] = None
+
+
+async def init_outbox() -> None:
+    """Start the relay for this worker (events just accumulate without RABBITMQ_URL)"""
+    global _relay
+    settings = get_settings()
+    if not settings.RABBITMQ_URL:
+        logger.warning("RABBITMQ_URL not set - outbox events will not be relayed")
+        return
+    relay = OutboxRelay(
+        AMQPBroker(settings.RABBITMQ_URL, settings.OUTBOX_EXCHANGE),
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        poll_seconds=settings.OUTBOX_POLL_SECONDS,
+    )
+    await relay.start()
+    _relay = relay
+
+
+async def close_outbox() -> None:
+    """Stop the relay; unpublished rows wait for the next worker"""
+    global _relay
+    if _relay is not None:
+        await _relay.stop()
+    _relay = None
@@ -0,0 +1,185 @@
+"""
+Request Stage Profiling
+Context-var spans, per-stage histograms and a slow-request flight recorder
+
+Hot paths wrap their stages in `with span("password.verify"):`. Outside a
+sampled request the context var is unset and span() returns a shared no-op
+context manager, so instrumented code pays one ContextVar lookup.
+
+Shared by auth and supabase-compat, together with app.middleware.profiling.
+No web framework imports here - database code and workers load this module;
+the /admin/profile endpoints live in app.api.profiling_admin.
+"""
+import random
+import time
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+_NOOP = nullcontext()
+
+
+class RequestProfile:
+    """Spans recorded for one sampled request"""
+    __slots__ = ("method", "path", "started", "spans")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []  # (stage, start offset, duration) in seconds
+
+    def record(self, stage: str, started: float, duration: float) -> None:
+        self.spans.append((stage, started - self.started, duration))
+
+    def to_dict(self, total: float, status: Optional[int]) -> Dict[str, Any]:
+        stages: Dict[str, float] = {}
+        for stage, _, duration in self.spans:
+            stages[stage] = stages.get(stage, 0.0) + duration
+        attributed = sum(stages.values())
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round(total * 1000, 3),
+            "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in stages.items()},
+            "unattributed_ms": round(max(total - attributed, 0.0) * 1000, 3),
+            "spans": [
+                {"stage": stage, "offset_ms": round(offset * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for stage, offset, duration in self.spans
+            ],
+        }
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+class _Span:
+    __slots__ = ("profile", "stage", "started")
+
+    def __init__(self, profile: RequestProfile, stage: str):
+        self.profile = profile
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profile.record(self.stage, self.started, time.perf_counter() - self.started)
+
+
+def span(stage: str):
+    """Time a stage of the current request (no-op unless the request is sampled)"""
+    profile = _current.get()
+    if profile is None:
+        return _NOOP
+    return _Span(profile, stage)
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram for one stage"""
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "buckets_ms": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(BUCKETS_MS, self.counts)
+            },
+        }
+
+
+class Profiler:
+    """
+    Samples requests, feeds per-stage histograms and keeps the stage
+    breakdown of sampled requests slower than slow_threshold_ms in a ring
+    buffer (the flight recorder)
+    """
+
+    def __init__(self, sample_rate: float = 0.0, slow_threshold_ms: float = 500.0, capacity: int = 256):
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.histograms: Dict[str, StageHistogram] = {}
+        self.slow_requests: deque = deque(maxlen=capacity)
+
+    def configure(self, sample_rate: float, slow_threshold_ms: float, capacity: int) -> None:
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        if capacity != self.slow_requests.maxlen:
+            self.slow_requests = deque(self.slow_requests, maxlen=capacity)
+
+    def start(self, method: str, path: str) -> Optional[RequestProfile]:
+        """Profile for a sampled request, None otherwise"""
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return None
+        return RequestProfile(method, path)
+
+    def finish(self, profile: RequestProfile, status: Optional[int]) -> None:
+        total = time.perf_counter() - profile.started
+        for stage, _, duration in profile.spans:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram()
+            histogram.observe(duration)
+        if total * 1000 >= self.slow_threshold_ms:
+            self.slow_requests.append(profile.to_dict(total, status))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "stages": {stage: h.to_dict() for stage, h in sorted(self.histograms.items())},
+            "slow_requests": list(self.slow_requests),
+        }
+
+
+# Process-wide profiler, configured at service startup
+profiler = Profiler()
+
+
+def activate(profile: RequestProfile):
+    """Make profile the current request's profile; returns the reset token"""
+    return _current.set(profile)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """Record every statement executed on engine as a db.query span"""
+    from sqlalchemy import event  # Only services with a SQLAlchemy engine need it
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info["profile_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("profile_started", None)
+        profile = _current.get()
+        if started is not None and profile is not None:
+            profile.record("db.query", started, time.perf_counter() - started)
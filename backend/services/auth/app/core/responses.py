@@ -0,0 +1,35 @@
+"""
+Model Responses
+Pydantic models dumped straight to JSON bytes
+
+For an endpoint returning a model under response_model, FastAPI validates
+the object again, converts it to JSON-compatible Python objects and then
+json.dumps them. ModelResponse skips all of that: pydantic-core serializes
+the model to JSON bytes in one pass (same output - by_alias, compact).
+Plain content and error bodies use fastapi.responses.ORJSONResponse.
+
+Shared by auth and supabase-compat (see app.core.profiling).
+"""
+from typing import Sequence, Union
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def dump_model(model: BaseModel) -> bytes:
+    """JSON bytes for a model, as FastAPI's response_model path would render it"""
+    return model.__pydantic_serializer__.to_json(model, by_alias=True)
+
+
+class ModelResponse(JSONResponse):
+    """
+    Trusted model (or list of models) rendered without re-validation
+
+    Only for models the endpoint built itself - the response_model on the
+    route still documents the schema but is no longer enforced.
+    """
+
+    def render(self, content: Union[BaseModel, Sequence[BaseModel]]) -> bytes:
+        if isinstance(content, BaseModel):
+            return dump_model(content)
+        return b"[" + b",".join(dump_model(model) for model in content) + b"]"
@@ -0,0 +1,213 @@
+"""
+Response Compression Middleware
+Content-type and size aware compression with zstd / brotli / gzip negotiation
+"""
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# ==================== Metrics ====================
+COMPRESSION_CPU = Histogram(
+    "http_compression_cpu_seconds",
+    "CPU time spent compressing response bodies",
+    ["encoding", "cached"]
+)
+
+COMPRESSION_BYTES = Counter(
+    "http_compression_bytes_total",
+    "Response bytes before and after compression",
+    ["encoding", "direction"]
+)
+
+# ==================== Encoders ====================
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# (dynamic, cached) compressors per encoding - cached payloads are compressed
+# once, so they use the slowest/best setting
+_ENCODERS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "gzip": (
+        lambda body: gzip.compress(body, compresslevel=6),
+        lambda body: gzip.compress(body, compresslevel=9),
+    ),
+}
+if brotli is not None:
+    _ENCODERS["br"] = (
+        lambda body: brotli.compress(body, quality=4),
+        lambda body: brotli.compress(body, quality=11),
+    )
+if zstandard is not None:
+    _ENCODERS["zstd"] = (
+        zstandard.ZstdCompressor(level=3).compress,
+        zstandard.ZstdCompressor(level=19).compress,
+    )
+
+# Server preference when the client accepts several encodings
+_PREFERENCE = ("zstd", "br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the preferred supported encoding the client accepts
+
+    An encoding is accepted when listed with q > 0, or when it isn't listed
+    and "*" has q > 0 - "gzip;q=0, *" refuses gzip. Items with an
+    unparsable q are ignored.
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality: Optional[float] = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = None
+        if quality is not None:
+            qualities[name] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    for encoding in _PREFERENCE:
+        if encoding in _ENCODERS and qualities.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    """Only text-like payloads benefit from compression"""
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compresses compressible responses of at least minimum_size bytes
+
+    Small JSON payloads (tokens, user objects) are sent as-is - compressing a
+    few hundred bytes costs more CPU than it saves on the wire. Responses for
+    cached_paths (OpenAPI, JWKS) are compressed once per (path, encoding, body)
+    at the highest level and served from memory afterwards. Streaming bodies
+    pass through uncompressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1400,
+        cached_paths: Iterable[str] = (),
+        cache_size: int = 64,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cached_paths = frozenset(cached_paths)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, bytes], bytes]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not is_compressible(
+                    headers.get("content-type", "")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming response - send the held start message and stop buffering
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                body = self._compress(path, encoding, body)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, path: str, encoding: str, body: bytes) -> bytes:
+        dynamic, best = _ENCODERS[encoding]
+        if path not in self.cached_paths:
+            return self._timed(dynamic, encoding, body, cached=False)
+
+        key = (path, encoding, hashlib.sha1(body).digest())
+        compressed = self._cache.get(key)
+        if compressed is None:
+            compressed = self._timed(best, encoding, body, cached=True)
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compressed
+
+    def _timed(
+        self,
+        compress: Callable[[bytes], bytes],
+        encoding: str,
+        body: bytes,
+        cached: bool,
+    ) -> bytes:
+        # thread_time: CPU of the event-loop thread, so the histogram sum over
+        # process_cpu_seconds_total gives compression's share of CPU
+        started = time.thread_time()
+        compressed = compress(body)
+        COMPRESSION_CPU.labels(encoding=encoding, cached=str(cached).lower()).observe(
+            time.thread_time() - started
+        )
+        COMPRESSION_BYTES.labels(encoding=encoding, direction="in").inc(len(body))
+        COMPRESSION_BYTES.labels(encoding=encoding, direction="out").inc(len(compressed))
+        return compressed
@@ -0,0 +1,45 @@
+"""
+Profiling Middleware
+Starts a stage profile for sampled requests (see app.core.profiling)
+"""
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import Profiler, activate, deactivate, profiler as default_profiler
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI so unsampled requests pass straight through - no per-request
+    task or body wrapping like BaseHTTPMiddleware
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Optional[Profiler] = None):
+        self.app = app
+        self.profiler = profiler or default_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.start(scope["method"], scope["path"])
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = activate(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            deactivate(token)
+            self.profiler.finish(profile, status)
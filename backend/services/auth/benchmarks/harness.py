@@ -0,0 +1,518 @@
+"""
+Auth Load Harness
+In-process load test for the auth and supabase-compat services
+
+Usage (needs Postgres binaries or --database-url):
+    # from backend/services/auth
+    python -m benchmarks.harness --service auth --users 10000 --requests 5000
+    python -m benchmarks.harness --service auth --mix login=30,refresh=20,me=50
+    # from backend/services/supabase-compat (it shares auth's app.core)
+    PYTHONPATH=../auth python -m benchmarks.harness --service supabase-compat
+
+- EphemeralPostgres: throwaway cluster (initdb/pg_ctl from PATH or PG_BIN),
+  or pass --database-url to use an existing one
+- use_fake_redis: redis.asyncio clients come from an in-process fakeredis
+- StageTimer: per-request time in password hashing, database, JWT calls and
+  response building/serialization
+- run_workload: mixed operations over synthetic users, driven in-process
+  through httpx.AsyncClient on an ASGI transport
+
+SQLite is not offered: the sign-in fast path (UserLookupService) talks to
+asyncpg directly, so only Postgres exercises the real code path.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+
+STAGES = ("hash", "db", "jwt", "response")
+
+BENCH_PASSWORD = "Bench-Passw0rd!"  # Satisfies the auth service password policy
+
+# Settings the harness needs; anything already in the environment wins
+BENCH_ENVIRONMENT = {
+    "ENVIRONMENT": "staging",  # development pairs NullPool with pool sizing
+    "RATE_LIMIT_ENABLED": "false",
+    "REDIS_URL": "redis://fakeredis:6379/0",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "SECRET_KEY": "bench-secret",
+    "ENCRYPTION_KEY": "bench-encryption-key",
+}
+
+
+def configure_environment(database_url: str) -> None:
+    """Set service settings before get_settings() is first called"""
+    os.environ["DATABASE_URL"] = database_url
+    for key, value in BENCH_ENVIRONMENT.items():
+        os.environ.setdefault(key, value)
+
+
+# ==================== Local Postgres ====================
+
+class EphemeralPostgres:
+    """Throwaway Postgres cluster in a temp directory, removed on exit"""
+
+    def __init__(self, bin_dir: Optional[str] = None):
+        self.bin_dir = bin_dir or os.getenv("PG_BIN", "")
+        self.directory: Optional[str] = None
+        self.url: Optional[str] = None
+
+    def _run(self, tool: str, *args: str) -> None:
+        subprocess.run(
+            [os.path.join(self.bin_dir, tool), *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+    def __enter__(self) -> "EphemeralPostgres":
+        if shutil.which(os.path.join(self.bin_dir, "initdb")) is None:
+            raise SystemExit("initdb not found - install Postgres, set PG_BIN, or pass --database-url")
+
+        self.directory = tempfile.mkdtemp(prefix="auth-bench-pg-")
+        data = os.path.join(self.directory, "data")
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        self._run("initdb", "-D", data, "-U", "postgres", "-A", "trust", "--no-sync")
+        self._run(
+            "pg_ctl", "-D", data, "-w", "-l", os.path.join(self.directory, "postgres.log"),
+            "-o", f"-p {port} -k {self.directory} -c listen_addresses=127.0.0.1",
+            "start",
+        )
+        self.url = f"postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres"
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self._run("pg_ctl", "-D", os.path.join(self.directory, "data"), "-m", "immediate", "stop")
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+async def create_schema() -> None:
+    """Create the service tables (init_db only does this in development)"""
+    import app.models.user  # noqa: F401 - registers the models on Base
+    from app.core.database import Base, get_engine
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed_users(template_email: str, count: int, prefix: str) -> List[str]:
+    """
+    Clone a user created through the API into count synthetic users
+
+    The template went through the service's own signup, so every clone carries
+    a real password hash with the service's hashing parameters - without
+    paying the hashing cost count times.
+    """
+    from sqlalchemy import insert, select
+
+    from app.core.database import get_sessionmaker
+    from app.models.user import User
+
+    table = User.__table__
+    async with get_sessionmaker()() as db:
+        template = (await db.execute(select(table).where(table.c.email == template_email))).mappings().one()
+        emails = [f"{prefix}-{i}@example.com" for i in range(count)]
+        rows = [{**template, "id": uuid4(), "email": email} for email in emails]
+        for start in range(0, len(rows), 1000):
+            await db.execute(insert(table), rows[start:start + 1000])
+        await db.commit()
+    return emails
+
+
+# ==================== Redis ====================
+
+def use_fake_redis() -> None:
+    """Point redis.asyncio.from_url at an in-process fakeredis server"""
+    import fakeredis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+
+    def from_url(url: str, **kwargs):
+        return fakeredis.aioredis.FakeRedis(
+            server=server, decode_responses=kwargs.get("decode_responses", False)
+        )
+
+    redis.asyncio.from_url = from_url
+    redis.asyncio.Redis.from_url = classmethod(lambda cls, url, **kwargs: from_url(url, **kwargs))
+
+
+# ==================== Stage Timing ====================
+
+_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("bench_stages", default=None)
+_open: ContextVar[frozenset] = ContextVar("bench_open_stages", default=frozenset())
+
+
+def _record(stage: str, seconds: float) -> None:
+    stages = _stages.get()
+    if stages is not None:
+        stages[stage] += seconds
+
+
+def _timed(stage: str, func: Callable) -> Callable:
+    def wrapper(*args, **kwargs):
+        open_stages = _open.get()
+        if stage in open_stages:
+            return func(*args, **kwargs)  # Nested in a call already timing this stage
+        token = _open.set(open_stages | {stage})
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(stage, time.perf_counter() - started)
+            _open.reset(token)
+    return wrapper
+
+
+def _timed_async(stage: str, func: Callable) -> Callable:
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _record(stage, time.perf_counter() - started)
+    return wrapper
+
+
+def time_stage(stage: str, owner: object, *names: str) -> None:
+    """Attribute calls to owner.<name> (e.g. a service's response builders) to stage"""
+    for name in names:
+        setattr(owner, name, _timed(stage, getattr(owner, name)))
+
+
+class StageTimer:
+    """
+    Attributes time inside password hashing, database and JWT calls and
+    response serialization to the request being driven
+
+    Hooks: passlib CryptContext.hash/verify, SQLAlchemy cursor execution
+    events, asyncpg Connection.fetchrow (UserLookupService fast path),
+    PyJWT / python-jose encode/decode, and FastAPI's response_model
+    serialization plus JSON rendering. Services add their own response
+    builders with time_stage().
+    """
+
+    def install(self) -> None:
+        from passlib.context import CryptContext
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        CryptContext.hash = _timed("hash", CryptContext.hash)
+        CryptContext.verify = _timed("hash", CryptContext.verify)
+
+        @event.listens_for(Engine, "before_cursor_execute")
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("bench_started", []).append(time.perf_counter())
+
+        @event.listens_for(Engine, "after_cursor_execute")
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            _record("db", time.perf_counter() - conn.info["bench_started"].pop())
+
+        import asyncpg
+        asyncpg.Connection.fetchrow = _timed_async("db", asyncpg.Connection.fetchrow)
+
+        import fastapi.routing
+        from fastapi.responses import JSONResponse, ORJSONResponse
+        from app.core.responses import ModelResponse
+        fastapi.routing.serialize_response = _timed_async("response", fastapi.routing.serialize_response)
+        for response_class in (JSONResponse, ORJSONResponse, ModelResponse):
+            response_class.render = _timed("response", response_class.render)
+
+        import jwt
+        jwt.encode = _timed("jwt", jwt.encode)
+        jwt.decode = _timed("jwt", jwt.decode)
+        try:
+            from jose import jwt as jose_jwt
+        except ImportError:  # pragma: no cover - optional dependency
+            return
+        jose_jwt.encode = _timed("jwt", jose_jwt.encode)
+        jose_jwt.decode = _timed("jwt", jose_jwt.decode)
+
+
+# ==================== Workload ====================
+
+@dataclass
+class SyntheticUser:
+    email: str
+    password: str = BENCH_PASSWORD
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+
+
+# (client, user) -> response; operations update the user's tokens themselves
+Operation = Callable[[httpx.AsyncClient, SyntheticUser], Awaitable[httpx.Response]]
+
+
+def fresh_user() -> SyntheticUser:
+    """New user for signup operations"""
+    return SyntheticUser(f"signup-{uuid4().hex}@example.com")
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    stages: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    errors: int = 0
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'login=20,get_user=70,refresh=10' -> weights"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    operations: Dict[str, Operation],
+    mix: Dict[str, float],
+    users: List[SyntheticUser],
+    requests: int,
+    concurrency: int,
+    seed: int = 42,
+) -> tuple:
+    """Drive requests operations drawn from mix; returns (stats per operation, elapsed)"""
+    unknown = set(mix) - set(operations)
+    if unknown:
+        raise SystemExit(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+
+    rnd = random.Random(seed)
+    names = list(mix)
+    plan = rnd.choices(names, weights=[mix[n] for n in names], k=requests)
+    targets = [rnd.choice(users) for _ in range(requests)]
+    stats = {name: OperationStats() for name in names}
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            name = plan[i]
+            stages = dict.fromkeys(STAGES, 0.0)
+            token = _stages.set(stages)
+            started = time.perf_counter()
+            try:
+                response = await operations[name](client, targets[i])
+            finally:
+                _stages.reset(token)
+            op = stats[name]
+            op.latencies.append(time.perf_counter() - started)
+            for stage, seconds in stages.items():
+                op.stages[stage] += seconds
+            if response.status_code >= 400:
+                op.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def report(stats: Dict[str, OperationStats], elapsed: float) -> None:
+    total = sum(len(op.latencies) for op in stats.values())
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    print(
+        f"{'operation':<10} {'count':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8}"
+        f" {'hash':>8} {'db':>8} {'jwt':>8} {'response':>8} {'other':>8} {'errors':>7}"
+    )
+    for name, op in stats.items():
+        count = len(op.latencies)
+        if count < 2:
+            continue
+        p = statistics.quantiles(op.latencies, n=100)
+        mean = statistics.fmean(op.latencies)
+        stage_means = {stage: op.stages[stage] / count for stage in STAGES}
+        other = mean - sum(stage_means.values())
+        print(
+            f"{name:<10} {count:>6} {count / elapsed:>7.0f}"
+            f" {p[49] * 1000:>6.1f}ms {p[94] * 1000:>6.1f}ms {p[98] * 1000:>6.1f}ms"
+            + "".join(f" {stage_means[stage] * 1000:>6.1f}ms" for stage in STAGES)
+            + f" {other * 1000:>6.1f}ms {op.errors:>7}"
+        )
+    print("Latency columns are percentiles; stage columns are mean time per request")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--service", choices=sorted(SERVICES), required=True)
+    parser.add_argument("--database-url", help="Existing postgresql+asyncpg:// database (default: ephemeral)")
+    parser.add_argument("--users", type=int, default=1000, help="Synthetic users to seed")
+    parser.add_argument("--sessions", type=int, default=50, help="Users logged in before the run (token holders)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", type=parse_mix, help="Operation weights (default: per service)")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+async def run(args: argparse.Namespace, service: "Service") -> None:
+    """
+    Set up stand-ins, seed users, log in the session holders and drive the mix
+
+    Operations run against the --sessions users (logged in before timing
+    starts); --users only sets the size of the users table.
+    """
+    with contextlib.ExitStack() as stack:
+        url = args.database_url or stack.enter_context(EphemeralPostgres()).url
+        configure_environment(url)
+        use_fake_redis()
+        StageTimer().install()
+
+        from app.core.database import close_db
+
+        app = service.build_app()
+        await create_schema()
+        run_id = uuid4().hex[:8]
+        try:
+            # ASGITransport doesn't send lifespan events - run startup/shutdown here
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                    template = SyntheticUser(f"bench-{run_id}-template@example.com")
+                    (await service.signup(client, template)).raise_for_status()
+                    emails = await seed_users(template.email, args.users, f"bench-{run_id}")
+
+                    users = [SyntheticUser(email) for email in emails[:args.sessions]]
+                    for user in users:
+                        (await service.login(client, user)).raise_for_status()
+
+                    stats, elapsed = await run_workload(
+                        client,
+                        service.operations,
+                        args.mix or parse_mix(service.default_mix),
+                        users,
+                        args.requests,
+                        args.concurrency,
+                        args.seed,
+                    )
+        finally:
+            await close_db()
+
+    report(stats, elapsed)
+
+
+# ==================== Services ====================
+# Each service's endpoints as operations; the rest of the run is shared
+
+def _store_tokens(user: SyntheticUser, tokens: Dict[str, Any]) -> None:
+    user.access_token = tokens["access_token"]
+    user.refresh_token = tokens.get("refresh_token", user.refresh_token)
+
+
+def _token_operation(method: str, path: str, body: Callable, tokens: Callable, **kwargs) -> Operation:
+    """Operation that stores the tokens it gets back (tokens(json) -> dict)"""
+    async def operation(client: httpx.AsyncClient, user: SyntheticUser) -> httpx.Response:
+        response = await client.request(method, path, json=body(user), **kwargs)
+        if response.status_code == 200:
+            _store_tokens(user, tokens(response.json()))
+        return response
+    return operation
+
+
+def _bearer_operation(path: str) -> Operation:
+    async def operation(client: httpx.AsyncClient, user: SyntheticUser) -> httpx.Response:
+        return await client.get(path, headers={"Authorization": f"Bearer {user.access_token}"})
+    return operation
+
+
+def _signup_fresh(signup: Operation) -> Operation:
+    return lambda client, user: signup(client, fresh_user())
+
+
+def _credentials(user: SyntheticUser) -> Dict[str, str]:
+    return {"email": user.email, "password": user.password}
+
+
+@dataclass
+class Service:
+    build_app: Callable[[], Any]
+    signup: Operation
+    login: Operation
+    operations: Dict[str, Operation]
+    default_mix: str
+
+
+def _build_auth_app():
+    from main import create_application
+    return create_application()
+
+
+def _build_supabase_compat_app():
+    import main
+    time_stage("response", main, "user_to_response", "create_session_response", "auth_response")
+    return main.app
+
+
+def _auth_service() -> Service:
+    prefix = "/api/v1/auth"
+    register = _token_operation("POST", f"{prefix}/register", _credentials, lambda data: data)
+    login = _token_operation("POST", f"{prefix}/login", _credentials, lambda data: data)
+    refresh = _token_operation(
+        "POST", f"{prefix}/refresh", lambda user: {"refresh_token": user.refresh_token}, lambda data: data
+    )
+    return Service(
+        build_app=_build_auth_app,
+        signup=register,
+        login=login,
+        operations={
+            "register": _signup_fresh(register),
+            "login": login,
+            "refresh": refresh,
+            "me": _bearer_operation(f"{prefix}/me"),
+        },
+        default_mix="login=20,refresh=10,me=70",
+    )
+
+
+def _supabase_compat_service() -> Service:
+    # No refresh grant in supabase-compat yet, so no refresh operation
+    signup = _token_operation("POST", "/auth/v1/signup", _credentials, lambda data: data["session"])
+    signin = _token_operation(
+        "POST", "/auth/v1/token", _credentials, lambda data: data["session"], params={"grant_type": "password"}
+    )
+    return Service(
+        build_app=_build_supabase_compat_app,
+        signup=signup,
+        login=signin,
+        operations={
+            "signup": _signup_fresh(signup),
+            "signin": signin,
+            "get_user": _bearer_operation("/auth/v1/user"),
+        },
+        default_mix="signin=30,get_user=70",
+    )
+
+
+SERVICES: Dict[str, Callable[[], Service]] = {
+    "auth": _auth_service,
+    "supabase-compat": _supabase_compat_service,
+}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+    await run(args, SERVICES[args.service]())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,4 @@
+"""
+pytest root for auth
+Tests import the app package from this directory.
+"""
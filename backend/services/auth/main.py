@@ -1,6 +1,9 @@
 """
 Betcha Auth Service
 Production-grade authentication microservice with FastAPI
+
+Served through the application factory (uvicorn main:create_application --factory)
+so importing this module stays cheap: settings, engines and the app are built per worker.
 """
 import logging
 import sys
@@ -11,16 +14,21 @@ import structlog
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from prometheus_client import Counter, Histogram, make_asgi_app
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.api.profiling_admin import admin_router
 from app.api.v1 import router as api_v1_router
 from app.core.config import get_settings
 from app.core.database import close_db, init_db
+from app.core.health import NOT_READY, ReadinessChecker
+from app.core.outbox import close_outbox, init_outbox
+from app.core.profiling import profiler
 from app.core.redis import close_redis, init_redis
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
@@ -75,7 +83,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     try:
         await init_db()
         await init_redis()
-        logger.info("Database and Redis connections initialized")
+        await init_outbox()
+        logger.info("Database, Redis and outbox relay initialized")
     except Exception as e:
         logger.error("Failed to initialize connections", error=str(e))
         sys.exit(1)
@@ -84,6 +93,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 
     # Shutdown
     logger.info("Shutting down Auth Service")
+    await close_outbox()
     await close_redis()
     await close_db()
     logger.info("Auth Service stopped")
@@ -104,6 +114,7 @@ def create_application() -> FastAPI:
         redoc_url="/api/redoc" if settings.ENVIRONMENT == "development" else None,
         openapi_url="/api/openapi.json" if settings.ENVIRONMENT == "development" else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # ==================== Middleware ====================
@@ -128,8 +139,12 @@ def create_application() -> FastAPI:
         max_age=3600,
     )
 
-    # GZip Compression
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Compression (content-type / size aware, zstd > br > gzip)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        cached_paths=settings.COMPRESSION_CACHED_PATHS.split(","),
+    )
 
     # Rate Limiting
     app.add_middleware(RateLimitMiddleware)
@@ -137,20 +152,28 @@ def create_application() -> FastAPI:
     # Request ID
     app.add_middleware(RequestIDMiddleware)
 
+    # Stage profiling (outermost, so sampled requests cover the whole stack)
+    profiler.configure(
+        sample_rate=settings.PROFILER_SAMPLE_RATE,
+        slow_threshold_ms=settings.PROFILER_SLOW_THRESHOLD_MS,
+        capacity=settings.PROFILER_CAPACITY,
+    )
+    app.add_middleware(ProfilingMiddleware)
+
     # ==================== Exception Handlers ====================
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
         request: Request,
         exc: RequestValidationError
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle validation errors"""
         logger.warning(
             "Validation error",
             path=request.url.path,
             errors=exc.errors()
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
                 "detail": exc.errors(),
@@ -162,7 +185,7 @@ def create_application() -> FastAPI:
     async def global_exception_handler(
         request: Request,
         exc: Exception
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle all uncaught exceptions"""
         logger.error(
             "Unhandled exception",
@@ -170,7 +193,7 @@ def create_application() -> FastAPI:
             error=str(exc),
             exc_info=True
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "Internal server error"},
         )
@@ -183,28 +206,30 @@ def create_application() -> FastAPI:
         """Basic health check"""
         return {"status": "healthy", "service": "auth"}
 
+    readiness = ReadinessChecker(
+        cache_seconds=settings.READINESS_CACHE_SECONDS,
+        timeout=settings.READINESS_CHECK_TIMEOUT,
+        saturation_threshold=settings.READINESS_POOL_SATURATION,
+    )
+
     @app.get("/health/ready", tags=["Health"])
     async def readiness_check():
-        """Readiness check (includes dependencies)"""
-        from app.core.database import engine
-        from app.core.redis import redis_client
-
-        try:
-            # Check database
-            async with engine.begin() as conn:
-                await conn.execute("SELECT 1")
-
-            # Check Redis
-            await redis_client.ping()
-
-            return {"status": "ready", "service": "auth"}
-        except Exception as e:
-            logger.error("Readiness check failed", error=str(e))
-            return JSONResponse(
+        """Readiness check (includes dependencies, cached briefly)"""
+        result = await readiness.check()
+
+        if result["status"] == NOT_READY:
+            logger.error("Readiness check failed", checks=result["checks"])
+            return ORJSONResponse(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content={"status": "not ready", "error": str(e)}
+                content=result
             )
 
+        # Degraded (pool saturated) still serves traffic
+        return result
+
+    # Stage profiler / flight recorder
+    app.include_router(admin_router(lambda: settings.PROFILER_ADMIN_TOKEN, tags=["Admin"]))
+
     # Include API routes
     app.include_router(api_v1_router, prefix="/api/v1")
 
@@ -212,49 +237,44 @@ def create_application() -> FastAPI:
     metrics_app = make_asgi_app()
     app.mount("/metrics", metrics_app)
 
-    return app
-
-
-# ==================== Application Instance ====================
-app = create_application()
-
+    # ==================== Request Logging Middleware ====================
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        """Log all HTTP requests"""
+        import time
 
-# ==================== Request Logging Middleware ====================
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests"""
-    import time
+        start_time = time.time()
 
-    start_time = time.time()
+        # Process request
+        response = await call_next(request)
 
-    # Process request
-    response = await call_next(request)
+        # Calculate duration
+        duration = time.time() - start_time
 
-    # Calculate duration
-    duration = time.time() - start_time
+        # Update metrics
+        REQUEST_COUNT.labels(
+            method=request.method,
+            endpoint=request.url.path,
+            status=response.status_code
+        ).inc()
 
-    # Update metrics
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
+        REQUEST_DURATION.labels(
+            method=request.method,
+            endpoint=request.url.path
+        ).observe(duration)
 
-    REQUEST_DURATION.labels(
-        method=request.method,
-        endpoint=request.url.path
-    ).observe(duration)
+        # Log request
+        logger.info(
+            "HTTP request",
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            duration=f"{duration:.3f}s"
+        )
 
-    # Log request
-    logger.info(
-        "HTTP request",
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration=f"{duration:.3f}s"
-    )
+        return response
 
-    return response
+    return app
 
 
 if __name__ == "__main__":
@@ -263,7 +283,8 @@ if __name__ == "__main__":
     settings = get_settings()
 
     uvicorn.run(
-        "main:app",
+        "main:create_application",
+        factory=True,
         host="0.0.0.0",
         port=8000,
         reload=settings.ENVIRONMENT == "development",
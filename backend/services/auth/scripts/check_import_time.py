@@ -0,0 +1,63 @@
+"""
+Import-Time Budget Check
+Profiles `import main` (or the given modules) with `python -X importtime` and
+fails when the total exceeds the budget
+
+Usage (from backend/services/auth):
+    python scripts/check_import_time.py --budget-ms 1500
+    python scripts/check_import_time.py --module app.core.database --module app.core.outbox
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+
+def profile_import(modules: List[str]) -> List[Tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, name) for every module imported by `modules`"""
+    statement = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=SERVICE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"{statement} failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", action="append", help="Module to import (repeatable, default: main)")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    modules = args.module or ["main"]
+    rows = profile_import(modules)
+    # Top-level rows only: a listed module already imported by an earlier one is counted there
+    total_ms = sum(cum for _, cum, name in rows if name[1:] in modules) / 1000
+
+    print(f"Slowest imports (cumulative) for `import {', '.join(modules)}`:")
+    for _, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"Total: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if total_ms > args.budget_ms:
+        raise SystemExit(f"Import time {total_ms:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
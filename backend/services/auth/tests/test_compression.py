@@ -0,0 +1,37 @@
+"""
+Compression Tests
+Accept-Encoding negotiation
+"""
+import pytest
+
+from app.middleware import compression
+from app.middleware.compression import negotiate_encoding
+
+
+@pytest.fixture(autouse=True)
+def gzip_only(monkeypatch):
+    # brotli / zstandard are optional - pin the encoders so results don't depend on them
+    monkeypatch.setattr(compression, "_ENCODERS", {"gzip": compression._ENCODERS["gzip"]})
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("GZIP;q=0.5", "gzip"),
+    ("deflate", None),
+    ("", None),
+    ("*", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0, *", None),  # Explicit refusal wins over the wildcard
+    ("*, gzip;q=0", None),
+    ("gzip;q=0.0, *;q=1", None),
+    ("*;q=0", None),
+    ("*;q=0, gzip", "gzip"),
+    ("gzip;q=oops, *", "gzip"),  # Unparsable item ignored; the wildcard still covers gzip
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_refused_encoding_falls_back_to_the_next_preference(monkeypatch):
+    monkeypatch.setattr(compression, "_ENCODERS", {"br": None, "gzip": None})
+    assert negotiate_encoding("br;q=0, *") == "gzip"
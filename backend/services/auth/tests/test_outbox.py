@@ -0,0 +1,82 @@
+"""
+Outbox Tests
+Events commit or roll back with their change, and are deleted once confirmed
+"""
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.outbox import InMemoryBroker, OutboxEvent, OutboxRelay, enqueue
+
+
+def _run(tmp_path, scenario):
+    """Run scenario(sessionmaker) against a fresh SQLite outbox_events table"""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(OutboxEvent.__table__.create)
+        try:
+            return await scenario(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def _pending(sessionmaker) -> int:
+    async with sessionmaker() as db:
+        return (await db.execute(select(func.count()).select_from(OutboxEvent))).scalar_one()
+
+
+def test_committed_event_is_published_then_deleted(tmp_path):
+    broker = InMemoryBroker()
+
+    async def scenario(sessionmaker):
+        async with sessionmaker() as db:
+            event = enqueue(db, "auth.user.signed_up", {"user_id": "user-1"})
+            await db.commit()
+        committed = await _pending(sessionmaker)
+        relayed = await OutboxRelay(broker, sessionmaker=sessionmaker).relay_once()
+        return event, committed, relayed, await _pending(sessionmaker)
+
+    event, committed, relayed, left = _run(tmp_path, scenario)
+    assert (committed, relayed, left) == (1, 1, 0)
+    [message] = broker.messages
+    assert message.event_id == str(event.event_id)  # Consumers dedupe on it
+    assert message.routing_key == "auth.user.signed_up"
+    assert json.loads(message.body) == {"user_id": "user-1"}
+
+
+def test_rolled_back_change_publishes_nothing(tmp_path):
+    broker = InMemoryBroker()
+
+    async def scenario(sessionmaker):
+        async with sessionmaker() as db:
+            enqueue(db, "auth.user.signed_up", {"user_id": "user-1"})
+            await db.rollback()
+        relayed = await OutboxRelay(broker, sessionmaker=sessionmaker).relay_once()
+        return relayed, await _pending(sessionmaker)
+
+    assert _run(tmp_path, scenario) == (0, 0)
+    assert broker.messages == []
+
+
+def test_unconfirmed_batch_stays_for_the_next_attempt(tmp_path):
+    broker = InMemoryBroker()
+    broker.fail_next = 1
+
+    async def scenario(sessionmaker):
+        async with sessionmaker() as db:
+            enqueue(db, "auth.user.logged_in", {"user_id": "user-1"})
+            await db.commit()
+        relay = OutboxRelay(broker, sessionmaker=sessionmaker)
+        with pytest.raises(ConnectionError):
+            await relay.relay_once()
+        kept = await _pending(sessionmaker)
+        return kept, await relay.relay_once(), await _pending(sessionmaker)
+
+    assert _run(tmp_path, scenario) == (1, 1, 0)
+    assert len(broker.messages) == 1
@@ -0,0 +1,34 @@
+"""
+Profiling Tests
+The core profiler stays importable without the web framework
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_core_profiler_does_not_import_fastapi():
+    # database.py imports the profiler, so Alembic and the outbox relay load it too
+    check = "import sys, app.core.profiling; assert 'fastapi' not in sys.modules, 'fastapi imported'"
+    subprocess.run([sys.executable, "-c", check], cwd=SERVICE_ROOT, check=True)
+
+
+def test_span_is_a_no_op_outside_a_sampled_request():
+    from app.core.profiling import Profiler, activate, deactivate, span
+
+    with span("db.query"):
+        pass
+
+    profiler = Profiler(sample_rate=1.0, slow_threshold_ms=0.0)
+    profile = profiler.start("GET", "/health")
+    token = activate(profile)
+    try:
+        with span("db.query"):
+            pass
+    finally:
+        deactivate(token)
+    profiler.finish(profile, 200)
+    assert profiler.histograms["db.query"].count == 1
+    assert profiler.snapshot()["slow_requests"][0]["path"] == "/health"
@@ -7,12 +7,19 @@ from typing import Optional
 from uuid import UUID
 
 import jwt
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.database import use_primary
+from app.core.outbox import enqueue
+from app.core.profiling import span
 from app.models.user import User, UserSession, LoginHistory
+from app.services.email_filter import get_registered_emails
+from app.services.lockout import get_lockout
+from app.services.login_history import get_login_history
 from app.services.password import PasswordService
+from app.services.user_lookup import UserLookupService
 
 
 class AuthService:
@@ -24,6 +31,9 @@ class AuthService:
         self.db = db
         self.settings = get_settings()
         self.password_service = PasswordService()
+        self.lockout = get_lockout()
+        self.registered_emails = get_registered_emails()
+        self.login_history = get_login_history()
 
     async def create_user(
         self,
@@ -47,7 +57,8 @@ class AuthService:
         Raises:
             ValueError: If user already exists
         """
-        # Check if user exists
+        # Check if user exists (on the primary - replicas may lag)
+        use_primary(self.db)
         result = await self.db.execute(
             select(User).where(User.email == email)
         )
@@ -72,8 +83,16 @@ class AuthService:
         )
 
         self.db.add(user)
+        await self.db.flush()  # Assigns user.id for the event
+        enqueue(self.db, "auth.user.signed_up", {
+            "user_id": user.id,
+            "email": user.email,
+            "full_name": user.full_name,
+            "created_at": user.created_at,
+        })
         await self.db.commit()
         await self.db.refresh(user)
+        await self.registered_emails.add(email)
 
         return user
 
@@ -96,26 +115,33 @@ class AuthService:
         Returns:
             User object if authentication successful, None otherwise
         """
-        # Find user
-        result = await self.db.execute(
-            select(User).where(User.email == email)
-        )
-        user = result.scalar_one_or_none()
+        # Locked out: rejected before any database or hashing work (the
+        # lockout itself is the audit record - see LoginLockout). Skipping
+        # the hash here is deliberate: the fast reject is the point of the
+        # Redis lockout, and it reveals nothing - unknown emails are counted
+        # and locked the same way.
+        if await self.lockout.is_locked(email):
+            return None
 
-        # Log failed attempt if user not found
-        if not user:
-            await self._log_login_attempt(
-                email=email,
-                success=False,
-                failure_reason="User not found",
-                ip_address=ip_address,
-                user_agent=user_agent,
+        # Find user (definitely unregistered addresses skip the query)
+        user = None
+        if await self.registered_emails.might_exist(email):
+            result = await self.db.execute(
+                select(User).where(User.email == email)
             )
+            user = result.scalar_one_or_none()
+
+        # Unknown email: no database write - the Redis failure counter is its only record
+        if not user:
+            # Same Argon2 cost as a wrong password, so timing doesn't reveal the miss
+            self.password_service.dummy_verify(password)
+            await self.lockout.record_failure(email, audit=False)
             return None
 
-        # Check if account is locked
+        # Check if account is locked (suspended, or a lockout synced to the row)
         if not user.can_login:
-            await self._log_login_attempt(
+            self.password_service.dummy_verify(password)
+            self.login_history.record(
                 email=email,
                 user_id=user.id,
                 success=False,
@@ -127,16 +153,11 @@ class AuthService:
 
         # Verify password
         if not self.password_service.verify_password(password, user.password_hash):
-            # Increment failed attempts
-            user.failed_login_attempts += 1
-            if user.failed_login_attempts >= self.settings.MAX_LOGIN_ATTEMPTS:
-                user.locked_until = datetime.utcnow() + timedelta(
-                    minutes=self.settings.LOCKOUT_DURATION_MINUTES
-                )
-
-            await self.db.commit()
+            # Counted in Redis; the users row gets it from the periodic sync,
+            # login_history from the batched writer
+            await self.lockout.record_failure(email)
 
-            await self._log_login_attempt(
+            self.login_history.record(
                 email=email,
                 user_id=user.id,
                 success=False,
@@ -150,7 +171,13 @@ class AuthService:
         user.failed_login_attempts = 0
         user.last_login_at = datetime.utcnow()
         user.last_login_ip = ip_address
+        enqueue(self.db, "auth.user.logged_in", {
+            "user_id": user.id,
+            "logged_in_at": user.last_login_at,
+            "ip_address": ip_address,
+        })
         await self.db.commit()
+        await self.lockout.clear(email)
 
         await self._log_login_attempt(
             email=email,
@@ -214,16 +241,17 @@ class AuthService:
         Returns:
             True if session was revoked, False if not found
         """
-        result = await self.db.execute(
-            select(UserSession).where(UserSession.id == session_id)
-        )
-        session = result.scalar_one_or_none()
+        # Fast-path read, then a single UPDATE by id - no ORM load
+        session = await UserLookupService(self.db).get_session(session_id)
 
         if not session:
             return False
 
-        session.is_active = False
-        session.revoked_at = datetime.utcnow()
+        await self.db.execute(
+            update(UserSession)
+            .where(UserSession.id == session.id)
+            .values(is_active=False, revoked_at=datetime.utcnow())
+        )
         await self.db.commit()
 
         return True
@@ -240,7 +268,8 @@ class AuthService:
             "type": "refresh",
         }
 
-        return jwt.encode(payload, self.settings.JWT_SECRET_KEY, algorithm="HS256")
+        with span("jwt.encode"):
+            return jwt.encode(payload, self.settings.JWT_SECRET_KEY, algorithm="HS256")
 
     async def _log_login_attempt(
         self,
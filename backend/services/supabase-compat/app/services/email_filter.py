@@ -0,0 +1,225 @@
+"""
+Registered Email Filter
+In-memory Bloom filter of users.email so sign-ins for unknown addresses skip the database
+
+Most credential-stuffing traffic targets addresses that were never
+registered. A Bloom filter answers "definitely not registered" with no
+false negatives, so those attempts cost a hash and no lookup. Hits (real
+users and the ~1% false positives) still go to the database.
+
+The filter is refreshed every EMAIL_FILTER_REBUILD_SECONDS. Only the worker
+that takes a Redis lock for the cycle scans users.email; it publishes the
+filter to Redis and the other workers load it from there, so the table is
+read once per cycle rather than once per process. Signups add to the local
+filter and set a short-lived Redis marker. A filter miss checks that
+marker, so an account created on another worker can sign in before the
+next refresh.
+"""
+import asyncio
+import base64
+import hashlib
+import logging
+import math
+import struct
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.core.database import get_sessionmaker
+from app.core.profiling import span
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+MIN_CAPACITY = 100_000
+REBUILD_BATCH_SIZE = 10_000
+SHARED_POLL_SECONDS = 5  # Retry delay while another worker builds the filter
+
+FILTER_KEY = "auth:email_filter"  # Latest filter (base64 - readable with decode_responses on or off)
+REBUILD_LOCK_KEY = "auth:email_filter:rebuild"  # Held by that worker for one cycle
+
+
+def _normalize(email: str) -> str:
+    # Case-folded: a differently-cased attempt is at worst a false positive
+    return email.strip().lower()
+
+
+def _marker_key(email: str) -> str:
+    return f"auth:registered:{email}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    __slots__ = ("size", "hashes", "bits")
+
+    _header = struct.Struct("<QI")  # size, hashes - ahead of the bits when serialized
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return ((h1 + i * h2) % size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        bits = self.bits
+        for position in self._positions(value):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def to_bytes(self) -> bytes:
+        return self._header.pack(self.size, self.hashes) + self.bits
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hashes = cls._header.unpack_from(data)
+        bloom.bits = bytearray(data[cls._header.size:])
+        if len(bloom.bits) != (bloom.size + 7) // 8:
+            raise ValueError("Truncated Bloom filter")
+        return bloom
+
+
+class RegisteredEmails:
+    """
+    Process-wide filter of registered emails
+
+    Until the first refresh completes every email "may exist", so sign-in
+    falls back to the database rather than rejecting real users.
+    """
+
+    def __init__(self, error_rate: float, rebuild_interval: int):
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        # A shared filter is up to one cycle old when loaded and is used for
+        # another; markers outlive both, so no signup falls between filter and marker
+        self.marker_ttl = 2 * rebuild_interval + 60
+        self._filter: Optional[BloomFilter] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self):
+        from app.core.redis import redis_client  # Created by init_redis() at startup
+
+        return redis_client
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    async def might_exist(self, email: str) -> bool:
+        """False only when the address is certainly not registered"""
+        bloom = self._filter
+        if bloom is None:
+            return True
+        email = _normalize(email)
+        with span("email_filter.check"):
+            if email in bloom:
+                return True
+        try:
+            # Registered on another worker since this filter was built?
+            return bool(await self.redis.exists(_marker_key(email)))
+        except RedisError as e:
+            logger.warning(f"Email filter marker check failed open: {e}")
+            return True
+
+    async def add(self, email: str) -> None:
+        """Record a new signup locally and for the other workers"""
+        email = _normalize(email)
+        if self._filter is not None:
+            self._filter.add(email)
+        try:
+            await self.redis.set(_marker_key(email), 1, ex=self.marker_ttl)
+        except RedisError as e:
+            logger.warning(f"Email filter marker not set: {e}")
+
+    async def refresh(self) -> bool:
+        """
+        Rebuild the filter, or load the one another worker built this cycle
+
+        Returns False while that worker's build hasn't been published yet.
+        Without Redis every worker rebuilds from the database.
+        """
+        try:
+            leader = await self.redis.set(REBUILD_LOCK_KEY, 1, nx=True, ex=self.rebuild_interval)
+            shared = None if leader else await self.redis.get(FILTER_KEY)
+        except RedisError as e:
+            logger.warning(f"Shared email filter unavailable, rebuilding locally: {e}")
+            leader, shared = True, None
+
+        if shared is not None:
+            try:
+                self._filter = BloomFilter.from_bytes(base64.b64decode(shared))
+                return True
+            except ValueError as e:  # Includes binascii.Error
+                logger.warning(f"Shared email filter unreadable, rebuilding locally: {e}")
+                leader = True
+        if not leader:
+            return False
+
+        loaded = await self.rebuild()
+        logger.info(f"Email filter rebuilt with {loaded} addresses")
+        try:
+            shared = base64.b64encode(self._filter.to_bytes())
+            await self.redis.set(FILTER_KEY, shared, ex=2 * self.rebuild_interval)
+        except RedisError as e:
+            logger.warning(f"Email filter not shared: {e}")
+        return True
+
+    async def rebuild(self) -> int:
+        """Build a fresh filter from users.email and swap it in; returns emails loaded"""
+        async with get_sessionmaker()() as db:
+            total = (await db.execute(select(func.count()).select_from(User))).scalar_one()
+            # Headroom for signups until the next rebuild
+            bloom = BloomFilter(max(MIN_CAPACITY, int(total * 1.25)), self.error_rate)
+            loaded = 0
+            result = await db.stream(
+                select(User.email).execution_options(yield_per=REBUILD_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                for (email,) in partition:
+                    bloom.add(_normalize(email))
+                loaded += len(partition)
+        self._filter = bloom
+        return loaded
+
+    async def _rebuild_forever(self) -> None:
+        while True:
+            ready = True
+            try:
+                ready = await self.refresh()
+            except Exception as e:
+                logger.error(f"Email filter rebuild failed: {e}")
+            await asyncio.sleep(self.rebuild_interval if ready else SHARED_POLL_SECONDS)
+
+    def start(self) -> None:
+        """Build in the background (startup isn't held up) and keep refreshing"""
+        self._rebuild_task = asyncio.create_task(self._rebuild_forever())
+
+    async def stop(self) -> None:
+        if self._rebuild_task:
+            self._rebuild_task.cancel()
+            try:
+                await self._rebuild_task
+            except asyncio.CancelledError:
+                pass
+            self._rebuild_task = None
+
+
+@lru_cache()
+def get_registered_emails() -> RegisteredEmails:
+    """Process-wide registered email filter"""
+    settings = get_settings()
+    return RegisteredEmails(settings.EMAIL_FILTER_ERROR_RATE, settings.EMAIL_FILTER_REBUILD_SECONDS)
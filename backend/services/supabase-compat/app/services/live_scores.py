@@ -0,0 +1,87 @@
+"""
+Live Scores
+Write path for captain score submissions and confirmations (live_scores)
+
+The PostgREST layer is otherwise still a stub; live_scores writes are
+implemented so the stored row (with its bet_id) can be fanned out to the
+per-bet realtime channels.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import Boolean, DateTime, String, column, insert, table, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.profiling import span
+
+TABLE = "live_scores"
+
+_LIVE_SCORES = table(
+    TABLE,
+    column("id", PG_UUID(as_uuid=False)),
+    column("bet_id", PG_UUID(as_uuid=False)),
+    column("team_side", String),
+    column("captain_id", PG_UUID(as_uuid=False)),
+    column("score_data", JSONB),
+    column("is_confirmed", Boolean),
+    column("confirmed_by", PG_UUID(as_uuid=False)),
+    column("confirmation_timestamp", DateTime(timezone=True)),
+    column("created_at", DateTime(timezone=True)),
+)
+
+# Columns clients may write (as supabase-js sends them from scores.api.ts)
+_INSERT_COLUMNS = {"bet_id", "team_side", "captain_id", "score_data", "is_confirmed"}
+_UPDATE_COLUMNS = {"is_confirmed", "confirmed_by", "confirmation_timestamp"}
+
+
+def _values(data: Dict[str, Any], allowed: set) -> Dict[str, Any]:
+    unknown = set(data) - allowed
+    if unknown:
+        raise ValueError(f"Columns not writable: {', '.join(sorted(unknown))}")
+    values = dict(data)
+    timestamp = values.get("confirmation_timestamp")
+    if isinstance(timestamp, str):
+        values["confirmation_timestamp"] = datetime.fromisoformat(timestamp)
+    return values
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    """Row as realtime/PostgREST JSON (ISO timestamps)"""
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in row._mapping.items()
+    }
+
+
+async def insert_score(db: AsyncSession, data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """Insert a score submission by the captain it names"""
+    values = _values(data, _INSERT_COLUMNS)
+    if str(values.get("captain_id")) != user_id:
+        raise PermissionError("Scores can only be submitted as yourself")
+    with span("live_scores.insert"):
+        result = await db.execute(insert(_LIVE_SCORES).values(**values).returning(*_LIVE_SCORES.c))
+    return _record(result.one())
+
+
+async def update_score(
+    db: AsyncSession,
+    score_id: UUID,
+    data: Dict[str, Any],
+    user_id: str,
+) -> Optional[Dict[str, Any]]:
+    """Apply a confirmation; None when the row doesn't exist"""
+    values = _values(data, _UPDATE_COLUMNS)
+    if "confirmed_by" in values and str(values["confirmed_by"]) != user_id:
+        raise PermissionError("Scores can only be confirmed as yourself")
+    with span("live_scores.update"):
+        result = await db.execute(
+            update(_LIVE_SCORES)
+            .where(_LIVE_SCORES.c.id == str(score_id))
+            .values(**values)
+            .returning(*_LIVE_SCORES.c)
+        )
+    row = result.one_or_none()
+    return _record(row) if row is not None else None
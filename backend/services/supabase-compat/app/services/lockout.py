@@ -0,0 +1,189 @@
+"""
+Login Lockout Service
+Failed-login counters and lockouts in Redis instead of per-row UPDATEs
+
+Emails are case-folded once on entry; that form names the Redis keys, fills
+the dirty set and matches users.email case-insensitively in the sync.
+
+A failed password bumps login:failures:<email> (one pipelined round trip,
+TTL = LOCKOUT_DURATION_MINUTES); at MAX_LOGIN_ATTEMPTS the counter becomes a
+login:locked:<email> key with the same TTL. Sign-in checks the lock before
+the user lookup and the Argon2 verify, so traffic against a locked account
+costs one Redis EXISTS and no database or hashing work.
+
+Postgres keeps the audit trail: failures for existing users mark the email
+dirty, and sync_to_database() periodically copies the current counter and
+lock expiry into users.failed_login_attempts / locked_until in one batched
+UPDATE.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import bindparam, func, update
+
+from app.core.config import get_settings
+from app.core.database import get_sessionmaker
+from app.core.profiling import span
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "login:dirty"  # Emails whose counters changed since the last sync
+SYNC_BATCH_SIZE = 500
+
+_SYNC_STATEMENT = (
+    update(User.__table__)
+    .where(func.lower(User.__table__.c.email) == bindparam("b_email"))
+    .values(failed_login_attempts=bindparam("b_attempts"), locked_until=bindparam("b_locked_until"))
+)
+
+
+def _normalize(email: str) -> str:
+    return email.strip().lower()
+
+
+def _failures_key(email: str) -> str:
+    return f"login:failures:{email}"
+
+
+def _locked_key(email: str) -> str:
+    return f"login:locked:{email}"
+
+
+class LoginLockout:
+    """
+    Redis-backed lockout tracking
+
+    Redis errors fail open (logged): the users row's locked_until, synced
+    from earlier lockouts, is still checked after the password verify.
+    """
+
+    def __init__(self, max_attempts: int, lockout_seconds: int):
+        self.max_attempts = max_attempts
+        self.lockout_seconds = lockout_seconds
+        self._sync_task: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self):
+        from app.core.redis import redis_client  # Created by init_redis() at startup
+
+        return redis_client
+
+    async def is_locked(self, email: str) -> bool:
+        """Checked before any database or hashing work"""
+        email = _normalize(email)
+        try:
+            with span("lockout.check"):
+                return bool(await self.redis.exists(_locked_key(email)))
+        except RedisError as e:
+            logger.warning(f"Lockout check failed open: {e}")
+            return False
+
+    async def record_failure(self, email: str, audit: bool = True) -> bool:
+        """
+        Count a failed attempt; returns True when it locks the account
+
+        Unknown emails are counted too (audit=False - nothing to sync), so a
+        lockout response doesn't reveal whether an address is registered.
+        """
+        email = _normalize(email)
+        failures_key = _failures_key(email)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.incr(failures_key)
+                pipe.expire(failures_key, self.lockout_seconds)
+                if audit:
+                    pipe.sadd(DIRTY_KEY, email)
+                failures = (await pipe.execute())[0]
+            if failures < self.max_attempts:
+                return False
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.set(_locked_key(email), 1, ex=self.lockout_seconds)
+                pipe.delete(failures_key)  # Full allowance again once the lock expires
+                await pipe.execute()
+            return True
+        except RedisError as e:
+            logger.warning(f"Failed login not recorded: {e}")
+            return False
+
+    async def clear(self, email: str) -> None:
+        """Reset the counter after a successful login"""
+        try:
+            await self.redis.delete(_failures_key(_normalize(email)))
+        except RedisError as e:
+            logger.warning(f"Failed login counter not cleared: {e}")
+
+    # ---------- Postgres audit sync ----------
+
+    async def sync_to_database(self) -> int:
+        """Copy counters of dirty emails to their users rows; returns rows synced"""
+        synced = 0
+        while True:
+            members = await self.redis.spop(DIRTY_KEY, SYNC_BATCH_SIZE) or []
+            if not members:
+                return synced
+            # bytes unless the client was created with decode_responses
+            emails: List[str] = [m.decode() if isinstance(m, bytes) else m for m in members]
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for email in emails:
+                    pipe.get(_failures_key(email))
+                    pipe.ttl(_locked_key(email))
+                replies = await pipe.execute()
+
+            now = datetime.utcnow()
+            rows: List[Dict] = []
+            for i, email in enumerate(emails):
+                failures, lock_ttl = replies[2 * i], replies[2 * i + 1]
+                locked = lock_ttl is not None and lock_ttl > 0
+                rows.append({
+                    "b_email": email,
+                    "b_attempts": self.max_attempts if locked else int(failures or 0),
+                    "b_locked_until": now + timedelta(seconds=lock_ttl) if locked else None,
+                })
+
+            try:
+                async with get_sessionmaker()() as db:
+                    await db.execute(_SYNC_STATEMENT, rows)
+                    await db.commit()
+            except Exception:
+                await self.redis.sadd(DIRTY_KEY, *emails)  # Retry on the next run
+                raise
+            synced += len(rows)
+
+    async def _sync_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                synced = await self.sync_to_database()
+                if synced:
+                    logger.info(f"Synced {synced} login lockout counters to the database")
+            except Exception as e:
+                logger.error(f"Lockout sync failed: {e}")
+
+    def start_sync(self, interval: float) -> None:
+        self._sync_task = asyncio.create_task(self._sync_forever(interval))
+
+    async def stop_sync(self) -> None:
+        """Cancel the periodic sync and flush what's left"""
+        if self._sync_task:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        try:
+            await self.sync_to_database()
+        except Exception as e:
+            logger.error(f"Final lockout sync failed: {e}")
+
+
+@lru_cache()
+def get_lockout() -> LoginLockout:
+    """Process-wide lockout tracker"""
+    settings = get_settings()
+    return LoginLockout(settings.MAX_LOGIN_ATTEMPTS, settings.LOCKOUT_DURATION_MINUTES * 60)
@@ -0,0 +1,114 @@
+"""
+Login History Writer
+Failed sign-ins recorded in login_history in batches, not one INSERT per attempt
+
+Credential-stuffing traffic fails by the thousand. Each failed attempt
+against an existing account is appended to an in-memory buffer, and a
+periodic flush inserts the buffer with one executemany INSERT and one
+commit. Attempts against unknown emails aren't recorded here at all - the
+Redis lockout counter (LoginLockout.record_failure) is their only trace.
+The buffer is bounded; when a flush can't keep up, the overflow is
+counted and logged instead of growing without limit.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import insert
+
+from app.core.database import get_sessionmaker
+from app.models.user import LoginHistory
+
+logger = logging.getLogger(__name__)
+
+MAX_BUFFERED = 50_000
+
+_INSERT = insert(LoginHistory.__table__)
+
+
+class LoginHistoryWriter:
+    """Buffered login_history rows, flushed every interval seconds"""
+
+    def __init__(self, max_buffered: int = MAX_BUFFERED):
+        self.max_buffered = max_buffered
+        self.dropped = 0
+        self._rows: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def record(
+        self,
+        email: str,
+        success: bool,
+        user_id: Optional[UUID] = None,
+        failure_reason: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        """Queue one attempt (no I/O)"""
+        if len(self._rows) >= self.max_buffered:
+            self.dropped += 1
+            return
+        self._rows.append({
+            "user_id": user_id,
+            "email": email,
+            "success": success,
+            "failure_reason": failure_reason,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "attempted_at": datetime.utcnow(),
+        })
+
+    async def flush(self) -> int:
+        """Insert everything buffered in one statement; returns rows written"""
+        rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            async with get_sessionmaker()() as db:
+                await db.execute(_INSERT, rows)
+                await db.commit()
+        except Exception:
+            # Retry on the next run, keeping the newest rows within the bound
+            self._rows = (rows + self._rows)[-self.max_buffered:]
+            raise
+        return len(rows)
+
+    async def _flush_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Login history flush failed: {e}")
+            if self.dropped:
+                logger.warning(f"Login history buffer full - dropped {self.dropped} attempts")
+                self.dropped = 0
+
+    def start(self, interval: float) -> None:
+        self._flush_task = asyncio.create_task(self._flush_forever(interval))
+
+    async def stop(self) -> None:
+        """Cancel the periodic flush and write what's left"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final login history flush failed: {e}")
+
+
+@lru_cache()
+def get_login_history() -> LoginHistoryWriter:
+    """Process-wide login history writer"""
+    return LoginHistoryWriter()
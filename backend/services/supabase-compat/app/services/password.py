@@ -2,8 +2,16 @@
 Password Service
 Secure password hashing and verification using Argon2
 """
+import secrets
+from typing import Optional
+
 from passlib.context import CryptContext
 
+from app.core.profiling import span
+
+# Hash of a random secret with the same parameters, for dummy_verify
+_dummy_hash: Optional[str] = None
+
 
 class PasswordService:
     """
@@ -30,7 +38,8 @@ class PasswordService:
         Returns:
             Hashed password string
         """
-        return self.pwd_context.hash(password)
+        with span("password.hash"):
+            return self.pwd_context.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -44,10 +53,27 @@ class PasswordService:
             True if password matches, False otherwise
         """
         try:
-            return self.pwd_context.verify(plain_password, hashed_password)
+            with span("password.verify"):
+                return self.pwd_context.verify(plain_password, hashed_password)
         except Exception:
             return False
 
+    def dummy_verify(self, plain_password: str) -> bool:
+        """
+        Spend one real Argon2 verify on a password that can't match
+
+        Called on paths that reject without a stored hash (unknown email), so
+        their response time matches a wrong password for a real account.
+
+        Returns:
+            Always False
+        """
+        global _dummy_hash
+        if _dummy_hash is None:
+            _dummy_hash = self.pwd_context.hash(secrets.token_urlsafe(32))
+        self.verify_password(plain_password, _dummy_hash)
+        return False
+
     def needs_rehash(self, hashed_password: str) -> bool:
         """
         Check if password hash needs to be updated
@@ -0,0 +1,294 @@
+"""
+Realtime Hub
+Supabase-realtime-compatible WebSocket fan-out for postgres_changes subscriptions
+"""
+import asyncio
+import itertools
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+# (event, schema, table, filter) - filter is None or "column=eq.value"
+Binding = Tuple[str, str, str, Optional[str]]
+
+
+class _Connection:
+    """One client socket and the bindings it joined, per topic"""
+    __slots__ = ("websocket", "topics")
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.topics: Dict[str, List[Binding]] = {}
+
+
+class RealtimeHub:
+    """
+    Phoenix-channel (vsn 1.0.0) hub speaking the subset supabase-js uses:
+    phx_join with postgres_changes bindings, phx_leave, heartbeat, access_token
+
+    Subscribers are grouped by (binding, topic). Binding ids are interned, so
+    every client joining the same channel with the same filter gets the same
+    id. A socket gets one frame per change and topic, carrying the ids of all
+    its matching bindings (e.g. both "*" and "UPDATE"); sockets with the same
+    ids share one serialized frame. Changes to one row within
+    coalesce_seconds are merged and only the latest state is broadcast - an
+    INSERT then DELETE is dropped, as subscribers never saw the row. A binding (its id and filter
+    column) is dropped when its last subscriber leaves, so per-bet channels
+    don't accumulate.
+    """
+
+    def __init__(
+        self,
+        verify_token: Callable[[str], bool],
+        coalesce_seconds: float = 0.05,
+        send_timeout: float = 5.0,
+    ):
+        self.verify_token = verify_token
+        self.coalesce_seconds = coalesce_seconds
+        self.send_timeout = send_timeout
+        self._groups: Dict[Binding, Dict[str, Set[_Connection]]] = {}
+        self._binding_ids: Dict[Binding, int] = {}
+        self._next_id = itertools.count(1)  # Never reused, so a dropped binding's id can't alias a new one
+        # (schema, table) -> eq filter column -> live bindings using it, to find matching bindings for a row
+        self._filter_columns: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._pending: Dict[Tuple[str, str, Any], Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ---------- Subscriptions ----------
+
+    @staticmethod
+    def _parse_bindings(config: Any) -> List[Binding]:
+        """Validate a phx_join config before anything is subscribed"""
+        if not isinstance(config, dict):
+            raise ValueError("config must be an object")
+        changes = config.get("postgres_changes", [])
+        if not isinstance(changes, list):
+            raise ValueError("postgres_changes must be a list")
+        bindings = []
+        for change in changes:
+            if not isinstance(change, dict) or not isinstance(change.get("table"), str):
+                raise ValueError("postgres_changes entries need a table")
+            change_filter = change.get("filter") or None
+            if change_filter is not None:
+                if not isinstance(change_filter, str) or not change_filter.partition("=eq.")[2]:
+                    raise ValueError(f"Unsupported filter: {change_filter}")
+            bindings.append((
+                str(change.get("event", "*")).upper(),
+                str(change.get("schema", "public")),
+                change["table"],
+                change_filter,
+            ))
+        return bindings
+
+    def _add_binding(self, binding: Binding) -> None:
+        _, schema, table, change_filter = binding
+        self._groups[binding] = {}
+        self._binding_ids[binding] = next(self._next_id)
+        if change_filter is not None:
+            columns = self._filter_columns.setdefault((schema, table), {})
+            column = change_filter.partition("=eq.")[0]
+            columns[column] = columns.get(column, 0) + 1
+
+    def _drop_binding(self, binding: Binding) -> None:
+        _, schema, table, change_filter = binding
+        del self._groups[binding]
+        del self._binding_ids[binding]
+        if change_filter is not None:
+            columns = self._filter_columns[(schema, table)]
+            column = change_filter.partition("=eq.")[0]
+            columns[column] -= 1
+            if not columns[column]:
+                del columns[column]
+                if not columns:
+                    del self._filter_columns[(schema, table)]
+
+    def _join(self, conn: _Connection, topic: str, config: Any) -> List[Dict[str, Any]]:
+        bindings = self._parse_bindings(config)
+        self._leave(conn, topic)
+        response = []
+        for binding in bindings:
+            if binding not in self._groups:
+                self._add_binding(binding)
+            self._groups[binding].setdefault(topic, set()).add(conn)
+            event, schema, table, change_filter = binding
+            response.append({
+                "id": self._binding_ids[binding],
+                "event": event,
+                "schema": schema,
+                "table": table,
+                "filter": change_filter,
+            })
+        conn.topics[topic] = bindings
+        return response
+
+    def _leave(self, conn: _Connection, topic: str) -> None:
+        for binding in conn.topics.pop(topic, ()):
+            topics = self._groups.get(binding)
+            if topics is None:
+                continue
+            subscribers = topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(conn)
+                if not subscribers:
+                    del topics[topic]
+            if not topics:
+                self._drop_binding(binding)
+
+    # ---------- Protocol ----------
+
+    async def _reply(self, conn: _Connection, message: Dict[str, Any], response: Any, ok: bool = True) -> None:
+        await conn.websocket.send_text(json.dumps({
+            "topic": message.get("topic"),
+            "event": "phx_reply",
+            "payload": {"status": "ok" if ok else "error", "response": response},
+            "ref": message.get("ref"),
+        }))
+
+    async def handle(self, websocket: WebSocket) -> None:
+        """Serve one client socket until it disconnects"""
+        await websocket.accept()
+        conn = _Connection(websocket)
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict) or not isinstance(message.get("payload") or {}, dict):
+                    await self._reply(conn, {}, {"reason": "malformed message"}, ok=False)
+                    continue
+                event = message.get("event")
+                topic = message.get("topic")
+                payload = message.get("payload") or {}
+
+                if event == "heartbeat":
+                    await self._reply(conn, message, {})
+                elif event == "phx_join":
+                    token = payload.get("access_token")
+                    if not isinstance(token, str) or not self.verify_token(token):
+                        await self._reply(conn, message, {"reason": "invalid access token"}, ok=False)
+                        continue
+                    if not isinstance(topic, str):
+                        await self._reply(conn, message, {"reason": "missing topic"}, ok=False)
+                        continue
+                    try:
+                        response = self._join(conn, topic, payload.get("config", {}))
+                    except ValueError as e:
+                        await self._reply(conn, message, {"reason": str(e)}, ok=False)
+                        continue
+                    await self._reply(conn, message, {"postgres_changes": response})
+                elif event == "phx_leave":
+                    self._leave(conn, topic)
+                    await self._reply(conn, message, {})
+                elif event == "access_token":
+                    await self._reply(conn, message, {})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for topic in list(conn.topics):
+                self._leave(conn, topic)
+
+    # ---------- Broadcast ----------
+
+    def publish(
+        self,
+        table: str,
+        change_type: str,
+        record: Dict[str, Any],
+        old_record: Optional[Dict[str, Any]] = None,
+        schema: str = "public",
+    ) -> None:
+        """
+        Queue a row change for fan-out
+        Changes to the same row (by id) are coalesced until the next flush
+        """
+        key = (schema, table, record.get("id", id(record)))
+        pending = self._pending.get(key)
+        if pending is not None and pending["type"] == "INSERT":
+            if change_type == "DELETE":
+                del self._pending[key]  # Subscribers never saw the row - nothing to send
+                return
+            if change_type == "UPDATE":
+                change_type = "INSERT"  # Subscribers never saw the insert - keep it one
+        self._pending[key] = {
+            "schema": schema,
+            "table": table,
+            "type": change_type,
+            "record": record,
+            "old_record": old_record or (pending or {}).get("old_record") or {},
+        }
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.coalesce_seconds)
+        self._flush_task = None
+        await self._flush()
+
+    def _matching_bindings(self, change: Dict[str, Any]) -> List[Binding]:
+        schema, table, change_type = change["schema"], change["table"], change["type"]
+        row = change["record"] or change["old_record"]
+        filters: List[Optional[str]] = [None]
+        for column in self._filter_columns.get((schema, table), ()):
+            if column in row:
+                filters.append(f"{column}=eq.{row[column]}")
+        return [
+            (event, schema, table, change_filter)
+            for change_filter in filters
+            for event in ("*", change_type)
+            if (event, schema, table, change_filter) in self._groups
+        ]
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        commit_timestamp = datetime.utcnow().isoformat() + "Z"
+
+        sends = []
+        for change in pending.values():
+            data = {
+                "schema": change["schema"],
+                "table": change["table"],
+                "commit_timestamp": commit_timestamp,
+                "type": change["type"],
+                "record": change["record"],
+                "old_record": change["old_record"],
+                "columns": [],
+                "errors": None,
+            }
+            # Every matching binding id per (topic, socket), so a socket that
+            # joined "*" and "UPDATE" on one topic still gets a single frame
+            recipients: Dict[Tuple[str, _Connection], List[int]] = {}
+            for binding in self._matching_bindings(change):
+                binding_id = self._binding_ids[binding]
+                for topic, subscribers in self._groups[binding].items():
+                    for conn in subscribers:
+                        recipients.setdefault((topic, conn), []).append(binding_id)
+
+            frames: Dict[Tuple[str, Tuple[int, ...]], str] = {}
+            for (topic, conn), ids in recipients.items():
+                frame_key = (topic, tuple(ids))
+                frame = frames.get(frame_key)
+                if frame is None:
+                    frame = frames[frame_key] = json.dumps({
+                        "topic": topic,
+                        "event": "postgres_changes",
+                        "payload": {"data": data, "ids": ids},
+                        "ref": None,
+                    }, default=str)
+                sends.append(self._send(conn, frame))
+        if sends:
+            await asyncio.gather(*sends)
+
+    async def _send(self, conn: _Connection, frame: str) -> None:
+        try:
+            await asyncio.wait_for(conn.websocket.send_text(frame), timeout=self.send_timeout)
+        except Exception as e:
+            # Slow or dead client - drop its subscriptions rather than stall the fan-out
+            logger.info("Dropping realtime client: %s", e)
+            for topic in list(conn.topics):
+                self._leave(conn, topic)
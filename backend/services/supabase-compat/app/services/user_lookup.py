@@ -0,0 +1,135 @@
+"""
+User Lookup Service
+Fast-path reads for the hot auth queries (login, token validation, sessions)
+"""
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import on_primary, replica_read, use_primary
+from app.core.profiling import span
+from app.models.user import User, UserSession
+
+
+class UserRow:
+    """
+    Lightweight read-only view of a users row
+    Attribute names match the User model so token/response helpers accept either
+    """
+    __slots__ = (
+        "id",
+        "email",
+        "password_hash",
+        "full_name",
+        "phone_number",
+        "is_active",
+        "is_email_verified",
+        "failed_login_attempts",
+        "locked_until",
+        "last_login_at",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(self, record: Any):
+        for name in self.__slots__:
+            setattr(self, name, record[name])
+
+    @property
+    def can_login(self) -> bool:
+        """Same rule as User.can_login: active and not currently locked out"""
+        if not self.is_active:
+            return False
+        return self.locked_until is None or self.locked_until <= datetime.utcnow()
+
+
+class SessionRow:
+    """
+    Lightweight read-only view of a user_sessions row
+    Attribute names match the UserSession model
+    """
+    __slots__ = (
+        "id",
+        "user_id",
+        "refresh_token",
+        "is_active",
+        "expires_at",
+        "revoked_at",
+        "last_activity_at",
+        "created_at",
+    )
+
+    def __init__(self, record: Any):
+        for name in self.__slots__:
+            setattr(self, name, record[name])
+
+
+def _labeled(model: Any, names: Sequence[str]) -> List[Any]:
+    """Columns labeled with the row attribute names, so records are keyed by them whatever the column is called"""
+    return [getattr(model, name).label(name) for name in names]
+
+
+_USER_COLUMNS = _labeled(User, UserRow.__slots__)
+_SESSION_COLUMNS = _labeled(UserSession, SessionRow.__slots__)
+
+
+def _compile(stmt: Select) -> Tuple[Select, str]:
+    """Compile once for asyncpg ($n placeholders) and keep the statement for routing"""
+    return stmt, str(stmt.compile(dialect=asyncpg.dialect()))
+
+
+# Sign-in writes based on the row it reads, so the email lookup stays on the primary
+_BY_EMAIL = _compile(select(*_USER_COLUMNS).where(User.email == bindparam("email")))
+# Token validation only reads - a replica is fine (misses retry on the primary)
+_BY_ID = _compile(replica_read(select(*_USER_COLUMNS).where(User.id == bindparam("id"))))
+# Session reads precede revocation - primary
+_SESSION_BY_ID = _compile(select(*_SESSION_COLUMNS).where(UserSession.id == bindparam("id")))
+
+
+class UserLookupService:
+    """
+    Raw asyncpg lookups for users by email / id and sessions by id
+
+    SQL is compiled once at import; asyncpg's per-connection statement cache
+    then reuses the server-side prepared statement, so a lookup skips ORM
+    compilation, identity-map bookkeeping and model construction.
+    Rows are returned as UserRow / SessionRow, not models - they are not attached to the session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _fetchrow(self, query: Tuple[Select, str], value: Any) -> Optional[Any]:
+        stmt, sql = query
+        # Passing the statement lets the routing session honour replica_read()
+        conn = await self.db.connection(bind_arguments={"clause": stmt})
+        raw = await conn.get_raw_connection()
+        with span("db.lookup"):
+            return await raw.driver_connection.fetchrow(sql, value)
+
+    async def get_by_email(self, email: str) -> Optional[UserRow]:
+        """Find user by email"""
+        record = await self._fetchrow(_BY_EMAIL, email)
+        return UserRow(record) if record is not None else None
+
+    async def get_by_id(self, user_id: UUID) -> Optional[UserRow]:
+        """
+        Find user by id
+
+        A replica miss is retried on the primary: right after signup the
+        row may not have replicated yet, and a 401 would sign the client out.
+        """
+        record = await self._fetchrow(_BY_ID, user_id)
+        if record is None and not on_primary(self.db):
+            use_primary(self.db)
+            record = await self._fetchrow(_BY_ID, user_id)
+        return UserRow(record) if record is not None else None
+
+    async def get_session(self, session_id: UUID) -> Optional[SessionRow]:
+        """Find session by id"""
+        record = await self._fetchrow(_SESSION_BY_ID, session_id)
+        return SessionRow(record) if record is not None else None
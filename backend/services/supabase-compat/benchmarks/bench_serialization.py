@@ -0,0 +1,111 @@
+"""
+Response Serialization Benchmark
+FastAPI's response_model path vs ORJSONResponse vs ModelResponse on the
+/auth/v1/user (UserResponse) and /auth/v1/token (AuthResponse) payloads
+
+    default  response_model re-validation + jsonable dump + json.dumps
+    orjson   same, rendered by ORJSONResponse (the app's default class)
+    model    ModelResponse - pydantic-core straight to bytes
+
+Usage (from backend/services/supabase-compat):
+    PYTHONPATH=../auth python -m benchmarks.bench_serialization --iterations 20000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from benchmarks import harness
+
+
+def _user():
+    from app.services.user_lookup import UserRow
+
+    now = datetime.utcnow()
+    return UserRow({
+        "id": uuid4(),
+        "email": "bench.user@example.com",
+        "password_hash": "$argon2id$v=19$m=65536,t=3,p=4$...",
+        "full_name": "Bench User",
+        "phone_number": "+15555550100",
+        "is_active": True,
+        "is_email_verified": True,
+        "failed_login_attempts": 0,
+        "locked_until": None,
+        "last_login_at": now,
+        "created_at": now,
+        "updated_at": now,
+    })
+
+
+def _cases() -> Dict[str, Callable[[], Any]]:
+    import main
+
+    user = _user()
+    access_token = main.create_access_token(user)
+    refresh_token = main.create_refresh_token(user)
+    return {
+        "get_user": lambda: (main.UserResponse, main.user_to_response(user)),
+        "signin": lambda: (main.AuthResponse, main.auth_response(user, access_token, refresh_token)),
+    }
+
+
+async def _run(name: str, response_model: Any, content: Any, iterations: int, rounds: int) -> None:
+    from app.core.responses import ModelResponse
+
+    field = create_response_field(name="Response_bench", type_=response_model, mode="serialization")
+
+    async def default() -> bytes:
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def orjson() -> bytes:
+        return ORJSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def model() -> bytes:
+        return ModelResponse(content).body
+
+    paths = {"default": default, "orjson": orjson, "model": model}
+    bodies = {path: json.loads(await render()) for path, render in paths.items()}
+    if bodies["model"] != bodies["default"] or bodies["orjson"] != bodies["default"]:
+        raise SystemExit(f"{name}: serialized bodies differ between paths")
+
+    timings = {}
+    for path, render in paths.items():
+        rates = []
+        for _ in range(rounds + 1):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await render()
+            rates.append(iterations / (time.perf_counter() - started))
+        timings[path] = 1e6 / statistics.median(rates[1:])  # First round is warm-up
+
+    print(
+        f"{name:<9} "
+        + "  ".join(f"{path} {us:>7.1f} us" for path, us in timings.items())
+        + f"  ({timings['default'] / timings['model']:.1f}x)"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # Settings must exist before main is imported; nothing here connects to the database
+    harness.configure_environment("postgresql+asyncpg://bench@localhost/bench")
+    for name, case in _cases().items():
+        response_model, content = case()
+        await _run(name, response_model, content, args.iterations, args.rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
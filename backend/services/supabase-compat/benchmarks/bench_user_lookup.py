@@ -0,0 +1,91 @@
+"""
+User Lookup Benchmark
+Compares the ORM path with the UserLookupService fast path (users by email, sessions by id)
+
+Usage (from backend/services/supabase-compat, against a seeded database):
+    python -m benchmarks.bench_user_lookup --iterations 5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, List
+
+from sqlalchemy import select
+
+from app.core.database import close_db, get_sessionmaker
+from app.models.user import User, UserSession
+from app.services.user_lookup import UserLookupService
+
+
+async def _orm_session_lookup(session_id: Any) -> None:
+    async with get_sessionmaker()() as db:
+        result = await db.execute(select(UserSession).where(UserSession.id == session_id))
+        result.scalar_one_or_none()
+
+
+async def _fast_session_lookup(session_id: Any) -> None:
+    async with get_sessionmaker()() as db:
+        await UserLookupService(db).get_session(session_id)
+
+
+async def _orm_lookup(email: str) -> None:
+    async with get_sessionmaker()() as db:
+        result = await db.execute(select(User).where(User.email == email))
+        result.scalar_one_or_none()
+
+
+async def _fast_lookup(email: str) -> None:
+    async with get_sessionmaker()() as db:
+        await UserLookupService(db).get_by_email(email)
+
+
+async def _run(
+    name: str,
+    lookup: Callable[[Any], Awaitable[None]],
+    keys: List[Any],
+    iterations: int,
+) -> None:
+    # Warm up pool connections and the prepared statement cache
+    for key in keys[:50]:
+        await lookup(key)
+
+    timings = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        await lookup(keys[i % len(keys)])
+        timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    print(
+        f"{name:<14} {iterations / elapsed:>9.0f} ops/s  "
+        f"p50={statistics.median(timings) * 1e6:.0f}us  "
+        f"p99={timings[int(len(timings) * 0.99)] * 1e6:.0f}us"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    async with get_sessionmaker()() as db:
+        result = await db.execute(select(User.email).limit(1000))
+        emails = list(result.scalars())
+        result = await db.execute(select(UserSession.id).limit(1000))
+        session_ids = list(result.scalars())
+    if not emails:
+        raise SystemExit("No users found - seed the database first")
+
+    await _run("orm", _orm_lookup, emails, args.iterations)
+    await _run("fast", _fast_lookup, emails, args.iterations)
+    if session_ids:
+        await _run("orm session", _orm_session_lookup, session_ids, args.iterations)
+        await _run("fast session", _fast_session_lookup, session_ids, args.iterations)
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,21 @@
+"""
+pytest root for supabase-compat
+app.services comes from this directory; app.core comes from the auth
+service, as it does at runtime through PYTHONPATH. app.models isn't in this
+tree, so tests fall back to the stand-ins in tests/models.py.
+"""
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.append(str(ROOT.parent / "auth"))
+
+try:
+    import app.models.user  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.append(str(ROOT / "tests"))
+    import models as _models
+
+    sys.modules["app.models"] = types.ModuleType("app.models")
+    sys.modules["app.models.user"] = _models
@@ -4,31 +4,72 @@ Drop-in replacement for Supabase - works with existing frontend code
 NO FRONTEND CHANGES REQUIRED
 """
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Union
 from uuid import UUID, uuid4
 
 import jwt
-from fastapi import FastAPI, Depends, HTTPException, Header, Request, status
+from fastapi import FastAPI, Depends, HTTPException, Header, Request, WebSocket, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.profiling_admin import admin_router
 from app.core.config import get_settings
-from app.core.database import get_db
+from app.core.database import close_db, get_db, init_db, use_primary
+from app.core.outbox import close_outbox, enqueue, init_outbox
+from app.core.profiling import profiler, span
+from app.core.redis import close_redis, init_redis
+from app.core.responses import ModelResponse
+from app.middleware.profiling import ProfilingMiddleware
 from app.models.user import User, UserSession
 from app.services.auth import AuthService
+from app.services import live_scores
+from app.services.email_filter import get_registered_emails
+from app.services.lockout import get_lockout
+from app.services.login_history import get_login_history
 from app.services.password import PasswordService
+from app.services.realtime import RealtimeHub
+from app.services.user_lookup import UserLookupService, UserRow
 
 # ==================== Configuration ====================
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator:
+    """Startup and shutdown events"""
+    await init_db()  # Also starts the read replica health checks
+    await init_redis()
+    await init_outbox()
+    # Login lockouts live in Redis; users rows get them periodically
+    lockout = get_lockout()
+    lockout.start_sync(settings.LOCKOUT_SYNC_INTERVAL_SECONDS)
+    # Failed sign-ins reach login_history in batches
+    login_history = get_login_history()
+    login_history.start(settings.LOGIN_HISTORY_FLUSH_SECONDS)
+    # Unknown-email sign-ins skip the database once the filter is built
+    registered_emails = get_registered_emails()
+    registered_emails.start()
+    PasswordService().dummy_verify("")  # Hash the dummy now, not on the first miss
+    yield
+    await registered_emails.stop()
+    await login_history.stop()
+    await lockout.stop_sync()
+    await close_outbox()
+    await close_redis()
+    await close_db()
+
+
 app = FastAPI(
     title="Betcha Supabase-Compatible API",
     description="Drop-in replacement for Supabase with enterprise backend",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS - Same as Supabase
@@ -40,6 +81,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Stage profiling (see /admin/profile)
+profiler.configure(
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    slow_threshold_ms=settings.PROFILER_SLOW_THRESHOLD_MS,
+    capacity=settings.PROFILER_CAPACITY,
+)
+app.add_middleware(ProfilingMiddleware)
+
 # ==================== Schemas (Match Supabase Response Format) ====================
 
 class SignUpRequest(BaseModel):
@@ -88,7 +137,12 @@ class AuthResponse(BaseModel):
 
 # ==================== Auth Helpers ====================
 
-def create_access_token(user: User) -> str:
+# Same for every email/password user - built once and shared by every token
+# and response (serialized only, never mutated)
+EMAIL_APP_METADATA = {"provider": "email", "providers": ["email"]}
+
+
+def create_access_token(user: Union[User, UserRow]) -> str:
     """Create JWT access token (matches Supabase format)"""
     now = datetime.utcnow()
     expires = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -100,20 +154,18 @@ def create_access_token(user: User) -> str:
         "sub": str(user.id),
         "email": user.email,
         "phone": user.phone_number or "",
-        "app_metadata": {
-            "provider": "email",
-            "providers": ["email"]
-        },
+        "app_metadata": EMAIL_APP_METADATA,
         "user_metadata": {
             "full_name": user.full_name or "",
         },
         "role": "authenticated",
     }
 
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
+    with span("jwt.encode"):
+        return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
 
 
-def create_refresh_token(user: User) -> str:
+def create_refresh_token(user: Union[User, UserRow]) -> str:
     """Create refresh token"""
     now = datetime.utcnow()
     expires = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
@@ -124,40 +176,65 @@ def create_refresh_token(user: User) -> str:
         "iat": int(now.timestamp()),
     }
 
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
+    with span("jwt.encode"):
+        return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
+
 
+# Response builders use model_construct: every value comes from a typed
+# users row or from this module, so validation would only re-check what the
+# column types already guarantee (responses go out through ModelResponse).
+# Every field is passed, in declaration order - model_construct appends
+# omitted defaults last, which would reorder the JSON keys.
 
-def user_to_response(user: User) -> UserResponse:
+def user_to_response(user: Union[User, UserRow]) -> UserResponse:
     """Convert User model to Supabase-format response"""
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        email_confirmed_at=user.created_at if user.is_email_verified else None,
-        phone=user.phone_number,
-        confirmed_at=user.created_at if user.is_email_verified else None,
-        last_sign_in_at=user.last_login_at,
-        app_metadata={
-            "provider": "email",
-            "providers": ["email"]
-        },
-        user_metadata={
-            "full_name": user.full_name or "",
-        },
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
+    with span("response.model"):
+        confirmed_at = user.created_at if user.is_email_verified else None
+        return UserResponse.model_construct(
+            id=user.id,
+            email=user.email,
+            aud="authenticated",
+            role="authenticated",
+            email_confirmed_at=confirmed_at,
+            phone=user.phone_number,
+            confirmed_at=confirmed_at,
+            last_sign_in_at=user.last_login_at,
+            app_metadata=EMAIL_APP_METADATA,
+            user_metadata={
+                "full_name": user.full_name or "",
+            },
+            identities=[],
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
 
 
-def create_session_response(user: User, access_token: str, refresh_token: str) -> SessionResponse:
+def create_session_response(
+    user: Union[User, UserRow],
+    access_token: str,
+    refresh_token: str,
+    user_response: Optional[UserResponse] = None,
+) -> SessionResponse:
     """Create Supabase-format session response"""
     now = datetime.utcnow()
     expires = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    return SessionResponse(
+    return SessionResponse.model_construct(
         access_token=access_token,
-        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=3600,
         expires_at=int(expires.timestamp()),
-        user=user_to_response(user),
+        refresh_token=refresh_token,
+        user=user_response or user_to_response(user),
+    )
+
+
+def auth_response(user: Union[User, UserRow], access_token: str, refresh_token: str) -> AuthResponse:
+    """Supabase-format signup/signin body (user plus session)"""
+    user_response = user_to_response(user)  # Same object serialized at both places
+    return AuthResponse.model_construct(
+        user=user_response,
+        session=create_session_response(user, access_token, refresh_token, user_response),
     )
 
 
@@ -175,7 +252,8 @@ async def signup(
     auth_service = AuthService(db)
     password_service = PasswordService()
 
-    # Check if user exists
+    # Check if user exists (on the primary - a lagging replica could miss a fresh signup)
+    use_primary(db)
     result = await db.execute(
         select(User).where(User.email == request.email)
     )
@@ -206,8 +284,15 @@ async def signup(
     )
 
     db.add(user)
+    enqueue(db, "auth.user.signed_up", {
+        "user_id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "created_at": user.created_at,
+    })
     await db.commit()
     await db.refresh(user)
+    await get_registered_emails().add(user.email)
 
     # Create tokens
     access_token = create_access_token(user)
@@ -224,10 +309,7 @@ async def signup(
     db.add(session)
     await db.commit()
 
-    return AuthResponse(
-        user=user_to_response(user),
-        session=create_session_response(user, access_token, refresh_token)
-    )
+    return ModelResponse(auth_response(user, access_token, refresh_token))
 
 
 @app.post("/auth/v1/token", response_model=AuthResponse)
@@ -240,14 +322,27 @@ async def signin(
     Endpoint: POST /auth/v1/token?grant_type=password
     """
     password_service = PasswordService()
+    lockout = get_lockout()
 
-    # Find user
-    result = await db.execute(
-        select(User).where(User.email == request.email)
-    )
-    user = result.scalar_one_or_none()
+    # Locked out: rejected before any database or hashing work. No
+    # dummy_verify by design - the cheap reject is what the Redis lockout is
+    # for, and unknown emails lock the same way, so it reveals nothing
+    if await lockout.is_locked(request.email):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is locked or suspended"
+        )
+
+    # Find user (fast path - no ORM load, updates below are issued by id).
+    # Definitely unregistered addresses skip the lookup entirely.
+    user = None
+    if await get_registered_emails().might_exist(request.email):
+        user = await UserLookupService(db).get_by_email(request.email)
 
     if not user:
+        # Same Argon2 cost as a wrong password, so timing doesn't reveal the miss
+        password_service.dummy_verify(request.password)
+        await lockout.record_failure(request.email, audit=False)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid login credentials"
@@ -255,18 +350,15 @@ async def signin(
 
     # Verify password
     if not password_service.verify_password(request.password, user.password_hash):
-        # Increment failed attempts
-        user.failed_login_attempts += 1
-        if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
-            user.locked_until = datetime.utcnow() + timedelta(minutes=settings.LOCKOUT_DURATION_MINUTES)
-        await db.commit()
+        # Counted in Redis; users rows get the counters from the periodic sync
+        await lockout.record_failure(request.email)
 
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid login credentials"
         )
 
-    # Check if account is locked
+    # Check if account is locked (suspended, or a lockout synced to the row)
     if not user.can_login:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -276,7 +368,14 @@ async def signin(
     # Reset failed attempts
     user.failed_login_attempts = 0
     user.last_login_at = datetime.utcnow()
+    await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(failed_login_attempts=0, last_login_at=user.last_login_at)
+    )
+    enqueue(db, "auth.user.logged_in", {"user_id": user.id, "logged_in_at": user.last_login_at})
     await db.commit()
+    await lockout.clear(request.email)
 
     # Create tokens
     access_token = create_access_token(user)
@@ -294,10 +393,7 @@ async def signin(
     db.add(session)
     await db.commit()
 
-    return AuthResponse(
-        user=user_to_response(user),
-        session=create_session_response(user, access_token, refresh_token)
-    )
+    return ModelResponse(auth_response(user, access_token, refresh_token))
 
 
 @app.post("/auth/v1/logout")
@@ -314,19 +410,16 @@ async def logout(
     token = authorization.replace("Bearer ", "")
 
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+        with span("jwt.decode"):
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
         user_id = UUID(payload["sub"])
 
-        # Revoke all sessions
-        result = await db.execute(
-            select(UserSession).where(UserSession.user_id == user_id, UserSession.is_active == True)
+        # Revoke all sessions (single UPDATE on the primary - no per-session load)
+        await db.execute(
+            update(UserSession)
+            .where(UserSession.user_id == user_id, UserSession.is_active == True)
+            .values(is_active=False, revoked_at=datetime.utcnow())
         )
-        sessions = result.scalars().all()
-
-        for session in sessions:
-            session.is_active = False
-            session.revoked_at = datetime.utcnow()
-
         await db.commit()
 
     except jwt.InvalidTokenError:
@@ -349,18 +442,16 @@ async def get_user(
     token = authorization.replace("Bearer ", "")
 
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+        with span("jwt.decode"):
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
         user_id = UUID(payload["sub"])
 
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        user = await UserLookupService(db).get_by_id(user_id)
 
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
-        return user_to_response(user)
+        return ModelResponse(user_to_response(user))
 
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
@@ -399,6 +490,26 @@ async def get_table_data(
     }
 
 
+def bearer_user_id(authorization: Optional[str]) -> str:
+    """Caller's user id from a Bearer access token"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    try:
+        with span("jwt.decode"):
+            payload = jwt.decode(authorization[7:], settings.JWT_SECRET_KEY, algorithms=["HS256"])
+        return str(UUID(payload["sub"]))
+    except (jwt.InvalidTokenError, KeyError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+
+def _eq_filter(request: Request, column: str) -> str:
+    """Value of a PostgREST `column=eq.value` filter"""
+    value = request.query_params.get(column, "")
+    if not value.startswith("eq.") or len(value) == 3:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{column}=eq.<value> filter required")
+    return value[3:]
+
+
 @app.post("/rest/v1/{table}")
 async def insert_table_data(
     table: str,
@@ -409,7 +520,20 @@ async def insert_table_data(
     """
     Supabase-compatible INSERT
     """
-    # TODO: Implement insert logic
+    if table == live_scores.TABLE:
+        user_id = bearer_user_id(authorization)
+        try:
+            record = await live_scores.insert_score(db, data, user_id)
+        except PermissionError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        await db.commit()
+        # Fan out the stored row (with its id and bet_id), only once it's committed
+        realtime_hub.publish(table, "INSERT", record)
+        data = record
+
+    # TODO: Implement insert logic for the remaining tables (not published - nothing is stored)
     return {
         "data": [data],
         "error": None,
@@ -419,6 +543,64 @@ async def insert_table_data(
     }
 
 
+@app.patch("/rest/v1/{table}")
+async def update_table_data(
+    table: str,
+    data: Dict[str, Any],
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Supabase-compatible UPDATE (live_scores confirmations; ?id=eq.<id>)
+    """
+    if table != live_scores.TABLE:
+        # TODO: Implement update logic for the remaining tables
+        return {"data": [], "error": None, "count": 0, "status": 200, "statusText": "OK"}
+
+    user_id = bearer_user_id(authorization)
+    try:
+        score_id = UUID(_eq_filter(request, "id"))
+        record = await live_scores.update_score(db, score_id, data, user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if record is None:
+        return {"data": [], "error": None, "count": 0, "status": 200, "statusText": "OK"}
+    await db.commit()
+    realtime_hub.publish(table, "UPDATE", record, old_record={"id": record["id"]})
+    return {"data": [record], "error": None, "count": 1, "status": 200, "statusText": "OK"}
+
+
+# ==================== Supabase Realtime (WebSocket) ====================
+
+def verify_realtime_token(token: str) -> bool:
+    """Accept access/anon JWTs signed with our secret"""
+    try:
+        jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"], options={"verify_aud": False})
+        return True
+    except jwt.InvalidTokenError:
+        return False
+
+
+realtime_hub = RealtimeHub(verify_token=verify_realtime_token)
+
+
+@app.websocket("/realtime/v1/websocket")
+async def realtime_websocket(websocket: WebSocket):
+    """
+    Supabase-realtime-compatible endpoint
+    supabase-js connects here for channel().on('postgres_changes', ...)
+    """
+    await realtime_hub.handle(websocket)
+
+
+# ==================== Admin ====================
+
+app.include_router(admin_router(lambda: settings.PROFILER_ADMIN_TOKEN))
+
+
 # ==================== Health Check ====================
 
 @app.get("/health")
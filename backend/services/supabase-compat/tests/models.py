@@ -0,0 +1,65 @@
+"""
+Test Models
+Stand-ins for app.models.user, which the services import but which isn't
+in this tree. Columns cover what the services and UserRow / SessionRow read.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Uuid
+
+from app.core.database import Base
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Uuid, primary_key=True, default=uuid4)
+    email = Column(String(255), nullable=False, unique=True)
+    password_hash = Column(String(255), nullable=False)
+    full_name = Column(String(255))
+    phone_number = Column(String(32))
+    is_active = Column(Boolean, nullable=False, default=True)
+    is_email_verified = Column(Boolean, nullable=False, default=False)
+    failed_login_attempts = Column(Integer, nullable=False, default=0)
+    locked_until = Column(DateTime)
+    last_login_at = Column(DateTime)
+    last_login_ip = Column(String(64))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    @property
+    def can_login(self) -> bool:
+        if not self.is_active:
+            return False
+        return self.locked_until is None or self.locked_until <= datetime.utcnow()
+
+
+class UserSession(Base):
+    __tablename__ = "user_sessions"
+
+    id = Column(Uuid, primary_key=True, default=uuid4)
+    user_id = Column(Uuid, nullable=False)
+    refresh_token = Column(String(1024), nullable=False)
+    device_id = Column(String(255))
+    device_name = Column(String(255))
+    ip_address = Column(String(64))
+    user_agent = Column(String(512))
+    is_active = Column(Boolean, nullable=False, default=True)
+    expires_at = Column(DateTime)
+    revoked_at = Column(DateTime)
+    last_activity_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class LoginHistory(Base):
+    __tablename__ = "login_history"
+
+    id = Column(Uuid, primary_key=True, default=uuid4)
+    user_id = Column(Uuid)
+    email = Column(String(255), nullable=False)
+    success = Column(Boolean, nullable=False)
+    failure_reason = Column(String(255))
+    ip_address = Column(String(64))
+    user_agent = Column(String(512))
+    attempted_at = Column(DateTime, default=datetime.utcnow)
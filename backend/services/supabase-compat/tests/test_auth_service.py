@@ -0,0 +1,110 @@
+"""
+Auth Service Tests
+Rejections cost an Argon2 verify but no database write for unknown emails
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("passlib")  # app.services.password; in requirements.txt
+
+from app.services.auth import AuthService  # noqa: E402
+from app.services.login_history import LoginHistoryWriter  # noqa: E402
+
+
+class RecordingPasswords:
+    def __init__(self, correct=False):
+        self.correct = correct
+        self.dummy_verifies = 0
+        self.verifies = 0
+
+    def dummy_verify(self, plain_password):
+        self.dummy_verifies += 1
+        return False
+
+    def verify_password(self, plain_password, hashed_password):
+        self.verifies += 1
+        return self.correct
+
+
+class FakeLockout:
+    def __init__(self, locked=False):
+        self.locked = locked
+        self.failures = []
+
+    async def is_locked(self, email):
+        return self.locked
+
+    async def record_failure(self, email, audit=True):
+        self.failures.append((email, audit))
+        return False
+
+
+class FakeSession:
+    """Returns user for the lookup; counts writes"""
+
+    def __init__(self, user=None):
+        self.user = user
+        self.added = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        return SimpleNamespace(scalar_one_or_none=lambda: self.user)
+
+    def add(self, entry):
+        self.added.append(entry)
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def _answer(value):
+    return value
+
+
+def _service(user=None, registered=True, locked=False):
+    service = AuthService.__new__(AuthService)
+    service.db = FakeSession(user)
+    service.password_service = RecordingPasswords()
+    service.lockout = FakeLockout(locked)
+    service.registered_emails = SimpleNamespace(might_exist=lambda email: _answer(registered))
+    service.login_history = LoginHistoryWriter()
+    return service
+
+
+def _authenticate(service, email):
+    return asyncio.run(service.authenticate_user(email, "pw"))
+
+
+@pytest.mark.parametrize("registered", [False, True], ids=["filtered_out", "filter_false_positive"])
+def test_unknown_email_costs_a_dummy_verify_and_no_database_write(registered):
+    service = _service(user=None, registered=registered)
+    assert _authenticate(service, "nobody@example.com") is None
+    assert service.password_service.dummy_verifies == 1
+    assert service.lockout.failures == [("nobody@example.com", False)]
+    assert (service.db.added, service.db.commits, len(service.login_history)) == ([], 0, 0)
+
+
+def test_row_locked_account_costs_a_dummy_verify():
+    locked = SimpleNamespace(id="user-1", can_login=False, password_hash="hash")
+    service = _service(user=locked)
+    assert _authenticate(service, "locked@example.com") is None
+    assert service.password_service.dummy_verifies == 1
+    assert (service.db.added, service.db.commits, len(service.login_history)) == ([], 0, 1)
+
+
+def test_redis_locked_account_is_rejected_before_any_hashing():
+    # Deliberate: the lockout's fast reject (see LoginLockout)
+    service = _service(locked=True)
+    assert _authenticate(service, "locked@example.com") is None
+    assert service.password_service.dummy_verifies == service.password_service.verifies == 0
+
+
+def test_wrong_password_is_buffered_not_inserted():
+    user = SimpleNamespace(id="user-1", can_login=True, password_hash="hash")
+    service = _service(user=user)
+    assert _authenticate(service, "ann@example.com") is None
+    assert service.password_service.verifies == 1
+    assert service.lockout.failures == [("ann@example.com", True)]
+    assert (service.db.added, service.db.commits, len(service.login_history)) == ([], 0, 1)
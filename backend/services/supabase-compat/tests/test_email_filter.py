@@ -0,0 +1,122 @@
+"""
+Registered Email Filter Tests
+Fail-open start-up, cross-worker markers and the shared rebuild, on fakeredis
+"""
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.services import email_filter
+from app.services.email_filter import BloomFilter, RegisteredEmails
+
+
+@pytest.fixture(params=[True, False], ids=["decode_responses", "raw_bytes"])
+def server(request, monkeypatch):
+    """One fake Redis shared by every "worker", with the app's client settings"""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=request.param)
+    monkeypatch.setattr(RegisteredEmails, "redis", client)
+    return server
+
+
+def _worker(emails=()):
+    """A RegisteredEmails whose database scan is counted instead of queried"""
+    worker = RegisteredEmails(error_rate=0.01, rebuild_interval=60)
+    scans = []
+
+    async def rebuild():
+        bloom = BloomFilter(email_filter.MIN_CAPACITY, worker.error_rate)
+        for email in emails:
+            bloom.add(email_filter._normalize(email))
+        worker._filter = bloom
+        scans.append(worker)
+        return len(emails)
+
+    worker.rebuild = rebuild
+    return worker, scans
+
+
+# ==================== Before the first build ====================
+
+def test_every_email_may_exist_until_the_first_build(server):
+    server.connected = False  # Not even Redis is consulted
+    worker, _ = _worker()
+    assert not worker.ready
+    assert asyncio.run(worker.might_exist("nobody@example.com"))
+
+
+# ==================== Cross-worker markers ====================
+
+def test_signup_on_another_worker_is_seen_before_the_next_rebuild(server):
+    signup_worker, _ = _worker()
+    signin_worker, _ = _worker()
+
+    async def run():
+        await signup_worker.refresh()
+        await signin_worker.refresh()
+        before = await signin_worker.might_exist("new@example.com")
+        await signup_worker.add("New@Example.com")
+        return before, await signin_worker.might_exist(" new@example.COM")
+
+    assert asyncio.run(run()) == (False, True)
+
+
+def test_marker_check_fails_open_when_redis_is_down(server):
+    worker, _ = _worker()
+    asyncio.run(worker.refresh())
+    server.connected = False
+    assert asyncio.run(worker.might_exist("nobody@example.com"))
+
+
+# ==================== Shared rebuild ====================
+
+def test_one_worker_scans_users_and_the_others_load_its_filter(server):
+    workers = [_worker(["ann@example.com"]) for _ in range(3)]
+
+    async def run():
+        return [await worker.refresh() for worker, _ in workers]
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert sum(len(scans) for _, scans in workers) == 1
+    for worker, _ in workers:
+        assert worker.ready
+        assert "ann@example.com" in worker._filter
+        assert "bob@example.com" not in worker._filter
+
+
+def test_waits_while_another_worker_builds(server):
+    async def run():
+        await RegisteredEmails.redis.set(email_filter.REBUILD_LOCK_KEY, 1)  # Held, nothing published yet
+        worker, scans = _worker()
+        return await worker.refresh(), worker, scans
+
+    ready, worker, scans = asyncio.run(run())
+    assert ready is False
+    assert not worker.ready and not scans
+
+
+def test_unreadable_shared_filter_is_rebuilt_locally(server):
+    async def run():
+        await RegisteredEmails.redis.set(email_filter.REBUILD_LOCK_KEY, 1)
+        await RegisteredEmails.redis.set(email_filter.FILTER_KEY, "not a filter")
+        worker, scans = _worker(["ann@example.com"])
+        return await worker.refresh(), scans
+
+    ready, scans = asyncio.run(run())
+    assert ready and len(scans) == 1
+
+
+def test_rebuilds_locally_without_redis(server):
+    server.connected = False
+    worker, scans = _worker(["ann@example.com"])
+    assert asyncio.run(worker.refresh())
+    assert scans == [worker]
+
+
+def test_bloom_filter_round_trips_through_bytes():
+    bloom = BloomFilter(1000, 0.01)
+    bloom.add("ann@example.com")
+    copy = BloomFilter.from_bytes(bloom.to_bytes())
+    assert (copy.size, copy.hashes, copy.bits) == (bloom.size, bloom.hashes, bloom.bits)
+    assert "ann@example.com" in copy
@@ -0,0 +1,77 @@
+"""
+Login History Tests
+Failed attempts are buffered and written with one INSERT per flush
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.user import LoginHistory
+from app.services import login_history
+from app.services.login_history import LoginHistoryWriter
+
+
+def _run(tmp_path, monkeypatch, scenario):
+    """Run scenario(writer, statements) against a SQLite login_history table"""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'history.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(LoginHistory.__table__.create)
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(login_history, "get_sessionmaker", lambda: sessionmaker)
+        try:
+            return await scenario(LoginHistoryWriter(max_buffered=3), statements, sessionmaker)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_buffered_attempts_are_inserted_in_one_statement(tmp_path, monkeypatch):
+    async def scenario(writer, statements, sessionmaker):
+        for i in range(3):
+            writer.record(email=f"user{i}@example.com", success=False, failure_reason="Invalid password")
+        assert statements == []  # record() does no I/O
+        written = await writer.flush()
+        async with sessionmaker() as db:
+            emails = (await db.execute(select(LoginHistory.email))).scalars().all()
+        return written, [s for s in statements if s.startswith("INSERT")], sorted(emails), len(writer)
+
+    written, inserts, emails, left = _run(tmp_path, monkeypatch, scenario)
+    assert written == 3
+    assert len(inserts) == 1
+    assert emails == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    assert left == 0
+
+
+def test_buffer_is_bounded(tmp_path, monkeypatch):
+    async def scenario(writer, statements, sessionmaker):
+        for i in range(5):
+            writer.record(email=f"user{i}@example.com", success=False)
+        return len(writer), writer.dropped, await writer.flush(), await writer.flush()
+
+    assert _run(tmp_path, monkeypatch, scenario) == (3, 2, 3, 0)
+
+
+def test_failed_flush_keeps_rows_for_the_next_run(tmp_path, monkeypatch):
+    async def scenario(writer, statements, sessionmaker):
+        writer.record(email="ann@example.com", success=False)
+
+        def broken():
+            raise ConnectionError("database down")
+
+        monkeypatch.setattr(login_history, "get_sessionmaker", broken)
+        with pytest.raises(ConnectionError):
+            await writer.flush()
+        kept = len(writer)
+        monkeypatch.setattr(login_history, "get_sessionmaker", lambda: sessionmaker)
+        return kept, await writer.flush()
+
+    assert _run(tmp_path, monkeypatch, scenario) == (1, 1)
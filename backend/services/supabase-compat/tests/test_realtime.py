@@ -0,0 +1,81 @@
+"""
+Realtime Hub Tests
+One frame per change and socket, and coalescing within the flush window
+"""
+import asyncio
+import json
+
+from app.services.realtime import RealtimeHub, _Connection
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+def _subscribe(hub, topic, *events, **change):
+    conn = _Connection(FakeWebSocket())
+    config = {"postgres_changes": [{"event": event, "schema": "public", "table": "bets", **change} for event in events]}
+    response = hub._join(conn, topic, config)
+    return conn, [binding["id"] for binding in response]
+
+
+def _flush(hub, *changes):
+    async def run():
+        for change in changes:
+            hub.publish("bets", *change)
+        hub._flush_task.cancel()
+        await hub._flush()
+
+    asyncio.run(run())
+
+
+def test_one_frame_carries_every_matching_binding_id():
+    hub = RealtimeHub(verify_token=lambda token: True)
+    both, ids = _subscribe(hub, "realtime:bets", "*", "UPDATE")
+    star_only, star_ids = _subscribe(hub, "realtime:bets", "*")
+
+    _flush(hub, ("UPDATE", {"id": 1, "status": "won"}))
+
+    [frame] = both.websocket.frames
+    assert sorted(frame["payload"]["ids"]) == sorted(ids)
+    assert frame["payload"]["data"]["type"] == "UPDATE"
+    [frame] = star_only.websocket.frames
+    assert frame["payload"]["ids"] == star_ids
+
+
+def test_filtered_and_unfiltered_bindings_share_one_frame():
+    hub = RealtimeHub(verify_token=lambda token: True)
+    conn = _Connection(FakeWebSocket())
+    hub._join(conn, "realtime:bet-7", {"postgres_changes": [
+        {"event": "*", "table": "bets"},
+        {"event": "*", "table": "bets", "filter": "id=eq.7"},
+    ]})
+
+    _flush(hub, ("UPDATE", {"id": 7}), ("UPDATE", {"id": 8}))
+
+    frames = conn.websocket.frames
+    assert [f["payload"]["data"]["record"]["id"] for f in frames] == [7, 8]
+    assert len(frames[0]["payload"]["ids"]) == 2
+    assert len(frames[1]["payload"]["ids"]) == 1
+
+
+def test_insert_then_delete_in_one_window_is_dropped():
+    hub = RealtimeHub(verify_token=lambda token: True)
+    conn, _ = _subscribe(hub, "realtime:bets", "*")
+
+    _flush(hub, ("INSERT", {"id": 1}), ("DELETE", {"id": 1}, {"id": 1}))
+    assert conn.websocket.frames == []
+
+
+def test_insert_then_update_is_sent_as_the_insert():
+    hub = RealtimeHub(verify_token=lambda token: True)
+    conn, _ = _subscribe(hub, "realtime:bets", "*")
+
+    _flush(hub, ("INSERT", {"id": 1, "status": "open"}), ("UPDATE", {"id": 1, "status": "won"}))
+    [frame] = conn.websocket.frames
+    assert frame["payload"]["data"]["type"] == "INSERT"
+    assert frame["payload"]["data"]["record"] == {"id": 1, "status": "won"}
@@ -0,0 +1,49 @@
+"""
+User Lookup Tests
+Replica reads fall back to the primary on a miss
+"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.database import on_primary, use_primary
+from app.services.user_lookup import UserLookupService, UserRow
+
+USER_ID = uuid4()
+RECORD = {name: None for name in UserRow.__slots__} | {"id": USER_ID, "email": "ann@example.com", "is_active": True}
+
+
+def _service(on_replica, on_primary_row):
+    """A lookup whose replica and primary return the given records"""
+    service = UserLookupService(SimpleNamespace(info={}))
+    reads = []
+
+    async def fetchrow(query, value):
+        primary = on_primary(service.db)
+        reads.append("primary" if primary else "replica")
+        return on_primary_row if primary else on_replica
+
+    service._fetchrow = fetchrow
+    return service, reads
+
+
+def test_replica_hit_stays_on_the_replica():
+    service, reads = _service(RECORD, RECORD)
+    user = asyncio.run(service.get_by_id(USER_ID))
+    assert user.email == "ann@example.com"
+    assert reads == ["replica"]
+
+
+def test_replica_miss_retries_on_the_primary():
+    # Signed up a moment ago; the replica hasn't caught up
+    service, reads = _service(None, RECORD)
+    user = asyncio.run(service.get_by_id(USER_ID))
+    assert user is not None and user.id == USER_ID
+    assert reads == ["replica", "primary"]
+
+
+def test_missing_user_is_read_once_on_a_primary_pinned_session():
+    service, reads = _service(None, None)
+    use_primary(service.db)  # e.g. after a write in the same request
+    assert asyncio.run(service.get_by_id(USER_ID)) is None
+    assert reads == ["primary"]
@@ -0,0 +1,82 @@
+"""
+Benchmark Baselines
+Stored results per suite/case so a benchmark run fails on regressions
+
+Metrics ending in _ms are latencies (lower is better); everything else is a
+rate (higher is better). Baselines are only meaningful on the machine that
+recorded them - the recording environment is stored alongside the numbers.
+"""
+import json
+import os
+import platform
+from typing import Dict, List
+
+Results = Dict[str, Dict[str, float]]  # case -> metric -> value
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def load(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path: str, suite: str, results: Results) -> None:
+    """Replace one suite's baseline, keeping the others"""
+    data = load(path)
+    data[suite] = {"environment": environment(), "results": results}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(path: str, suite: str, results: Results, tolerance: float) -> List[str]:
+    """Metrics worse than the stored baseline by more than tolerance (a fraction)"""
+    stored = load(path).get(suite)
+    if stored is None:
+        print(f"No baseline for {suite} in {path} - run with --save-baseline to record one")
+        return []
+    if stored["environment"] != environment():
+        print(f"Baseline recorded on {stored['environment']}, running on {environment()}")
+
+    failures = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = stored["results"].get(case, {}).get(metric)
+            if not expected:
+                continue
+            if metric.endswith("_ms"):
+                worse = value > expected * (1 + tolerance)
+            else:
+                worse = value < expected * (1 - tolerance)
+            if worse:
+                failures.append(f"{case} {metric}: {value:.2f} vs baseline {expected:.2f}")
+    return failures
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--baseline", default=DEFAULT_PATH, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression (fraction)")
+
+
+def finish(args, suite: str, results: Results) -> int:
+    """Save or check the baseline; exit status for the run"""
+    if args.save_baseline:
+        save(args.baseline, suite, results)
+        print(f"Baseline saved for {suite}")
+        return 0
+    failures = regressions(args.baseline, suite, results, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
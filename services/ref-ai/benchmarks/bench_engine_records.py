@@ -0,0 +1,129 @@
+"""
+Rule Engine Record Benchmark
+Throughput and memory of the __slots__ engine records vs per-call pydantic models
+
+Usage (from services/ref-ai):
+    python -m benchmarks.bench_engine_records --count 1000000
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from main import (
+    BetRule,
+    Evidence,
+    EvidenceSubmission,
+    EvidenceType,
+    RuleCondition,
+    RuleEngine,
+    RuleOperator,
+    VerificationResult,
+)
+
+RULE = BetRule(
+    rule_id="bench",
+    name="Benchmark rule",
+    description="Numeric thresholds",
+    conditions=[
+        RuleCondition(field="score", operator=RuleOperator.GREATER_THAN, value=10),
+        RuleCondition(field="time", operator=RuleOperator.LESS_THAN, value=60, weight=2.0),
+        RuleCondition(field="reps", operator=RuleOperator.IN_RANGE, value=[20, 40]),
+    ],
+    evidence_required=[EvidenceType.NUMERIC],
+)
+
+
+def _payloads(count: int):
+    rnd = random.Random(42)
+    return [
+        {"score": rnd.uniform(0, 20), "time": rnd.uniform(30, 90), "reps": rnd.randint(0, 60)}
+        for _ in range(count)
+    ]
+
+
+async def _pydantic_path(engine: RuleEngine, payloads) -> None:
+    """Previous behaviour: validated models on the way in and out of every call"""
+    compiled = engine.compiled_rules[RULE.rule_id]
+    for i, data in enumerate(payloads):
+        submission = EvidenceSubmission(
+            bet_id=str(i), user_id="u", evidence_type=EvidenceType.NUMERIC, data=data
+        )
+        verdict = await engine.verify_evidence(
+            compiled,
+            Evidence(submission.bet_id, submission.user_id, submission.evidence_type, submission.data),
+        )
+        VerificationResult(
+            bet_id=verdict.bet_id,
+            status=verdict.status,
+            confidence=verdict.confidence,
+            matched_conditions=verdict.matched_conditions,
+            failed_conditions=verdict.failed_conditions,
+            requires_manual_review=verdict.requires_manual_review,
+            notes=verdict.notes,
+        )
+
+
+async def _record_path(engine: RuleEngine, payloads) -> None:
+    compiled = engine.compiled_rules[RULE.rule_id]
+    for i, data in enumerate(payloads):
+        await engine.verify_evidence(compiled, Evidence(str(i), "u", EvidenceType.NUMERIC, data))
+
+
+async def _record_boundary_path(engine: RuleEngine, payloads) -> None:
+    """Records in the core, model_construct at the API boundary"""
+    compiled = engine.compiled_rules[RULE.rule_id]
+    for i, data in enumerate(payloads):
+        verdict = await engine.verify_evidence(compiled, Evidence(str(i), "u", EvidenceType.NUMERIC, data))
+        verdict.to_model()
+
+
+def _bytes_per_object(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--retain", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engine = RuleEngine()
+    engine.add_rule(RULE)
+    payloads = _payloads(args.count)
+
+    for name, path in (
+        ("pydantic", _pydantic_path),
+        ("records", _record_path),
+        ("records+boundary", _record_boundary_path),
+    ):
+        started = time.perf_counter()
+        await path(engine, payloads)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<17} {args.count / elapsed:>10.0f} submissions/s  ({elapsed:.2f}s)")
+
+    data = payloads[0]
+    now = datetime.utcnow()
+    submission_size = _bytes_per_object(
+        lambda i: EvidenceSubmission(
+            bet_id=str(i), user_id="u", evidence_type=EvidenceType.NUMERIC, data=data, timestamp=now
+        ),
+        args.retain,
+    )
+    record_size = _bytes_per_object(
+        lambda i: Evidence(str(i), "u", EvidenceType.NUMERIC, data), args.retain
+    )
+    print(f"EvidenceSubmission {submission_size:>8.0f} bytes/object")
+    print(f"Evidence record    {record_size:>8.0f} bytes/object")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
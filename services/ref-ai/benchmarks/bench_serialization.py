@@ -0,0 +1,139 @@
+"""
+Response Serialization Benchmark
+FastAPI's response_model path vs ORJSONResponse vs ModelResponse on the
+/verify, /verify/text-batch and /settle/stream payloads
+
+    default  response_model re-validation + jsonable dump + json.dumps
+    orjson   same, rendered by ORJSONResponse (the app's default class)
+    model    ModelResponse - pydantic-core straight to bytes
+
+Usage (from services/ref-ai):
+    python -m benchmarks.bench_serialization                  # check against baselines.json
+    python -m benchmarks.bench_serialization --save-baseline  # record a new baseline
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from benchmarks import baseline
+from main import (
+    LedgerTransaction,
+    StreamBetPayout,
+    StreamSettlementResult,
+    VerificationResult,
+    VerificationStatus,
+)
+from responses import ModelResponse
+
+SUITE = "response_serialization"
+
+
+def _verification(i: int) -> VerificationResult:
+    return VerificationResult.model_construct(
+        bet_id=f"bet-{i:06d}",
+        status=VerificationStatus.NEEDS_REVIEW,
+        confidence=0.61803,
+        matched_conditions=["score", "location", "duration"],
+        failed_conditions=["photo"],
+        requires_manual_review=True,
+        notes="Evaluated 3 of 4 conditions (1 awaiting evidence)",
+    )
+
+
+def _settlement(bets: int) -> StreamSettlementResult:
+    return StreamSettlementResult(
+        stream_id="stream-1",
+        outcome="success",
+        total_pool=Decimal("12345.67"),
+        platform_fee=Decimal("1234.57"),
+        net_pool=Decimal("11111.10"),
+        refunded=False,
+        bets=[
+            StreamBetPayout(bet_id=f"bet-{i}", status="won" if i % 2 else "lost", payout_amount=Decimal("22.22"))
+            for i in range(bets)
+        ],
+        ledger=[
+            LedgerTransaction(user_id=f"user-{i}", amount=Decimal("22.22"), type="bet_payout", reference_id=f"bet-{i}")
+            for i in range(bets)
+        ],
+    )
+
+
+CASES: Dict[str, Callable[[], Any]] = {
+    "verify": lambda: (VerificationResult, _verification(1)),
+    "text_batch/50": lambda: (List[VerificationResult], [_verification(i) for i in range(50)]),
+    "settlement/200": lambda: (StreamSettlementResult, _settlement(200)),
+}
+
+
+def _paths(response_model: Any) -> Dict[str, Callable[[Any], Any]]:
+    field = create_response_field(name="Response_bench", type_=response_model, mode="serialization")
+
+    async def default(content: Any) -> bytes:
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def orjson(content: Any) -> bytes:
+        return ORJSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def model(content: Any) -> bytes:
+        return ModelResponse(content).body
+
+    return {"default": default, "orjson": orjson, "model": model}
+
+
+async def _run_case(name: str, iterations: int, rounds: int) -> Dict[str, float]:
+    response_model, content = CASES[name]()
+    paths = _paths(response_model)
+
+    # Same document on every path, or the comparison is meaningless
+    bodies = {path: json.loads(await render(content)) for path, render in paths.items()}
+    if bodies["model"] != bodies["default"] or bodies["orjson"] != bodies["default"]:
+        raise SystemExit(f"{name}: serialized bodies differ between paths")
+
+    metrics: Dict[str, float] = {}
+    for path, render in paths.items():
+        rates = []
+        for _ in range(rounds + 1):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await render(content)
+            rates.append(iterations / (time.perf_counter() - started))
+        metrics[f"{path}_ops_per_sec"] = statistics.median(rates[1:])  # First round is warm-up
+    return metrics
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="Renders per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    results: baseline.Results = {}
+    for name in CASES:
+        metrics = await _run_case(name, args.iterations, args.rounds)
+        results[name] = metrics
+        default = metrics["default_ops_per_sec"]
+        print(
+            f"{name:<15} "
+            + "  ".join(
+                f"{path} {1e6 / metrics[f'{path}_ops_per_sec']:>8.1f} us"
+                for path in ("default", "orjson", "model")
+            )
+            + f"  ({metrics['model_ops_per_sec'] / default:.1f}x)"
+        )
+
+    return baseline.finish(args, SUITE, results)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,144 @@
+"""
+Verification Microbenchmarks
+RuleEngine.verify_evidence throughput across rule sizes and evidence types
+
+Usage (from services/ref-ai):
+    python -m benchmarks.bench_verify                  # check against baselines.json
+    python -m benchmarks.bench_verify --save-baseline  # record a new baseline
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks import baseline
+from main import (
+    BetRule,
+    Evidence,
+    EvidenceType,
+    RuleCondition,
+    RuleEngine,
+    RuleOperator,
+)
+from text_match import TextMatcher
+
+SUITE = "verify_evidence"
+RULE_SIZES = (1, 5, 20, 50)
+
+
+def _numeric_rule(size: int):
+    operators = (
+        (RuleOperator.GREATER_THAN, 10),
+        (RuleOperator.LESS_THAN, 60),
+        (RuleOperator.IN_RANGE, [20, 40]),
+    )
+    conditions = []
+    for i in range(size):
+        operator, value = operators[i % len(operators)]
+        conditions.append(RuleCondition(field=f"f{i}", operator=operator, value=value))
+
+    def payload(rnd: random.Random) -> Dict[str, Any]:
+        return {f"f{i}": rnd.uniform(0, 80) for i in range(size)}
+
+    return conditions, payload
+
+
+def _text_rule(size: int):
+    operators = (
+        (RuleOperator.CONTAINS, "final"),
+        (RuleOperator.EQUALS, "lakers"),
+        (RuleOperator.REGEX, r"\d+\s*-\s*\d+"),
+    )
+    conditions = []
+    for i in range(size):
+        operator, value = operators[i % len(operators)]
+        conditions.append(
+            RuleCondition(field=f"f{i}", operator=operator, value=value, evidence_type=EvidenceType.TEXT)
+        )
+    texts = ("FINAL  score 102 - 99", "Lakers", "halftime 51-48", "postponed")
+
+    def payload(rnd: random.Random) -> Dict[str, Any]:
+        return {f"f{i}": rnd.choice(texts) for i in range(size)}
+
+    return conditions, payload
+
+
+def _gps_rule(size: int):
+    conditions = [
+        RuleCondition(
+            field=f"venue{i}",
+            operator=RuleOperator.IN_RANGE,
+            value=[40.7 + i * 0.01, -74.0, 1.5],
+            evidence_type=EvidenceType.GPS,
+        )
+        for i in range(size)
+    ]
+
+    def payload(rnd: random.Random) -> Dict[str, Any]:
+        return {"latitude": 40.7 + rnd.uniform(-0.05, 0.05), "longitude": -74.0 + rnd.uniform(-0.05, 0.05)}
+
+    return conditions, payload
+
+
+CASES: Dict[EvidenceType, Callable[[int], tuple]] = {
+    EvidenceType.NUMERIC: _numeric_rule,
+    EvidenceType.TEXT: _text_rule,
+    EvidenceType.GPS: _gps_rule,
+}
+
+
+async def _run_case(evidence_type: EvidenceType, size: int, iterations: int, rounds: int) -> Dict[str, float]:
+    conditions, payload = CASES[evidence_type](size)
+    rule = BetRule(
+        rule_id=f"bench-{evidence_type.value}-{size}",
+        name="Benchmark rule",
+        description="verify_evidence microbenchmark",
+        conditions=conditions,
+        evidence_required=[evidence_type],
+    )
+    rnd = random.Random(42)
+    payloads = [payload(rnd) for _ in range(iterations)]
+
+    # Shared across rounds so regex worker start-up lands in the warm-up round
+    matcher = TextMatcher()
+    rates: List[float] = []
+    try:
+        for _ in range(rounds + 1):
+            engine = RuleEngine(text_matcher=matcher)  # Fresh verification state per round
+            compiled = engine.add_rule(rule)
+            started = time.perf_counter()
+            for i, data in enumerate(payloads):
+                await engine.verify_evidence(compiled, Evidence(str(i), "u", evidence_type, data))
+            rates.append(iterations / (time.perf_counter() - started))
+    finally:
+        matcher.close()
+
+    rate = statistics.median(rates[1:])
+    return {"ops_per_sec": rate, "us_per_op": 1e6 / rate}
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="Submissions per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(RULE_SIZES))
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    results: baseline.Results = {}
+    for evidence_type in CASES:
+        for size in args.sizes:
+            case = f"{evidence_type.value}/{size}"
+            metrics = await _run_case(evidence_type, size, args.iterations, args.rounds)
+            # us_per_op is derived from ops_per_sec - only the rate is baselined
+            results[case] = {"ops_per_sec": metrics["ops_per_sec"]}
+            print(f"{case:<12} {metrics['ops_per_sec']:>10.0f} ops/s  {metrics['us_per_op']:>9.1f} us/op")
+
+    return baseline.finish(args, SUITE, results)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,139 @@
+"""
+API Load Test
+In-process ASGI load against /verify, /rules and /upload-evidence
+
+Requests go through httpx.AsyncClient with an ASGI transport (no sockets),
+so the numbers cover routing, form/JSON parsing, validation and the engine.
+Reports p50/p95/p99 latency and throughput per endpoint.
+
+Usage (from services/ref-ai):
+    python -m benchmarks.load_api --requests 5000 --concurrency 64
+    python -m benchmarks.load_api --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks import baseline
+from main import app, lifespan
+
+SUITE = "api_load"
+
+RULE = {
+    "rule_id": "load",
+    "name": "Load test rule",
+    "description": "Numeric thresholds",
+    "conditions": [
+        {"field": "score", "operator": "greater_than", "value": 10},
+        {"field": "time", "operator": "less_than", "value": 60, "weight": 2.0},
+        {"field": "reps", "operator": "in_range", "value": [20, 40]},
+    ],
+    "evidence_required": ["numeric"],
+}
+
+UPLOAD_BODY = random.Random(42).randbytes(64 * 1024)
+
+
+def _verify(client: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+    rnd = random.Random(i)
+    data = {"score": rnd.uniform(0, 20), "time": rnd.uniform(30, 90), "reps": rnd.randint(0, 60)}
+    return client.post("/verify", data={
+        "bet_id": f"bet-{i}",
+        "user_id": "load",
+        "rule_id": RULE["rule_id"],
+        "evidence_type": "numeric",
+        "data": json.dumps(data),
+    })
+
+
+def _rules(client: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+    return client.post("/rules", json={**RULE, "rule_id": f"load-{i}"})
+
+
+def _upload(client: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+    return client.post(
+        "/upload-evidence",
+        data={"bet_id": "loadtest", "evidence_type": "photo"},
+        files={"file": ("evidence.jpg", UPLOAD_BODY, "image/jpeg")},
+    )
+
+
+SCENARIOS: Dict[str, Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]] = {
+    "verify": _verify,
+    "rules": _rules,
+    "upload-evidence": _upload,
+}
+
+
+async def _run_scenario(client: httpx.AsyncClient, request, total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index, errors
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await request(client, i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": total / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "errors": errors,
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    results: baseline.Results = {}
+    failed = False
+    # ASGITransport doesn't send lifespan events - run startup/shutdown here
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://ref-ai") as client:
+            response = await client.post("/rules", json=RULE)
+            response.raise_for_status()
+
+            for name in args.scenarios:
+                metrics = await _run_scenario(client, SCENARIOS[name], args.requests, args.concurrency)
+                print(
+                    f"{name:<16} {metrics['rps']:>8.0f} req/s  "
+                    f"p50 {metrics['p50_ms']:>7.2f} ms  p95 {metrics['p95_ms']:>7.2f} ms  "
+                    f"p99 {metrics['p99_ms']:>7.2f} ms  errors {metrics['errors']:.0f}"
+                )
+                failed = failed or metrics.pop("errors") > 0
+                results[name] = metrics
+
+    if failed:
+        print("Requests failed - not comparing or saving a baseline")
+        return 1
+    return baseline.finish(args, SUITE, results)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,4 @@
+"""
+pytest root for ref-ai
+The service modules are flat, so tests import them from this directory.
+"""
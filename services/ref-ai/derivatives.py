@@ -0,0 +1,186 @@
+"""
+Evidence Derivatives
+Size-bucketed thumbnails and short preview clips, keyed by content hash
+
+After an upload is stored, a worker pool renders JPEG thumbnails at fixed
+widths (and, for video, a poster frame plus a muted low-res preview clip)
+into <directory>/<sha256>/. Each set is written to a temp directory and
+renamed into place, so a present directory is always complete. Evidence
+cards then fetch the smallest rendition that covers their display size
+instead of the original.
+"""
+import asyncio
+import logging
+import os
+import re
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import av
+except ImportError:  # pragma: no cover - optional dependency
+    av = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTHS = (160, 320, 640, 1280)  # Longest edge, in pixels
+PREVIEW_WIDTH = 320
+PREVIEW_SECONDS = 3.0
+PREVIEW_FPS = 12
+
+KINDS = {"thumbnail": "thumb", "preview": "preview"}  # Rendition kind -> file name prefix
+_CONTENT_HASH = re.compile(r"^[0-9a-f]{64}$")
+_RENDITION = re.compile(r"^(thumb|preview)_(\d+)\.(jpg|mp4)$")
+
+
+def _write_thumbnails(image, out_dir: str) -> None:
+    """One JPEG per width bucket below the image's size (or one at full size)"""
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    longest = max(image.size)
+    widths = [width for width in THUMBNAIL_WIDTHS if width < longest] or [longest]
+    for width in sorted(widths, reverse=True):
+        # Shrink the previous rendition, not the original - each step is cheaper
+        image.thumbnail((width, width), Image.LANCZOS)
+        image.save(os.path.join(out_dir, f"thumb_{width}.jpg"), format="JPEG", quality=80, optimize=True)
+
+
+def _photo(path: str, out_dir: str) -> None:
+    with Image.open(path) as image:
+        image.draft("RGB", (THUMBNAIL_WIDTHS[-1], THUMBNAIL_WIDTHS[-1]))
+        _write_thumbnails(image, out_dir)
+
+
+def _video(path: str, out_dir: str) -> None:
+    """Poster thumbnails from the first frame, plus the first seconds as a small H.264 clip"""
+    source = av.open(path)
+    try:
+        in_stream = source.streams.video[0]
+        in_stream.thread_type = "AUTO"
+        preview = None
+        out_stream = None
+        next_time = 0.0
+        try:
+            for frame in source.decode(in_stream):
+                timestamp = frame.time or 0.0
+                if out_stream is None:
+                    _write_thumbnails(frame.to_image(), out_dir)
+                    scale = min(1.0, PREVIEW_WIDTH / max(frame.width, frame.height))
+                    preview = av.open(os.path.join(out_dir, f"preview_{PREVIEW_WIDTH}.mp4"), "w")
+                    out_stream = preview.add_stream("libx264", rate=PREVIEW_FPS)
+                    out_stream.width = max(2, int(frame.width * scale) // 2 * 2)  # yuv420p needs even sizes
+                    out_stream.height = max(2, int(frame.height * scale) // 2 * 2)
+                    out_stream.pix_fmt = "yuv420p"
+                if timestamp >= PREVIEW_SECONDS:
+                    break
+                if timestamp < next_time:
+                    continue  # Drop frames down to PREVIEW_FPS
+                next_time += 1.0 / PREVIEW_FPS
+                small = frame.reformat(width=out_stream.width, height=out_stream.height, format="yuv420p")
+                small.pts = None
+                preview.mux(out_stream.encode(small))
+            if out_stream is not None:
+                preview.mux(out_stream.encode(None))  # Flush
+        finally:
+            if preview is not None:
+                preview.close()
+    finally:
+        source.close()
+
+
+def derive(path: str, directory: str, content_hash: str, video: bool) -> None:
+    """Render all derivatives for one original (blocking - runs on the pool)"""
+    final_dir = os.path.join(directory, content_hash)
+    if os.path.isdir(final_dir):
+        return  # Same content uploaded before
+    tmp_dir = os.path.join(directory, f".{content_hash}.{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+    try:
+        if video:
+            _video(path, tmp_dir)
+        else:
+            _photo(path, tmp_dir)
+        os.replace(tmp_dir, final_dir)
+    except OSError:
+        if os.path.isdir(final_dir):
+            return  # Lost a race with a concurrent upload of the same content
+        raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class DerivativeStore:
+    """
+    Schedules derivation after uploads and resolves rendition lookups
+
+    Renditions are discovered from the directory listing, so lookups keep
+    working across restarts without a manifest.
+    """
+
+    def __init__(self, directory: str = "/tmp/ref-ai-derivatives", workers: int = 2):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="derivatives")
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def schedule(self, content_hash: str, path: str, video: bool = False) -> None:
+        """Derive in the background; uploads don't wait for it"""
+        if not self.available or (video and av is None):
+            return
+        if content_hash in self._pending or os.path.isdir(os.path.join(self.directory, content_hash)):
+            return
+        self._pending[content_hash] = asyncio.create_task(self._derive(content_hash, path, video))
+
+    async def _derive(self, content_hash: str, path: str, video: bool) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._pool, derive, path, self.directory, content_hash, video)
+        except Exception as e:
+            logger.warning(f"Derivatives failed for {path}: {e}")
+        finally:
+            self._pending.pop(content_hash, None)
+
+    def pending(self, content_hash: str) -> bool:
+        return content_hash in self._pending
+
+    def renditions(self, content_hash: str, kind: str) -> List[Tuple[int, str]]:
+        """(width, path) of the renditions of one kind, smallest first"""
+        if not _CONTENT_HASH.match(content_hash):
+            return []
+        prefix = KINDS[kind]
+        found = []
+        try:
+            entries = os.scandir(os.path.join(self.directory, content_hash))
+        except FileNotFoundError:
+            return []
+        with entries:
+            for entry in entries:
+                match = _RENDITION.match(entry.name)
+                if match and match.group(1) == prefix:
+                    found.append((int(match.group(2)), entry.path))
+        found.sort()
+        return found
+
+    def select(self, content_hash: str, kind: str, width: int) -> Optional[str]:
+        """Smallest rendition at least width wide, else the largest there is"""
+        renditions = self.renditions(content_hash, kind)
+        for rendition_width, path in renditions:
+            if rendition_width >= width:
+                return path
+        return renditions[-1][1] if renditions else None
+
+    async def close(self) -> None:
+        for task in list(self._pending.values()):
+            task.cancel()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,283 @@
+"""
+Evidence Duplicate Index
+Perceptual hashes of photo evidence and video keyframes in a multi-index
+Hamming structure
+
+A recycled screenshot (re-encoded, resized, lightly cropped) keeps a dHash
+within a few bits of the original. Hashes are split into 4 chunks of 16
+bits; by pigeonhole, any hash within radius r of a query matches it in at
+least one chunk with at most r // 4 differing bits. So a lookup probes a
+few hundred buckets instead of scanning every past submission.
+"""
+import asyncio
+import io
+import json
+import logging
+import os
+from array import array
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+from video import KeyframeSampler
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+def dhash(data: bytes) -> int:
+    """64-bit difference hash: brightness gradient of a 9x8 grayscale thumbnail"""
+    if Image is None:
+        raise RuntimeError("Perceptual hashing needs Pillow installed")
+    image = Image.open(io.BytesIO(data))
+    image.draft("L", (64, 64))  # Let the JPEG decoder downscale - far cheaper than a full decode
+    pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        offset = row * 9
+        for col in range(8):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _flip_masks(bits: int, radius: int) -> List[int]:
+    """Every bits-wide mask with at most radius bits set"""
+    masks = [0]
+    for flips in range(1, radius + 1):
+        for positions in combinations(range(bits), flips):
+            mask = 0
+            for position in positions:
+                mask |= 1 << position
+            masks.append(mask)
+    return masks
+
+
+class HammingIndex:
+    """
+    Multi-index hashing over 64-bit values
+
+    Entry ids are positions in a flat array; each chunk table maps a 16-bit
+    chunk value to an array('I') of entry ids (compact at millions of rows).
+    """
+
+    def __init__(self, radius: int = 8):
+        self.radius = radius
+        self.hashes = array("Q")
+        self._tables: List[Dict[int, array]] = [{} for _ in range(CHUNKS)]
+        self._masks = _flip_masks(CHUNK_BITS, radius // CHUNKS)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def add(self, value: int) -> int:
+        entry = len(self.hashes)
+        self.hashes.append(value)
+        for i, table in enumerate(self._tables):
+            chunk = (value >> (i * CHUNK_BITS)) & CHUNK_MASK
+            bucket = table.get(chunk)
+            if bucket is None:
+                bucket = table[chunk] = array("I")
+            bucket.append(entry)
+        return entry
+
+    def query(self, value: int) -> List[Tuple[int, int]]:
+        """(distance, entry) for every entry within radius, closest first"""
+        hashes = self.hashes
+        seen = set()
+        matches = []
+        for i, table in enumerate(self._tables):
+            chunk = (value >> (i * CHUNK_BITS)) & CHUNK_MASK
+            for mask in self._masks:
+                bucket = table.get(chunk ^ mask)
+                if bucket is None:
+                    continue
+                for entry in bucket:
+                    if entry in seen:
+                        continue
+                    seen.add(entry)
+                    distance = (hashes[entry] ^ value).bit_count()
+                    if distance <= self.radius:
+                        matches.append((distance, entry))
+        matches.sort()
+        return matches
+
+
+class Duplicate:
+    """Near-duplicate evidence previously submitted for another bet"""
+    __slots__ = ("bet_id", "distance")
+
+    def __init__(self, bet_id: str, distance: int):
+        self.bet_id = bet_id
+        self.distance = distance
+
+
+class EvidenceIndex:
+    """
+    Perceptual hashes of submitted evidence, keyed back to their bets
+
+    Hashes are computed at upload (off the event loop) and remembered by
+    content digest, so /verify only pays the index lookup and the same bytes
+    are never hashed or indexed twice - whichever path or bet they arrive
+    under, and across snapshot restores. A photo has one hash, a video one
+    per sampled keyframe; a file's entries are contiguous in the index.
+
+    Persistence: the snapshot plus an append-only log (<snapshot>.log) that
+    gets a line per newly hashed file, so a crash loses nothing written since
+    the last clean shutdown. Loading replays the log over the snapshot.
+    """
+
+    def __init__(
+        self,
+        radius: int = 8,
+        snapshot_path: Optional[str] = None,
+        sampler: Optional[KeyframeSampler] = None,
+    ):
+        self.index = HammingIndex(radius)
+        self.snapshot_path = snapshot_path
+        self.log_path = f"{snapshot_path}.log" if snapshot_path else None
+        self.sampler = sampler or KeyframeSampler(sample_fps=1.0, max_frames=30)
+        self._bets: List[str] = []  # entry -> bet_id
+        self._files: Dict[str, Tuple[int, int]] = {}  # sha256 -> (first entry, entry count)
+        self._hashing: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def add(self, bet_id: str, values: Sequence[int], digest: Optional[str] = None) -> None:
+        first = len(self.index)
+        for value in values:
+            self.index.add(value)
+            self._bets.append(bet_id)
+        if digest:
+            self._files[digest] = (first, len(values))
+
+    def values(self, digest: str) -> Optional[Tuple[int, ...]]:
+        """Hashes of a known file (empty if it couldn't be decoded), None if never seen"""
+        entries = self._files.get(digest)
+        if entries is None:
+            return None
+        first, count = entries
+        return tuple(self.index.hashes[first:first + count])
+
+    def _hash_file(self, file_path: str, video: bool) -> Tuple[int, ...]:
+        if not video:
+            with open(file_path, "rb") as f:
+                return (dhash(f.read()),)
+        frames = self.sampler.frames(file_path)
+        try:
+            return tuple(dhash(frame.data) for frame in frames)
+        finally:
+            frames.close()
+
+    async def register_upload(self, bet_id: str, digest: str, file_path: str, video: bool = False) -> Tuple[int, ...]:
+        """Hash uploaded evidence once per digest; empty when it can't be decoded"""
+        values = self.values(digest)
+        if values is not None:
+            return values
+        task = self._hashing.get(digest)
+        if task is None:
+            task = self._hashing[digest] = asyncio.ensure_future(self._register(bet_id, digest, file_path, video))
+        return await task
+
+    async def _register(self, bet_id: str, digest: str, file_path: str, video: bool) -> Tuple[int, ...]:
+        try:
+            values = await asyncio.to_thread(self._hash_file, file_path, video)
+        except Exception as e:
+            logger.info(f"Not hashing evidence {digest}: {e}")
+            values = ()  # Remembered, so undecodable files aren't retried on every check
+        finally:
+            self._hashing.pop(digest, None)
+        self.add(bet_id, values, digest)
+        if self.log_path:
+            try:
+                await asyncio.to_thread(self._append_log, bet_id, digest, values)
+            except OSError as e:
+                logger.warning(f"Evidence index log write failed: {e}")
+        return values
+
+    def find(self, values: Sequence[int], bet_id: str) -> Optional[Duplicate]:
+        """Closest match belonging to a different bet"""
+        best: Optional[Duplicate] = None
+        for value in values:
+            for distance, entry in self.index.query(value):
+                if self._bets[entry] != bet_id:
+                    if best is None or distance < best.distance:
+                        best = Duplicate(self._bets[entry], distance)
+                    break
+        return best
+
+    async def check(self, bet_id: str, digest: str, file_path: str, video: bool = False) -> Optional[Duplicate]:
+        """
+        Near-duplicate check for evidence referenced at /verify
+        Files uploaded here are already hashed; anything else is hashed once
+        """
+        values = self.values(digest)
+        if values is None:
+            values = await self.register_upload(bet_id, digest, file_path, video)
+        return self.find(values, bet_id)
+
+    # ---------- Snapshot ----------
+
+    def _append_log(self, bet_id: str, digest: str, values: Sequence[int]) -> None:
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps({"bet": bet_id, "digest": digest, "hashes": list(values)}) + "\n")
+
+    def _replay_log(self) -> int:
+        replayed = 0
+        with open(self.log_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from a crash
+                if entry["digest"] not in self._files:
+                    self.add(entry["bet"], entry["hashes"], entry["digest"])
+                    replayed += 1
+        return replayed
+
+    def save_snapshot(self) -> None:
+        """Write the full index and start a fresh log"""
+        if not self.snapshot_path:
+            return
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "hashes": self.index.hashes.tobytes().hex(),
+                "bets": self._bets,
+                "files": self._files,
+            }, f)
+        os.replace(tmp_path, self.snapshot_path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)  # Everything in it is in the snapshot now
+        logger.info(f"Evidence index snapshot saved: {len(self)} hashes")
+
+    def load_snapshot(self) -> bool:
+        """Restore the snapshot and replay the log; compacts the log into a new snapshot"""
+        if not self.snapshot_path:
+            return False
+        restored = False
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+            hashes = array("Q")
+            hashes.frombytes(bytes.fromhex(data["hashes"]))
+            for bet_id, value in zip(data["bets"], hashes):
+                self.add(bet_id, (value,))
+            self._files.update({digest: tuple(entries) for digest, entries in data.get("files", {}).items()})
+            restored = True
+        if os.path.exists(self.log_path):
+            replayed = self._replay_log()
+            logger.info(f"Evidence index log replayed: {replayed} files")
+            self.save_snapshot()
+            restored = True
+        if restored:
+            logger.info(f"Evidence index snapshot restored: {len(self)} hashes")
+        return restored
@@ -0,0 +1,260 @@
+"""
+Image Inference
+Warm image models behind a dynamic micro-batcher
+
+Concurrent callers are collected for up to max_batch_size items or
+max_wait_ms and run as one batched forward pass; each caller gets its own
+future back. Backends: ONNX Runtime on CPU, or a deterministic fake model
+(content-hash scores) for tests and local runs.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import onnxruntime
+except ImportError:  # pragma: no cover - optional dependency
+    onnxruntime = None
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+Scores = Dict[str, float]  # label -> probability
+
+
+# ==================== Backends ====================
+
+class ImageModel(ABC):
+    """
+    Backend interface
+
+    preprocess runs per request (in a worker thread) and may fail for one
+    caller without affecting the batch; predict_batch runs once per batch.
+    A backend missing either fails at construction, not on its first batch.
+    """
+    labels: Sequence[str] = ()
+
+    @abstractmethod
+    def preprocess(self, data: bytes) -> Any:
+        ...
+
+    @abstractmethod
+    def predict_batch(self, inputs: List[Any]) -> List[Scores]:
+        ...
+
+
+class FakeImageModel(ImageModel):
+    """Deterministic scores derived from the image bytes - same image, same scores"""
+
+    def __init__(self, labels: Sequence[str] = ("person", "ball", "scoreboard", "finish_line")):
+        self.labels = tuple(labels)
+
+    def preprocess(self, data: bytes) -> bytes:
+        return hashlib.sha256(data).digest()
+
+    def predict_batch(self, inputs: List[bytes]) -> List[Scores]:
+        return [
+            {label: digest[i % len(digest)] / 255 for i, label in enumerate(self.labels)}
+            for digest in inputs
+        ]
+
+
+class OnnxImageModel(ImageModel):
+    """
+    Image classifier on ONNX Runtime (CPU)
+
+    Expects an NCHW float32 input with a dynamic batch dimension and one
+    logits output; labels_path has one label per line in output order.
+    """
+
+    MEAN = (0.485, 0.456, 0.406)
+    STD = (0.229, 0.224, 0.225)
+
+    def __init__(self, model_path: str, labels_path: str, input_size: int = 224, threads: int = 0):
+        if onnxruntime is None or np is None or Image is None:
+            raise RuntimeError("ONNX backend needs onnxruntime, numpy and Pillow installed")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads  # 0 = one per physical core
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.input_size = input_size
+        with open(labels_path) as f:
+            self.labels = tuple(line.strip() for line in f if line.strip())
+        self._mean = np.array(self.MEAN, dtype=np.float32).reshape(3, 1, 1)
+        self._std = np.array(self.STD, dtype=np.float32).reshape(3, 1, 1)
+
+    def preprocess(self, data: bytes):
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        image = image.resize((self.input_size, self.input_size), Image.BILINEAR)
+        array = np.asarray(image, dtype=np.float32).transpose(2, 0, 1) / 255.0
+        return (array - self._mean) / self._std
+
+    def predict_batch(self, inputs: List[Any]) -> List[Scores]:
+        logits = self.session.run(None, {self.input_name: np.stack(inputs)})[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return [dict(zip(self.labels, row.tolist())) for row in probabilities]
+
+
+def load_image_model(backend: Optional[str], **options) -> Optional[ImageModel]:
+    """Build the configured backend (None when image inference is not configured)"""
+    if not backend:
+        return None
+    if backend == "fake":
+        return FakeImageModel()
+    if backend == "onnx":
+        return OnnxImageModel(
+            options["model_path"],
+            options["labels_path"],
+            input_size=options.get("input_size", 224),
+            threads=options.get("threads", 0),
+        )
+    raise ValueError(f"Unknown image model backend: {backend}")
+
+
+# ==================== Micro-batching ====================
+
+class BatchStats:
+    """Batch-size distribution and queueing delay"""
+    __slots__ = ("batch_sizes", "batches", "items", "wait_seconds", "inference_seconds")
+
+    def __init__(self):
+        self.batch_sizes: Counter = Counter()
+        self.batches = 0
+        self.items = 0
+        self.wait_seconds = 0.0
+        self.inference_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "mean_queue_wait_ms": round(self.wait_seconds / self.items * 1000, 3) if self.items else 0.0,
+            "mean_batch_inference_ms": (
+                round(self.inference_seconds / self.batches * 1000, 3) if self.batches else 0.0
+            ),
+        }
+
+
+class ImageBatcher:
+    """
+    Collects concurrent infer() calls into batches for a warm model
+
+    A batch is dispatched when it reaches max_batch_size or max_wait_ms after
+    its first item arrived, whichever comes first. Forward passes run one at
+    a time on a dedicated thread (the model parallelizes internally), while
+    the next batch fills up on the event loop.
+    """
+
+    def __init__(self, model: ImageModel, max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = BatchStats()
+        self._pending: "deque[Tuple[Any, asyncio.Future, float]]" = deque()  # (input, future, queued at)
+        self._arrived = asyncio.Event()
+        self._inference = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-inference")
+        self._preprocess = ThreadPoolExecutor(thread_name_prefix="image-preprocess")
+        self._task: Optional[asyncio.Task] = None
+
+    async def infer(self, data: bytes) -> Scores:
+        """Scores for one image"""
+        loop = asyncio.get_running_loop()
+        item = await loop.run_in_executor(self._preprocess, self.model.preprocess, data)
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        self._arrived.set()
+        return await future
+
+    async def _wait_for_arrival(self, timeout: Optional[float] = None) -> bool:
+        self._arrived.clear()
+        try:
+            await asyncio.wait_for(self._arrived.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        while not self._pending:
+            await self._wait_for_arrival()
+        # The window starts when the oldest item arrived - items that queued
+        # up during the previous forward pass go out immediately
+        deadline = self._pending[0][2] + self.max_wait
+        while len(self._pending) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not await self._wait_for_arrival(remaining):
+                break
+        size = min(len(self._pending), self.max_batch_size)
+        return [self._pending.popleft() for _ in range(size)]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            inputs = [item for item, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._inference, self.model.predict_batch, inputs)
+            except Exception as e:
+                logger.error(f"Image inference failed for a batch of {len(batch)}: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            stats = self.stats
+            stats.batches += 1
+            stats.items += len(batch)
+            stats.batch_sizes[len(batch)] += 1
+            stats.inference_seconds += time.perf_counter() - started
+            for (_, future, queued_at), scores in zip(batch, results):
+                stats.wait_seconds += started - queued_at
+                if not future.done():  # Caller may have been cancelled
+                    future.set_result(scores)
+
+    async def start(self) -> None:
+        """Warm the model with one forward pass, then start batching"""
+        loop = asyncio.get_running_loop()
+        warm_up = await loop.run_in_executor(self._preprocess, self.model.preprocess, _blank_png())
+        await loop.run_in_executor(self._inference, self.model.predict_batch, [warm_up])
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._inference.shutdown(wait=False)
+        self._preprocess.shutdown(wait=False)
+
+
+def _blank_png() -> bytes:
+    """8x8 black PNG for the warm-up pass"""
+    if Image is None:
+        return b"\x89PNG warm-up"
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, format="PNG")
+    return buffer.getvalue()
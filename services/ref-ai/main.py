@@ -2,17 +2,43 @@
 REF AI - Rule Engine & Future ML Service
 Evaluates evidence and automatically verifies bet outcomes
 """
+import asyncio
+import itertools
 import logging
+import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Dict, Any, List, Optional
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Header, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel, Field
 import uvicorn
 
+from derivatives import KINDS as RENDITION_KINDS, DerivativeStore
+from evidence_index import EvidenceIndex
+from inference import ImageBatcher, load_image_model
+from odds import OddsService
+from profiling import ProfilingMiddleware, admin_router, profiler, require_token, span
+from responses import ModelResponse
+from settlement import Stake, settle_stream_pool, to_cents
+from text_match import TextMatcher, compile_text_pattern
+from uploads import (
+    BET_ID_PATTERN,
+    ChecksumMismatch,
+    OffsetMismatch,
+    UploadBusy,
+    UploadNotFound,
+    UploadStore,
+    UploadTooLarge,
+)
+from verification_state import BetAccumulator, VerificationStore, split_conditions, weighted_confidence
+from video import KeyframeSampler
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -45,7 +71,7 @@ class RuleOperator(str, Enum):
 
 
 class VerificationStatus(str, Enum):
-    PENDING = "pending"
+    PENDING = "pending"  # Not final - some conditions have no evidence yet
     VERIFIED = "verified"
     REJECTED = "rejected"
     NEEDS_REVIEW = "needs_review"
@@ -57,6 +83,9 @@ class RuleCondition(BaseModel):
     operator: RuleOperator
     value: Any
     weight: float = 1.0  # For weighted scoring
+    # Required unless the operator implies it (image_match, video_contains,
+    # contains, regex, greater_than, less_than, 2-value in_range)
+    evidence_type: Optional[EvidenceType] = None
 
 
 class BetRule(BaseModel):
@@ -80,7 +109,14 @@ class EvidenceSubmission(BaseModel):
 
 
 class VerificationResult(BaseModel):
-    """Result of evidence verification"""
+    """
+    Result of evidence verification
+
+    API change: a bet that isn't verified while some of its conditions still
+    have no evidence is now PENDING, not REJECTED. Only VERIFIED and REJECTED
+    are final; consumers must keep waiting on PENDING and NEEDS_REVIEW (the
+    stream settlement endpoint answers 409 for them).
+    """
     bet_id: str
     status: VerificationStatus
     confidence: float
@@ -90,93 +126,508 @@ class VerificationResult(BaseModel):
     notes: str
 
 
+class TextEvidence(BaseModel):
+    """One text submission in a batch (e.g. an OCR'd scoreboard)"""
+    bet_id: str
+    user_id: str
+    data: Dict[str, Any]
+
+
+class TextEvidenceBatch(BaseModel):
+    """Text submissions for one rule, matched pattern-by-pattern"""
+    rule_id: str
+    submissions: List[TextEvidence]
+
+
+class UploadCreate(BaseModel):
+    bet_id: str = Field(..., pattern=BET_ID_PATTERN)
+    evidence_type: EvidenceType
+    filename: str
+    length: int = Field(..., ge=0)  # Total size in bytes
+
+
+class StreamStake(BaseModel):
+    """Viewer stake in a stream pool"""
+    bet_id: str
+    bettor_id: str
+    prediction: str  # success | fail
+    amount: Decimal
+
+
+class StreamSettlementRequest(BaseModel):
+    """Verified stream outcome plus the pool's stakes"""
+    stream_id: str
+    status: VerificationStatus  # VERIFIED -> success, REJECTED -> fail
+    stakes: List[StreamStake]
+
+
+class StreamBetPayout(BaseModel):
+    bet_id: str
+    status: str
+    payout_amount: Decimal
+
+
+class LedgerTransaction(BaseModel):
+    user_id: str
+    amount: Decimal
+    type: str
+    reference_id: str
+
+
+class StreamSettlementResult(BaseModel):
+    """Settled pool - bets and ledger are written as one batch"""
+    stream_id: str
+    outcome: str
+    total_pool: Decimal
+    platform_fee: Decimal
+    net_pool: Decimal
+    refunded: bool
+    bets: List[StreamBetPayout]
+    ledger: List[LedgerTransaction]
+
+
+class StakeEvent(BaseModel):
+    """Stake placed or refunded on a stream (sent by the betting service on stream_bets changes)"""
+    bet_id: str  # stream_bets.id - stakes are counted once per bet
+    prediction: str  # success | fail
+    amount: Decimal
+    status: str = "pending"  # pending (placed) | refunded
+
+
+# ==================== Engine Records ====================
+# The engine core runs on these __slots__ records; pydantic models are only
+# built at the API boundary (model_construct - the engine output is trusted)
+
+class Condition:
+    """Compiled rule condition"""
+    __slots__ = ("field", "operator", "value", "weight", "evidence_type")
+
+    def __init__(
+        self,
+        field: str,
+        operator: RuleOperator,
+        value: Any,
+        weight: float,
+        evidence_type: EvidenceType,
+    ):
+        self.field = field
+        self.operator = operator
+        self.value = value
+        self.weight = weight
+        self.evidence_type = evidence_type
+
+    @classmethod
+    def from_model(cls, condition: RuleCondition) -> "Condition":
+        value = _compile_value(condition.operator, condition.value)
+        evidence_type = _resolve_evidence_type(condition, value)
+        if evidence_type is EvidenceType.TEXT:
+            value = compile_text_pattern(condition.operator.value, condition.value)
+        return cls(condition.field, condition.operator, value, condition.weight, evidence_type)
+
+
+# Operators whose evidence type is unambiguous. EQUALS and NOT_EQUALS compare
+# numbers or text, and a 3-value IN_RANGE may be a GPS radius - those rules
+# must say which evidence_type they mean
+IMPLIED_EVIDENCE = {
+    RuleOperator.IMAGE_MATCH: EvidenceType.PHOTO,
+    RuleOperator.VIDEO_CONTAINS: EvidenceType.VIDEO,
+    RuleOperator.CONTAINS: EvidenceType.TEXT,
+    RuleOperator.REGEX: EvidenceType.TEXT,
+    RuleOperator.GREATER_THAN: EvidenceType.NUMERIC,
+    RuleOperator.LESS_THAN: EvidenceType.NUMERIC,
+}
+
+# Operators each evidence type's evaluator supports
+EVIDENCE_OPERATORS = {
+    EvidenceType.NUMERIC: (
+        RuleOperator.EQUALS, RuleOperator.GREATER_THAN, RuleOperator.LESS_THAN, RuleOperator.IN_RANGE,
+    ),
+    EvidenceType.TEXT: (
+        RuleOperator.EQUALS, RuleOperator.NOT_EQUALS, RuleOperator.CONTAINS, RuleOperator.REGEX,
+    ),
+    EvidenceType.GPS: (RuleOperator.IN_RANGE,),
+    EvidenceType.PHOTO: (RuleOperator.IMAGE_MATCH,),
+    EvidenceType.VIDEO: (RuleOperator.IMAGE_MATCH, RuleOperator.VIDEO_CONTAINS),
+}
+
+
+def _resolve_evidence_type(condition: RuleCondition, value: Any) -> EvidenceType:
+    """
+    Evidence type a condition is evaluated against (ValueError when the rule
+    leaves it ambiguous or pairs it with an unsupported operator/value)
+    """
+    operator = condition.operator
+    evidence_type = condition.evidence_type
+    if evidence_type is None:
+        evidence_type = IMPLIED_EVIDENCE.get(operator)
+        if operator is RuleOperator.IN_RANGE and isinstance(value, tuple) and len(value) == 2:
+            evidence_type = EvidenceType.NUMERIC  # (min, max)
+        if evidence_type is None:
+            raise ValueError(
+                f"Condition '{condition.field}': evidence_type is required for {operator.value}"
+            )
+
+    if operator not in EVIDENCE_OPERATORS[evidence_type]:
+        raise ValueError(
+            f"Condition '{condition.field}': {operator.value} is not supported for {evidence_type.value} evidence"
+        )
+    if evidence_type is EvidenceType.NUMERIC:
+        valid = (
+            isinstance(value, tuple) and len(value) == 2
+            if operator is RuleOperator.IN_RANGE
+            else isinstance(value, float)
+        )
+    elif evidence_type is EvidenceType.GPS:
+        valid = isinstance(value, tuple) and len(value) == 3  # (lat, lng, radius_km)
+    else:
+        valid = True
+    if not valid:
+        raise ValueError(
+            f"Condition '{condition.field}': invalid {operator.value} value for {evidence_type.value} evidence"
+        )
+    return evidence_type
+
+
+# Profiler stage per evidence type ("rule.numeric", ...)
+EVALUATOR_STAGES = {evidence_type: f"rule.{evidence_type.value}" for evidence_type in EvidenceType}
+
+# Evidence types whose data is keyed by condition field; the rest (GPS, files)
+# apply to every condition of their type
+FIELD_KEYED_EVIDENCE = (EvidenceType.NUMERIC, EvidenceType.TEXT)
+
+# Uploaded media - perceptually hashed for duplicate detection
+FILE_EVIDENCE = (EvidenceType.PHOTO, EvidenceType.VIDEO)
+
+
+IMAGE_MATCH_THRESHOLD = 0.5  # Default minimum label score for IMAGE_MATCH / VIDEO_CONTAINS
+
+# Operators scored by the image model (video: per sampled keyframe)
+LABEL_OPERATORS = (RuleOperator.IMAGE_MATCH, RuleOperator.VIDEO_CONTAINS)
+
+
+def _compile_value(operator: RuleOperator, value: Any) -> Any:
+    """Convert condition values once at rule creation instead of per evaluation"""
+    try:
+        if operator in LABEL_OPERATORS:
+            # "label" or {"label": ..., "min_score": ...} -> (label, min_score)
+            if isinstance(value, dict):
+                return value["label"], float(value.get("min_score", IMAGE_MATCH_THRESHOLD))
+            return str(value), IMAGE_MATCH_THRESHOLD
+        if operator == RuleOperator.IN_RANGE:
+            return tuple(float(v) for v in value)
+        if operator in (RuleOperator.EQUALS, RuleOperator.GREATER_THAN, RuleOperator.LESS_THAN):
+            return float(value)
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+class CompiledRule:
+    """
+    Bet rule prepared for evaluation
+    Conditions are indexed by evidence type (and field for field-keyed types)
+    so a submission only touches the conditions it can satisfy. version is
+    bumped each time the rule is (re)posted; per-bet state is keyed by it,
+    so state built for an older set of conditions is never reused
+    """
+    __slots__ = (
+        "rule_id",
+        "version",
+        "conditions",
+        "auto_verify",
+        "min_confidence",
+        "type_index",
+        "field_index",
+        "fields",
+        "total_weight",
+    )
+
+    def __init__(
+        self,
+        rule_id: str,
+        conditions: tuple,
+        auto_verify: bool,
+        min_confidence: float,
+        version: int = 0,
+    ):
+        self.rule_id = rule_id
+        self.version = version
+        self.conditions = conditions
+        self.auto_verify = auto_verify
+        self.min_confidence = min_confidence
+        self.fields = tuple(c.field for c in conditions)
+        self.total_weight = sum(c.weight for c in conditions)
+        self.type_index: Dict[EvidenceType, List[int]] = {}
+        self.field_index: Dict[EvidenceType, Dict[str, List[int]]] = {}
+        for i, condition in enumerate(conditions):
+            if condition.evidence_type in FIELD_KEYED_EVIDENCE:
+                fields = self.field_index.setdefault(condition.evidence_type, {})
+                fields.setdefault(condition.field, []).append(i)
+            else:
+                self.type_index.setdefault(condition.evidence_type, []).append(i)
+
+    def applicable(self, evidence_type: EvidenceType, data: Dict[str, Any]) -> List[int]:
+        """Positions of the conditions this evidence can be evaluated against"""
+        fields = self.field_index.get(evidence_type)
+        if fields is None:
+            return self.type_index.get(evidence_type, [])
+        if len(data) < len(fields):
+            return [i for key in data for i in fields.get(key, ())]
+        return [i for field, positions in fields.items() if field in data for i in positions]
+
+    @classmethod
+    def from_model(cls, rule: BetRule, version: int = 0) -> "CompiledRule":
+        return cls(
+            rule.rule_id,
+            tuple(Condition.from_model(c) for c in rule.conditions),
+            rule.auto_verify,
+            rule.min_confidence,
+            version,
+        )
+
+    def state_key(self, bet_id: str) -> tuple:
+        """Verification store key for a bet under this version of the rule"""
+        return (self.rule_id, self.version, bet_id)
+
+
+class Evidence:
+    """Evidence submitted for verification (engine-side EvidenceSubmission)"""
+    __slots__ = ("bet_id", "user_id", "evidence_type", "data")
+
+    def __init__(self, bet_id: str, user_id: str, evidence_type: EvidenceType, data: Dict[str, Any]):
+        self.bet_id = bet_id
+        self.user_id = user_id
+        self.evidence_type = evidence_type
+        self.data = data
+
+
+class Verdict:
+    """Engine-side VerificationResult"""
+    __slots__ = (
+        "bet_id",
+        "status",
+        "confidence",
+        "matched_conditions",
+        "failed_conditions",
+        "requires_manual_review",
+        "notes",
+    )
+
+    def __init__(
+        self,
+        bet_id: str,
+        status: VerificationStatus,
+        confidence: float,
+        matched_conditions: List[str],
+        failed_conditions: List[str],
+        requires_manual_review: bool,
+        notes: str,
+    ):
+        self.bet_id = bet_id
+        self.status = status
+        self.confidence = confidence
+        self.matched_conditions = matched_conditions
+        self.failed_conditions = failed_conditions
+        self.requires_manual_review = requires_manual_review
+        self.notes = notes
+
+    def to_model(self) -> VerificationResult:
+        return VerificationResult.model_construct(
+            bet_id=self.bet_id,
+            status=self.status,
+            confidence=self.confidence,
+            matched_conditions=self.matched_conditions,
+            failed_conditions=self.failed_conditions,
+            requires_manual_review=self.requires_manual_review,
+            notes=self.notes,
+        )
+
+
 # ==================== Rule Engine ====================
 
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
 class RuleEngine:
     """
     Core rule evaluation engine
     Evaluates evidence against bet rules
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        verification_store: Optional[VerificationStore] = None,
+        text_matcher: Optional[TextMatcher] = None,
+        image_batcher: Optional[ImageBatcher] = None,
+        evidence_index: Optional[EvidenceIndex] = None,
+        video_sampler: Optional[KeyframeSampler] = None,
+    ):
         self.rules_cache: Dict[str, BetRule] = {}
+        self.compiled_rules: Dict[str, CompiledRule] = {}
+        # (rule_id, rule version, bet_id) -> accumulated multi-evidence state
+        self.verification_store = verification_store or VerificationStore()
+        self._rule_versions = itertools.count(1)
+        self.text_matcher = text_matcher or TextMatcher()
+        # None until an image model is configured - image evidence goes to review
+        self.image_batcher = image_batcher
+        # Perceptual hashes of past photo evidence - None disables duplicate checks
+        self.evidence_index = evidence_index
+        self.video_sampler = video_sampler or KeyframeSampler()
+
+    def add_rule(self, rule: BetRule) -> CompiledRule:
+        """Cache a rule and its compiled form (ValueError for invalid patterns or ambiguous conditions)"""
+        compiled = CompiledRule.from_model(rule, next(self._rule_versions))
+        self.rules_cache[rule.rule_id] = rule
+        self.compiled_rules[rule.rule_id] = compiled
+        return compiled
 
     async def load_rule(self, rule_id: str) -> Optional[BetRule]:
         """Load rule from database or cache"""
         # TODO: Implement database loading
         return self.rules_cache.get(rule_id)
 
-    async def evaluate_numeric(
+    async def load_compiled_rule(self, rule_id: str) -> Optional[CompiledRule]:
+        """Load compiled rule from cache"""
+        return self.compiled_rules.get(rule_id)
+
+    def evaluate_numeric(
         self,
-        condition: RuleCondition,
+        condition: Condition,
         value: float
     ) -> tuple[bool, float]:
         """Evaluate numeric conditions"""
         try:
-            if condition.operator == RuleOperator.EQUALS:
-                match = abs(value - float(condition.value)) < 0.01
-                confidence = 1.0 if match else 0.0
+            operator = condition.operator
+            if operator is RuleOperator.EQUALS:
+                match = abs(value - condition.value) < 0.01
 
-            elif condition.operator == RuleOperator.GREATER_THAN:
-                match = value > float(condition.value)
-                confidence = 1.0 if match else 0.0
+            elif operator is RuleOperator.GREATER_THAN:
+                match = value > condition.value
 
-            elif condition.operator == RuleOperator.LESS_THAN:
-                match = value < float(condition.value)
-                confidence = 1.0 if match else 0.0
+            elif operator is RuleOperator.LESS_THAN:
+                match = value < condition.value
 
-            elif condition.operator == RuleOperator.IN_RANGE:
+            elif operator is RuleOperator.IN_RANGE:
                 min_val, max_val = condition.value
                 match = min_val <= value <= max_val
-                confidence = 1.0 if match else 0.0
 
             else:
                 return False, 0.0
 
-            return match, confidence
+            return match, 1.0 if match else 0.0
 
         except Exception as e:
             logger.error(f"Numeric evaluation error: {e}")
             return False, 0.0
 
+    async def evaluate_text(
+        self,
+        condition: Condition,
+        text: str
+    ) -> tuple[bool, float]:
+        """Evaluate text conditions (EQUALS, NOT_EQUALS, CONTAINS, REGEX)"""
+        return (await self.evaluate_text_batch(condition, [text]))[0]
+
+    async def evaluate_text_batch(
+        self,
+        condition: Condition,
+        texts: List[str]
+    ) -> List[tuple[bool, float]]:
+        """Apply one compiled pattern to many texts in a single pass"""
+        results = []
+        for match in await self.text_matcher.match_many(condition.value, texts):
+            if match is None:
+                results.append((False, 0.5))  # Regex budget exceeded - leave it to review
+            else:
+                results.append((match, 1.0 if match else 0.0))
+        return results
+
     async def evaluate_image(
         self,
-        condition: RuleCondition,
+        condition: Condition,
         image_path: str
     ) -> tuple[bool, float]:
         """
         Evaluate image evidence
-        TODO: Integrate ML model for image analysis
+        Scores the image on the batched model; IMAGE_MATCH passes when the
+        label's score reaches the condition's min_score
         """
-        # Placeholder for future ML integration
-        logger.info(f"Image evaluation requested for: {image_path}")
+        if self.image_batcher is None or condition.operator is not RuleOperator.IMAGE_MATCH:
+            logger.info(f"Image evaluation requested for: {image_path}")
+            return False, 0.5  # No model - needs manual review
+
+        label, min_score = condition.value
+        try:
+            data = await asyncio.to_thread(_read_file, image_path)
+            scores = await self.image_batcher.infer(data)
+        except Exception as e:
+            logger.warning(f"Image evaluation failed for {image_path}: {e}")
+            return False, 0.5
 
-        # For now, return needs manual review
-        return False, 0.5
+        score = scores.get(label, 0.0)
+        return score >= min_score, score
 
     async def evaluate_video(
         self,
-        condition: RuleCondition,
+        condition: Condition,
         video_path: str
     ) -> tuple[bool, float]:
         """
         Evaluate video evidence
-        TODO: Integrate ML model for video analysis
+        Sampled keyframes go through the image model one at a time; decoding
+        stops at the first keyframe whose label score reaches min_score,
+        otherwise the best keyframe score is the confidence
         """
-        logger.info(f"Video evaluation requested for: {video_path}")
-
-        # Placeholder for future ML integration
-        return False, 0.5
-
-    async def evaluate_gps(
+        if (
+            self.image_batcher is None
+            or condition.operator not in LABEL_OPERATORS
+            or not self.video_sampler.available
+        ):
+            logger.info(f"Video evaluation requested for: {video_path}")
+            return False, 0.5  # No model or decoder - needs manual review
+
+        label, min_score = condition.value
+        frames = self.video_sampler.frames(video_path)
+        best: Optional[float] = None
+        # Decode the next keyframe while the current one is on the model
+        pending = asyncio.ensure_future(asyncio.to_thread(next, frames, None))
+        try:
+            while True:
+                frame = await pending
+                if frame is None:
+                    break
+                pending = asyncio.ensure_future(asyncio.to_thread(next, frames, None))
+                score = (await self.image_batcher.infer(frame.data)).get(label, 0.0)
+                if score >= min_score:
+                    logger.info(f"Video {video_path}: '{label}' at {frame.timestamp:.2f}s")
+                    return True, score
+                best = score if best is None else max(best, score)
+        except Exception as e:
+            logger.warning(f"Video evaluation failed for {video_path}: {e}")
+            return False, 0.5
+        finally:
+            # The generator can't be closed while a decode step is running on it
+            try:
+                await pending
+            except Exception:
+                pass
+            await asyncio.to_thread(frames.close)
+
+        if best is None:
+            return False, 0.5  # No decodable frames
+        return False, best
+
+    def evaluate_gps(
         self,
-        condition: RuleCondition,
+        condition: Condition,
         lat: float,
         lng: float
     ) -> tuple[bool, float]:
         """Evaluate GPS coordinates"""
         # Check if within specified radius
-        if condition.operator == RuleOperator.IN_RANGE:
+        if condition.operator is RuleOperator.IN_RANGE:
             target_lat, target_lng, radius_km = condition.value
 
             # Simple distance calculation (Haversine would be better)
@@ -189,77 +640,151 @@ class RuleEngine:
 
         return False, 0.0
 
+    async def _evaluate(
+        self,
+        condition: Condition,
+        evidence_type: EvidenceType,
+        data: Dict[str, Any]
+    ) -> tuple[bool, float]:
+        """Route one applicable condition to its evaluator"""
+        if evidence_type is EvidenceType.NUMERIC:
+            value = data.get(condition.field)
+            if value is not None:
+                return self.evaluate_numeric(condition, value)
+
+        elif evidence_type is EvidenceType.TEXT:
+            text = data.get(condition.field)
+            if text is not None:
+                return await self.evaluate_text(condition, str(text))
+
+        elif evidence_type is EvidenceType.GPS:
+            lat = data.get('latitude')
+            lng = data.get('longitude')
+            if lat is not None and lng is not None:
+                return self.evaluate_gps(condition, lat, lng)
+
+        elif evidence_type is EvidenceType.PHOTO:
+            image_path = data.get('file_path')
+            if image_path:
+                return await self.evaluate_image(condition, image_path)
+
+        elif evidence_type is EvidenceType.VIDEO:
+            video_path = data.get('file_path')
+            if video_path:
+                return await self.evaluate_video(condition, video_path)
+
+        return False, 0.0
+
     async def verify_evidence(
         self,
-        rule: BetRule,
-        evidence: EvidenceSubmission
-    ) -> VerificationResult:
+        rule: CompiledRule,
+        evidence: Evidence
+    ) -> Verdict:
         """
         Main verification method
-        Evaluates evidence against all rule conditions
+        Evaluates evidence against the rule conditions it applies to; results
+        for the bet's other conditions carry over from earlier submissions
         """
-        matched = []
-        failed = []
-        total_confidence = 0.0
-        total_weight = 0.0
-
-        for condition in rule.conditions:
-            match = False
-            confidence = 0.0
-
-            # Route to appropriate evaluator
-            if evidence.evidence_type == EvidenceType.NUMERIC:
-                value = evidence.data.get(condition.field)
-                if value is not None:
-                    match, confidence = await self.evaluate_numeric(condition, value)
-
-            elif evidence.evidence_type == EvidenceType.GPS:
-                lat = evidence.data.get('latitude')
-                lng = evidence.data.get('longitude')
-                if lat is not None and lng is not None:
-                    match, confidence = await self.evaluate_gps(condition, lat, lng)
-
-            elif evidence.evidence_type == EvidenceType.PHOTO:
-                image_path = evidence.data.get('file_path')
-                if image_path:
-                    match, confidence = await self.evaluate_image(condition, image_path)
-
-            elif evidence.evidence_type == EvidenceType.VIDEO:
-                video_path = evidence.data.get('file_path')
-                if video_path:
-                    match, confidence = await self.evaluate_video(condition, video_path)
-
-            # Track results
-            total_confidence += confidence * condition.weight
-            total_weight += condition.weight
-
-            if match:
-                matched.append(condition.field)
-            else:
-                failed.append(condition.field)
+        key = rule.state_key(evidence.bet_id)
+        state = self.verification_store.get(key, len(rule.conditions))
+
+        applicable = rule.applicable(evidence.evidence_type, evidence.data)
+        # One span per submission, not per condition - keeps the unsampled cost flat
+        with span(EVALUATOR_STAGES[evidence.evidence_type]):
+            for i in applicable:
+                condition = rule.conditions[i]
+                match, confidence = await self._evaluate(
+                    condition, evidence.evidence_type, evidence.data
+                )
+                state.update(i, match, confidence, condition.weight)
+
+        if self.evidence_index is not None and evidence.evidence_type in FILE_EVIDENCE:
+            file_path = evidence.data.get('file_path')
+            digest = evidence.data.get('sha256')
+            if file_path and digest:
+                with span("evidence.duplicate_check"):
+                    duplicate = await self.evidence_index.check(
+                        evidence.bet_id, digest, file_path, video=evidence.evidence_type is EvidenceType.VIDEO
+                    )
+                if duplicate is not None and state.duplicate_of is None:
+                    state.duplicate_of = (duplicate.bet_id, duplicate.distance)
+
+        return self._verdict(rule, key, state, len(applicable))
+
+    async def verify_text_batch(
+        self,
+        rule: CompiledRule,
+        evidences: List[Evidence]
+    ) -> List[Verdict]:
+        """
+        Verify many text submissions for one rule
+        Each text condition's pattern is applied to every submission that has
+        its field in one batch, instead of once per submission
+        """
+        keys = [rule.state_key(evidence.bet_id) for evidence in evidences]
+        states = [self.verification_store.get(key, len(rule.conditions)) for key in keys]
+        evaluated = [0] * len(evidences)
+
+        for field, positions in rule.field_index.get(EvidenceType.TEXT, {}).items():
+            rows = [j for j, evidence in enumerate(evidences) if evidence.data.get(field) is not None]
+            if not rows:
+                continue
+            texts = [str(evidences[j].data[field]) for j in rows]
+            for i in positions:
+                condition = rule.conditions[i]
+                with span("rule.text_batch"):
+                    results = await self.evaluate_text_batch(condition, texts)
+                for j, (match, confidence) in zip(rows, results):
+                    states[j].update(i, match, confidence, condition.weight)
+                    evaluated[j] += 1
+
+        return [
+            self._verdict(rule, key, state, count)
+            for key, state, count in zip(keys, states, evaluated)
+        ]
 
-        # Calculate final confidence
-        final_confidence = total_confidence / total_weight if total_weight > 0 else 0.0
+    def _verdict(self, rule: CompiledRule, key: tuple, state: BetAccumulator, evaluated: int) -> Verdict:
+        """Status from the bet's accumulated state"""
+        # Calculate final confidence (running weighted sum - no replay)
+        final_confidence = weighted_confidence(state, rule.total_weight)
+        pending = state.pending
 
         # Determine status
-        if final_confidence >= rule.min_confidence and rule.auto_verify:
+        requires_review = False
+        if state.duplicate_of is not None:
+            # Recycled evidence never auto-settles, whatever it scored
+            status = VerificationStatus.NEEDS_REVIEW
+            requires_review = True
+        elif final_confidence >= rule.min_confidence and rule.auto_verify:
             status = VerificationStatus.VERIFIED
-            requires_review = False
+        elif pending:
+            status = VerificationStatus.PENDING  # Waiting for evidence for the other conditions
         elif final_confidence < 0.3:
             status = VerificationStatus.REJECTED
-            requires_review = False
         else:
             status = VerificationStatus.NEEDS_REVIEW
             requires_review = True
 
-        return VerificationResult(
-            bet_id=evidence.bet_id,
-            status=status,
-            confidence=final_confidence,
-            matched_conditions=matched,
-            failed_conditions=failed,
-            requires_manual_review=requires_review,
-            notes=f"Evaluated {len(rule.conditions)} conditions"
+        if status is VerificationStatus.VERIFIED or status is VerificationStatus.REJECTED:
+            state.settled = True
+            self.verification_store.touch(key, state)
+
+        matched, failed = split_conditions(state, rule.fields)
+
+        notes = f"Evaluated {evaluated} of {len(rule.conditions)} conditions"
+        if pending:
+            notes += f" ({pending} awaiting evidence)"
+        if state.duplicate_of is not None:
+            notes += f"; evidence near-duplicates bet {state.duplicate_of[0]} (distance {state.duplicate_of[1]})"
+
+        return Verdict(
+            key[2],
+            status,
+            final_confidence,
+            matched,
+            failed,
+            requires_review,
+            notes,
         )
 
 
@@ -269,11 +794,88 @@ class RuleEngine:
 async def lifespan(app: FastAPI) -> AsyncGenerator:
     """Startup and shutdown events"""
     logger.info("🤖 REF AI Service starting...")
+    # Live odds, verification state and the evidence index live in process memory
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        raise RuntimeError("ref-ai keeps live state in memory - run a single worker (WEB_CONCURRENCY=1)")
+    # Image model: loaded and warmed once, shared through the micro-batcher
+    image_model = load_image_model(
+        os.getenv("IMAGE_MODEL_BACKEND"),  # onnx | fake | unset (no model)
+        model_path=os.getenv("IMAGE_MODEL_PATH"),
+        labels_path=os.getenv("IMAGE_MODEL_LABELS_PATH"),
+        input_size=int(os.getenv("IMAGE_MODEL_INPUT_SIZE", "224")),
+        threads=int(os.getenv("IMAGE_MODEL_THREADS", "0")),
+    )
+    app.state.image_batcher = None
+    if image_model is not None:
+        app.state.image_batcher = ImageBatcher(
+            image_model,
+            max_batch_size=int(os.getenv("IMAGE_BATCH_MAX_SIZE", "16")),
+            max_wait_ms=float(os.getenv("IMAGE_BATCH_MAX_WAIT_MS", "5")),
+        )
+        await app.state.image_batcher.start()
+        logger.info(f"Image model ready: {type(image_model).__name__}")
+    # Video: keyframes sampled on a fixed interval or on scene change
+    video_sampler = KeyframeSampler(
+        sample_fps=float(os.getenv("VIDEO_SAMPLE_FPS", "1")),
+        scene_threshold=float(os.getenv("VIDEO_SCENE_THRESHOLD", "0.3")),
+        max_frames=int(os.getenv("VIDEO_MAX_FRAMES", "120")),
+    )
+    # Duplicate evidence: perceptual hashes of past photos and video keyframes
+    app.state.evidence_index = EvidenceIndex(
+        radius=int(os.getenv("DUPLICATE_HASH_RADIUS", "8")),
+        snapshot_path=os.getenv("EVIDENCE_INDEX_SNAPSHOT_PATH"),
+    )
+    app.state.evidence_index.load_snapshot()
+    # Resumable uploads: partial files on disk, abandoned ones expire
+    app.state.uploads = UploadStore(
+        directory=os.getenv("UPLOAD_DIR", "/tmp/ref-ai-uploads"),
+        max_size=int(os.getenv("UPLOAD_MAX_BYTES", str(500 * 1024 * 1024))),
+        expiry_seconds=float(os.getenv("UPLOAD_EXPIRY_SECONDS", str(24 * 3600))),
+    )
+    app.state.uploads.start(float(os.getenv("UPLOAD_SWEEP_SECONDS", "300")))
+    # Thumbnails and preview clips, rendered in the background after upload
+    app.state.derivatives = DerivativeStore(
+        directory=os.getenv("DERIVATIVE_DIR", "/tmp/ref-ai-derivatives"),
+        workers=int(os.getenv("DERIVATIVE_WORKERS", "2")),
+    )
     # Initialize rule engine
-    app.state.rule_engine = RuleEngine()
+    app.state.rule_engine = RuleEngine(
+        VerificationStore(
+            ttl_seconds=float(os.getenv("VERIFICATION_STATE_TTL_SECONDS", str(7 * 24 * 3600))),
+            settled_ttl_seconds=float(os.getenv("VERIFICATION_SETTLED_TTL_SECONDS", "3600")),
+        ),
+        TextMatcher(
+            timeout=float(os.getenv("TEXT_MATCH_TIMEOUT_SECONDS", "0.1")),
+            workers=int(os.getenv("TEXT_MATCH_WORKERS", "1")),
+        ),
+        app.state.image_batcher,
+        app.state.evidence_index,
+        video_sampler,
+    )
+    # Live odds: load pending stakes from the core database (stream_bets, not
+    # this service's DATABASE_URL) or the snapshot, then start the push ticker
+    app.state.odds = OddsService(
+        tick_seconds=float(os.getenv("ODDS_TICK_SECONDS", "0.25")),
+        snapshot_path=os.getenv("ODDS_SNAPSHOT_PATH"),
+    )
+    await app.state.odds.rebuild(os.getenv("ODDS_DATABASE_URL"))
+    # Stage profiling: off unless PROFILER_SAMPLE_RATE > 0
+    profiler.configure(
+        sample_rate=float(os.getenv("PROFILER_SAMPLE_RATE", "0")),
+        slow_threshold_ms=float(os.getenv("PROFILER_SLOW_THRESHOLD_MS", "500")),
+        capacity=int(os.getenv("PROFILER_CAPACITY", "256")),
+    )
+    app.state.odds.start()
     logger.info("✅ REF AI Service ready")
     yield
     logger.info("👋 REF AI Service shutting down")
+    await app.state.odds.stop()
+    await app.state.uploads.stop()
+    app.state.evidence_index.save_snapshot()
+    await app.state.derivatives.close()
+    app.state.rule_engine.text_matcher.close()
+    if app.state.image_batcher is not None:
+        await app.state.image_batcher.stop()
 
 
 app = FastAPI(
@@ -281,6 +883,7 @@ app = FastAPI(
     description="Rule Engine and Future ML Service for automatic bet verification",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -292,6 +895,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Stage profiling (see /admin/profile)
+app.add_middleware(ProfilingMiddleware)
+
 
 # ==================== Endpoints ====================
 
@@ -315,6 +921,8 @@ async def verify_evidence(
 ):
     """
     Verify evidence against bet rules
+    Photo/video data references its file by the sha256 the upload returned.
+    Returns PENDING (not REJECTED) until every condition has had evidence
     """
     import json
 
@@ -323,61 +931,210 @@ async def verify_evidence(
         evidence_data = json.loads(data)
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid evidence data")
+    if not isinstance(evidence_data, dict):
+        raise HTTPException(status_code=400, detail="Invalid evidence data")
 
     # Load rule
-    rule = await app.state.rule_engine.load_rule(rule_id)
+    rule = await app.state.rule_engine.load_compiled_rule(rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found")
 
-    # Create evidence submission
-    evidence = EvidenceSubmission(
-        bet_id=bet_id,
-        user_id=user_id,
-        evidence_type=evidence_type,
-        data=evidence_data
-    )
+    if evidence_type in FILE_EVIDENCE:
+        # Files are referenced by the sha256 an upload returned, never by a
+        # client path - file_path is only ever set here, to the stored file
+        try:
+            evidence_data["file_path"] = app.state.uploads.resolve(evidence_data.get("sha256"))
+        except UploadNotFound:
+            raise HTTPException(status_code=400, detail="sha256 must reference uploaded evidence")
+
+    # Form fields are already validated - build the engine record directly
+    evidence = Evidence(bet_id, user_id, evidence_type, evidence_data)
 
     # Verify
-    result = await app.state.rule_engine.verify_evidence(rule, evidence)
+    verdict = await app.state.rule_engine.verify_evidence(rule, evidence)
+
+    with span("response.model"):
+        return ModelResponse(verdict.to_model())
+
+
+@app.post("/verify/text-batch", response_model=List[VerificationResult])
+async def verify_text_batch(batch: TextEvidenceBatch):
+    """
+    Verify many text submissions (e.g. OCR'd scoreboards) for one rule
+    """
+    rule = await app.state.rule_engine.load_compiled_rule(batch.rule_id)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Rule not found")
+
+    evidences = [
+        Evidence(s.bet_id, s.user_id, EvidenceType.TEXT, s.data)
+        for s in batch.submissions
+    ]
+    verdicts = await app.state.rule_engine.verify_text_batch(rule, evidences)
 
-    return result
+    return ModelResponse([verdict.to_model() for verdict in verdicts])
 
 
 @app.post("/upload-evidence")
 async def upload_evidence(
     file: UploadFile = File(...),
-    bet_id: str = Form(...),
+    bet_id: str = Form(..., pattern=BET_ID_PATTERN),
     evidence_type: EvidenceType = Form(...),
 ):
     """
     Upload evidence file (photo/video)
-    TODO: Integrate with S3 storage
+    Stored content-addressed under UPLOAD_DIR (TODO: Integrate with S3 storage)
     """
-    # Save file temporarily
-    file_path = f"/tmp/{bet_id}_{file.filename}"
+    uploads = app.state.uploads
+    try:
+        # Copied and hashed in chunks off the event loop
+        digest, size = await asyncio.to_thread(uploads.save, file.file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    file_path = uploads.evidence_path(digest)
+
+    logger.info(f"Evidence uploaded: {file_path}")
+    await _register_evidence(bet_id, file_path, evidence_type, digest)
+
+    return {
+        "size": size,
+        "type": evidence_type,
+        "sha256": digest,
+    }
+
+
+async def _register_evidence(bet_id: str, file_path: str, evidence_type: EvidenceType, digest: str) -> None:
+    if evidence_type not in FILE_EVIDENCE:
+        return
+    video = evidence_type is EvidenceType.VIDEO
+    # Hash now so /verify only pays the index lookup
+    await app.state.evidence_index.register_upload(bet_id, digest, file_path, video=video)
+    # Thumbnails / preview for evidence cards - not awaited
+    app.state.derivatives.schedule(digest, file_path, video=video)
+
+
+@app.get("/evidence/{content_hash}/rendition")
+async def evidence_rendition(content_hash: str, kind: str = "thumbnail", width: int = 320):
+    """
+    Smallest derived rendition at least width pixels on its longest edge
+    kind: thumbnail (JPEG) or preview (short MP4 clip, video evidence only)
+    """
+    if kind not in RENDITION_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {sorted(RENDITION_KINDS)}")
+    derivatives = app.state.derivatives
+    path = derivatives.select(content_hash, kind, width)
+    if path is None:
+        if derivatives.pending(content_hash):
+            return Response(status_code=202, headers={"Retry-After": "1"})
+        raise HTTPException(status_code=404, detail="Rendition not found")
+    # Content-addressed - never changes
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+# ==================== Resumable Uploads ====================
+# tus-style: create, PATCH bytes at Upload-Offset, HEAD to resume, finalize
+
+def _offset_headers(upload) -> Dict[str, str]:
+    return {
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.length),
+        "Cache-Control": "no-store",
+    }
+
+
+def _get_upload(upload_id: str):
+    try:
+        return app.state.uploads.get(upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
 
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
 
+@app.post("/uploads", status_code=201)
+async def create_upload(request: UploadCreate, response: Response):
+    """Start a resumable upload"""
+    try:
+        upload = app.state.uploads.create(
+            request.bet_id, request.evidence_type, request.filename, request.length
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    response.headers["Location"] = f"/uploads/{upload.upload_id}"
+    response.headers.update(_offset_headers(upload))
+    return {"upload_id": upload.upload_id, "offset": upload.offset, "length": upload.length}
+
+
+@app.head("/uploads/{upload_id}")
+async def upload_offset(upload_id: str):
+    """Current offset - where the client resumes"""
+    return Response(status_code=200, headers=_offset_headers(_get_upload(upload_id)))
+
+
+@app.patch("/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request, upload_offset: int = Header(...)):
+    """
+    Append the request body at Upload-Offset
+    The body is streamed to the partial file, never buffered whole
+    """
+    upload = _get_upload(upload_id)
+    try:
+        await app.state.uploads.append(upload_id, upload_offset, request.stream())
+    except OffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.offset)})
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Upload in progress")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e), headers={"Upload-Offset": str(upload.offset)})
+    except ClientDisconnect:
+        logger.info(f"Upload {upload_id} interrupted at offset {upload.offset}")
+    return Response(status_code=204, headers=_offset_headers(upload))
+
+
+@app.post("/uploads/{upload_id}/finalize")
+async def finalize_upload(upload_id: str, sha256: Optional[str] = None):
+    """Complete an upload; optional sha256 is checked against the streamed hash"""
+    upload = _get_upload(upload_id)
+    try:
+        digest = await app.state.uploads.finalize(upload_id, sha256)
+    except OffsetMismatch as e:
+        raise HTTPException(status_code=409, detail="Upload incomplete", headers={"Upload-Offset": str(e.offset)})
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Upload in progress")
+    except ChecksumMismatch as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    file_path = app.state.uploads.evidence_path(digest)
     logger.info(f"Evidence uploaded: {file_path}")
+    await _register_evidence(upload.bet_id, file_path, upload.evidence_type, digest)
 
     return {
-        "file_path": file_path,
-        "size": len(content),
-        "type": evidence_type
+        "size": upload.length,
+        "type": upload.evidence_type,
+        "sha256": digest,
     }
 
 
+@app.delete("/uploads/{upload_id}", status_code=204)
+async def delete_upload(upload_id: str):
+    """Abandon an upload and remove its partial file"""
+    try:
+        app.state.uploads.delete(upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return Response(status_code=204)
+
+
 @app.post("/rules", response_model=BetRule)
 async def create_rule(rule: BetRule):
     """Create a new bet rule"""
     # Store in cache (TODO: save to database)
-    app.state.rule_engine.rules_cache[rule.rule_id] = rule
+    try:
+        app.state.rule_engine.add_rule(rule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     logger.info(f"Rule created: {rule.rule_id}")
 
-    return rule
+    return ModelResponse(rule)
 
 
 @app.get("/rules/{rule_id}", response_model=BetRule)
@@ -386,7 +1143,132 @@ async def get_rule(rule_id: str):
     rule = await app.state.rule_engine.load_rule(rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found")
-    return rule
+    return ModelResponse(rule)
+
+
+# ==================== Admin ====================
+
+app.include_router(admin_router(lambda: os.getenv("PROFILER_ADMIN_TOKEN")))
+
+
+# ==================== Settlement ====================
+
+def _from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+@app.post("/settle/stream", response_model=StreamSettlementResult)
+async def settle_stream(request: StreamSettlementRequest):
+    """
+    Settle a stream bet pool from its verified outcome
+    """
+    if request.status == VerificationStatus.VERIFIED:
+        outcome = "success"
+    elif request.status == VerificationStatus.REJECTED:
+        outcome = "fail"
+    else:
+        raise HTTPException(status_code=409, detail="Outcome not final")
+
+    try:
+        settlement = settle_stream_pool(
+            request.stream_id,
+            outcome,
+            (
+                Stake(s.bet_id, s.bettor_id, s.prediction, to_cents(s.amount))
+                for s in request.stakes
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    app.state.odds.close_stream(request.stream_id)
+    logger.info(
+        f"Stream settled: {request.stream_id} ({outcome}, {len(settlement.bets)} bets)"
+    )
+
+    return ModelResponse(StreamSettlementResult(
+        stream_id=settlement.stream_id,
+        outcome=settlement.outcome,
+        total_pool=_from_cents(settlement.total_pool_cents),
+        platform_fee=_from_cents(settlement.platform_fee_cents),
+        net_pool=_from_cents(settlement.net_pool_cents),
+        refunded=settlement.refunded,
+        bets=[
+            StreamBetPayout(bet_id=b.bet_id, status=b.status, payout_amount=_from_cents(b.payout_cents))
+            for b in settlement.bets
+        ],
+        ledger=[
+            LedgerTransaction(
+                user_id=e.user_id,
+                amount=_from_cents(e.amount_cents),
+                type=e.type,
+                reference_id=e.reference_id,
+            )
+            for e in settlement.ledger
+        ],
+    ))
+
+
+# ==================== Live Odds ====================
+
+@app.post("/odds/{stream_id}/stakes")
+async def record_stake(stream_id: str, event: StakeEvent, x_service_token: Optional[str] = Header(None)):
+    """Apply a stake event to the stream's running totals (idempotent per bet)"""
+    # Stake events come only from the betting service (shared ODDS_INGEST_TOKEN)
+    require_token(x_service_token, os.getenv("ODDS_INGEST_TOKEN"))
+    try:
+        if event.status == "pending":
+            app.state.odds.apply_stake(stream_id, event.bet_id, event.prediction, to_cents(event.amount))
+        elif event.status == "refunded":
+            app.state.odds.refund_stake(stream_id, event.bet_id)
+        else:
+            raise ValueError(f"Unknown stake status: {event.status}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return app.state.odds.odds(stream_id)
+
+
+@app.get("/odds/{stream_id}")
+async def get_odds(stream_id: str):
+    """Current odds for a stream"""
+    return app.state.odds.odds(stream_id)
+
+
+@app.websocket("/odds/{stream_id}/ws")
+async def odds_websocket(websocket: WebSocket, stream_id: str):
+    """Push odds updates (coalesced, at most one per tick)"""
+    await websocket.accept()
+    queue = app.state.odds.subscribe(stream_id)
+
+    async def push():
+        while True:
+            await websocket.send_text(await queue.get())
+
+    sender = asyncio.create_task(push())
+    try:
+        # Clients don't send anything; receiving is how we notice the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        app.state.odds.unsubscribe(stream_id, queue)
+
+
+@app.get("/odds/{stream_id}/events")
+async def odds_events(stream_id: str):
+    """Server-sent events variant of the odds push"""
+    queue = app.state.odds.subscribe(stream_id)
+
+    async def event_stream():
+        try:
+            while True:
+                yield f"data: {await queue.get()}\n\n"
+        finally:
+            app.state.odds.unsubscribe(stream_id, queue)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 # ==================== ML Integration (Future) ====================
@@ -395,8 +1277,20 @@ async def get_rule(rule_id: str):
 async def analyze_image_ml(file: UploadFile = File(...)):
     """
     ML-powered image analysis
-    TODO: Integrate TensorFlow/PyTorch model
+    Label scores from the batched image model
     """
+    batcher = app.state.image_batcher
+    if batcher is not None:
+        try:
+            scores = await batcher.infer(await file.read())
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not analyze image: {e}")
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:5]
+        return {
+            "status": "ok",
+            "labels": [{"label": label, "score": round(score, 4)} for label, score in top],
+        }
+
     return {
         "status": "not_implemented",
         "message": "ML model integration coming soon",
@@ -410,6 +1304,15 @@ async def analyze_image_ml(file: UploadFile = File(...)):
     }
 
 
+@app.get("/ml/metrics")
+async def ml_metrics():
+    """Image micro-batcher batch-size distribution and queueing delay"""
+    batcher = app.state.image_batcher
+    if batcher is None:
+        return {"image_model": None}
+    return {"image_model": type(batcher.model).__name__, "batching": batcher.stats.to_dict()}
+
+
 @app.post("/ml/analyze-video")
 async def analyze_video_ml(file: UploadFile = File(...)):
     """
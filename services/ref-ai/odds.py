@@ -0,0 +1,253 @@
+"""
+Live Stream Odds
+In-memory running pool totals per stream with coalesced push to subscribers
+
+Stakes are keyed by their stream_bets id, so a placement delivered twice
+(retries, or a bet already loaded by the startup rebuild) is counted once,
+and a refund only subtracts a stake that is actually counted. At startup
+the pending bets are loaded from the core database (ODDS_DATABASE_URL),
+which also drops bets settled or refunded while the service was down; the
+snapshot is the fallback when that database isn't configured or reachable.
+
+The state lives in process memory: run ref-ai as a single worker and a
+single replica, or subscribers on one process would miss stakes posted to
+another.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+PAYOUT_RATIO = 0.9  # Odds account for the 10% platform fee
+SNAPSHOT_VERSION = 2
+
+_PENDING_QUERY = """
+    SELECT id::text AS bet_id, stream_id::text, prediction, (amount * 100)::bigint AS cents
+    FROM stream_bets
+    WHERE status = 'pending'
+"""
+
+
+class StreamPool:
+    """Running side totals for one stream, in cents, plus the stakes behind them"""
+    __slots__ = ("success", "fail", "stakes", "refunded")
+
+    def __init__(self):
+        self.success = 0
+        self.fail = 0
+        self.stakes: Dict[str, Tuple[str, int]] = {}  # bet_id -> (prediction, cents)
+        self.refunded: Set[str] = set()  # Refunds seen before (or instead of) their placement
+
+    def add(self, bet_id: str, prediction: str, cents: int) -> bool:
+        if bet_id in self.stakes or bet_id in self.refunded:
+            return False
+        if prediction == "success":
+            self.success += cents
+        elif prediction == "fail":
+            self.fail += cents
+        else:
+            raise ValueError(f"Unknown prediction: {prediction}")
+        self.stakes[bet_id] = (prediction, cents)
+        return True
+
+    def remove(self, bet_id: str) -> bool:
+        self.refunded.add(bet_id)
+        stake = self.stakes.pop(bet_id, None)
+        if stake is None:
+            return False
+        prediction, cents = stake
+        if prediction == "success":
+            self.success -= cents
+        else:
+            self.fail -= cents
+        return True
+
+    def odds(self) -> Dict[str, Optional[float]]:
+        total = self.success + self.fail
+        return {
+            "success_pool": self.success / 100,
+            "fail_pool": self.fail / 100,
+            "total_pool": total / 100,
+            "success_odds": round(total / self.success * PAYOUT_RATIO, 2) if self.success else None,
+            "fail_odds": round(total / self.fail * PAYOUT_RATIO, 2) if self.fail else None,
+        }
+
+
+class OddsService:
+    """
+    Per-stream pool aggregates updated in O(1) per stake event
+
+    Subscribers never trigger computation: a ticker recomputes odds only for
+    streams that changed since the last tick, serializes one frame per stream
+    and hands it to every subscriber queue. Queues hold one frame, so a slow
+    client only ever receives the latest odds (older frames are dropped).
+    """
+
+    def __init__(self, tick_seconds: float = 0.25, snapshot_path: Optional[str] = None):
+        self.tick_seconds = tick_seconds
+        self.snapshot_path = snapshot_path
+        self.pools: Dict[str, StreamPool] = {}
+        self._dirty: Set[str] = set()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- Aggregates ----------
+
+    def _pool(self, stream_id: str) -> StreamPool:
+        pool = self.pools.get(stream_id)
+        if pool is None:
+            pool = self.pools[stream_id] = StreamPool()
+        return pool
+
+    def _changed(self, stream_id: str) -> None:
+        if stream_id in self._subscribers:
+            self._dirty.add(stream_id)
+
+    def apply_stake(self, stream_id: str, bet_id: str, prediction: str, amount_cents: int) -> bool:
+        """Count a placed bet; False when it was already counted (or refunded)"""
+        if amount_cents <= 0:
+            raise ValueError("Stake must be positive")
+        applied = self._pool(stream_id).add(bet_id, prediction, amount_cents)
+        if applied:
+            self._changed(stream_id)
+        return applied
+
+    def refund_stake(self, stream_id: str, bet_id: str) -> bool:
+        """Take a refunded bet out of the totals; False when it wasn't counted"""
+        removed = self._pool(stream_id).remove(bet_id)
+        if removed:
+            self._changed(stream_id)
+        return removed
+
+    def odds(self, stream_id: str) -> Dict[str, Optional[float]]:
+        pool = self.pools.get(stream_id)
+        return pool.odds() if pool is not None else StreamPool().odds()
+
+    def close_stream(self, stream_id: str) -> None:
+        """Drop a settled stream's aggregates"""
+        self.pools.pop(stream_id, None)
+        self._dirty.discard(stream_id)
+
+    # ---------- Snapshot / rebuild ----------
+
+    def save_snapshot(self) -> None:
+        """Write the counted stakes, for restarts without the core database"""
+        if not self.snapshot_path:
+            return
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "pools": {
+                sid: {
+                    "stakes": [[bet_id, prediction, cents] for bet_id, (prediction, cents) in p.stakes.items()],
+                    "refunded": sorted(p.refunded),
+                }
+                for sid, p in self.pools.items()
+            },
+        }
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.snapshot_path)
+        logger.info(f"Odds snapshot saved: {len(self.pools)} streams")
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        with open(self.snapshot_path) as f:
+            data = json.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            logger.warning("Odds snapshot has an old format - ignored")
+            return False
+        pools: Dict[str, StreamPool] = {}
+        for sid, saved in data["pools"].items():
+            pool = pools[sid] = StreamPool()
+            for bet_id, prediction, cents in saved["stakes"]:
+                pool.add(bet_id, prediction, cents)
+            pool.refunded.update(saved["refunded"])
+        self.pools = pools
+        logger.info(f"Odds snapshot restored: {len(self.pools)} streams")
+        return True
+
+    async def rebuild(self, database_url: Optional[str]) -> None:
+        """
+        Load pending bets from the core database, else restore the snapshot
+
+        Never raises: a failed load leaves the snapshot state (or empty
+        pools) and the service starts anyway.
+        """
+        try:
+            if database_url and asyncpg is not None:
+                conn = await asyncpg.connect(database_url)
+                try:
+                    rows = await conn.fetch(_PENDING_QUERY)
+                finally:
+                    await conn.close()
+                pools: Dict[str, StreamPool] = {}
+                for row in rows:
+                    pool = pools.get(row["stream_id"])
+                    if pool is None:
+                        pool = pools[row["stream_id"]] = StreamPool()
+                    pool.add(row["bet_id"], row["prediction"], row["cents"])
+                self.pools = pools
+                logger.info(f"Odds rebuilt from database: {len(rows)} pending bets in {len(pools)} streams")
+                return
+            self.load_snapshot()
+        except Exception as e:
+            logger.error(f"Odds rebuild failed - starting from the snapshot if any: {e}")
+            try:
+                self.load_snapshot()
+            except Exception as e:
+                logger.error(f"Odds snapshot restore failed - starting empty: {e}")
+
+    # ---------- Push ----------
+
+    def subscribe(self, stream_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(stream_id, set()).add(queue)
+        queue.put_nowait(json.dumps({"stream_id": stream_id, **self.odds(stream_id)}))
+        return queue
+
+    def unsubscribe(self, stream_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(stream_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[stream_id]
+
+    def _publish(self, stream_id: str) -> None:
+        frame = json.dumps({"stream_id": stream_id, **self.odds(stream_id)})
+        for queue in self._subscribers.get(stream_id, ()):
+            if queue.full():
+                queue.get_nowait()  # Coalesce: replace the undelivered frame
+            queue.put_nowait(frame)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            if not self._dirty:
+                continue
+            dirty: List[str] = list(self._dirty)
+            self._dirty.clear()
+            for stream_id in dirty:
+                self._publish(stream_id)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.save_snapshot()
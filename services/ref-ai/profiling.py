@@ -0,0 +1,242 @@
+"""
+Request Stage Profiling
+Context-var spans, per-stage histograms and a slow-request flight recorder
+
+Hot paths wrap their stages in `with span("rule.text_batch"):`. Outside a
+sampled request the context var is unset and span() returns a shared no-op
+context manager, so instrumented code pays one ContextVar lookup.
+ProfilingMiddleware starts the profile for sampled requests; admin_router()
+serves the results at /admin/profile.
+"""
+import hmac
+import random
+import time
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+_NOOP = nullcontext()
+
+
+class RequestProfile:
+    """Spans recorded for one sampled request"""
+    __slots__ = ("method", "path", "started", "spans")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []  # (stage, start offset, duration) in seconds
+
+    def record(self, stage: str, started: float, duration: float) -> None:
+        self.spans.append((stage, started - self.started, duration))
+
+    def to_dict(self, total: float, status: Optional[int]) -> Dict[str, Any]:
+        stages: Dict[str, float] = {}
+        for stage, _, duration in self.spans:
+            stages[stage] = stages.get(stage, 0.0) + duration
+        attributed = sum(stages.values())
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round(total * 1000, 3),
+            "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in stages.items()},
+            "unattributed_ms": round(max(total - attributed, 0.0) * 1000, 3),
+            "spans": [
+                {"stage": stage, "offset_ms": round(offset * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for stage, offset, duration in self.spans
+            ],
+        }
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+class _Span:
+    __slots__ = ("profile", "stage", "started")
+
+    def __init__(self, profile: RequestProfile, stage: str):
+        self.profile = profile
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profile.record(self.stage, self.started, time.perf_counter() - self.started)
+
+
+def span(stage: str):
+    """Time a stage of the current request (no-op unless the request is sampled)"""
+    profile = _current.get()
+    if profile is None:
+        return _NOOP
+    return _Span(profile, stage)
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram for one stage"""
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "buckets_ms": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(BUCKETS_MS, self.counts)
+            },
+        }
+
+
+class Profiler:
+    """
+    Samples requests, feeds per-stage histograms and keeps the stage
+    breakdown of sampled requests slower than slow_threshold_ms in a ring
+    buffer (the flight recorder)
+    """
+
+    def __init__(self, sample_rate: float = 0.0, slow_threshold_ms: float = 500.0, capacity: int = 256):
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.histograms: Dict[str, StageHistogram] = {}
+        self.slow_requests: deque = deque(maxlen=capacity)
+
+    def configure(self, sample_rate: float, slow_threshold_ms: float, capacity: int) -> None:
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        if capacity != self.slow_requests.maxlen:
+            self.slow_requests = deque(self.slow_requests, maxlen=capacity)
+
+    def start(self, method: str, path: str) -> Optional[RequestProfile]:
+        """Profile for a sampled request, None otherwise"""
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return None
+        return RequestProfile(method, path)
+
+    def finish(self, profile: RequestProfile, status: Optional[int]) -> None:
+        total = time.perf_counter() - profile.started
+        for stage, _, duration in profile.spans:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram()
+            histogram.observe(duration)
+        if total * 1000 >= self.slow_threshold_ms:
+            self.slow_requests.append(profile.to_dict(total, status))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "stages": {stage: h.to_dict() for stage, h in sorted(self.histograms.items())},
+            "slow_requests": list(self.slow_requests),
+        }
+
+
+# Process-wide profiler, configured at service startup
+profiler = Profiler()
+_default_profiler = profiler  # ProfilingMiddleware's argument shadows the name
+
+
+def activate(profile: RequestProfile):
+    """Make profile the current request's profile; returns the reset token"""
+    return _current.set(profile)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+
+# ==================== Middleware ====================
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI so unsampled requests pass straight through - no per-request
+    task or body wrapping like BaseHTTPMiddleware
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Optional[Profiler] = None):
+        self.app = app
+        self.profiler = profiler or _default_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.start(scope["method"], scope["path"])
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = activate(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            deactivate(token)
+            self.profiler.finish(profile, status)
+
+
+# ==================== Admin Endpoints ====================
+
+def require_token(token: Optional[str], expected: Optional[str]) -> None:
+    """404 while no token is configured, 403 unless token matches it (constant time)"""
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if token is None or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+
+def admin_router(admin_token: Callable[[], Optional[str]], **kwargs: Any) -> APIRouter:
+    """
+    /admin/profile endpoints for the process-wide profiler
+    admin_token() is read per request; kwargs go to APIRouter (e.g. tags)
+    """
+    router = APIRouter(**kwargs)
+
+    @router.get("/admin/profile", include_in_schema=False)
+    async def profile_snapshot(x_admin_token: Optional[str] = Header(None)):
+        """Per-stage histograms and the slow-request flight recorder"""
+        require_token(x_admin_token, admin_token())
+        return profiler.snapshot()
+
+    @router.put("/admin/profile/sample-rate", include_in_schema=False)
+    async def set_profile_sample_rate(rate: float, x_admin_token: Optional[str] = Header(None)):
+        """Change the sampling rate at runtime (0 turns spans off)"""
+        require_token(x_admin_token, admin_token())
+        if not 0.0 <= rate <= 1.0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="rate must be in [0, 1]")
+        profiler.sample_rate = rate
+        return {"sample_rate": rate}
+
+    return router
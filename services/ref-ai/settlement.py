@@ -0,0 +1,149 @@
+"""
+Stream Bet Settlement
+Parimutuel pool settlement in exact integer cents (see docs/FEE_CALCULATION.md)
+"""
+import heapq
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, List, Sequence
+
+PLATFORM_FEE_BPS = 1000  # 10% of the total pool, in basis points
+PLATFORM_USER_ID = "platform"
+
+PREDICTIONS = ("success", "fail")
+
+
+@dataclass(frozen=True, slots=True)
+class Stake:
+    """One viewer bet in a stream pool (a stream_bets row)"""
+    bet_id: str
+    bettor_id: str
+    prediction: str
+    amount_cents: int
+
+
+@dataclass(frozen=True, slots=True)
+class BetOutcome:
+    """Settled state for one stream_bets row"""
+    bet_id: str
+    status: str  # won | lost | refunded
+    payout_cents: int
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerEntry:
+    """One transactions row"""
+    user_id: str
+    amount_cents: int
+    type: str  # bet_won | bet_refund | platform_fee
+    reference_id: str
+
+
+@dataclass(slots=True)
+class Settlement:
+    """Result of settling one pool - applied as a single bulk write"""
+    stream_id: str
+    outcome: str
+    total_pool_cents: int
+    platform_fee_cents: int
+    net_pool_cents: int
+    refunded: bool
+    bets: List[BetOutcome] = field(default_factory=list)
+    ledger: List[LedgerEntry] = field(default_factory=list)
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a DECIMAL(10,2) amount to integer cents, rejecting sub-cent values"""
+    cents = Decimal(amount) * 100
+    if cents != cents.to_integral_value():
+        raise ValueError(f"Amount has sub-cent precision: {amount}")
+    return int(cents)
+
+
+def platform_fee(total_cents: int) -> int:
+    """10% of the pool, rounded half-up to the cent ($7.77 -> $0.78)"""
+    return (total_cents * PLATFORM_FEE_BPS + 5000) // 10000
+
+
+def _refund_all(stream_id: str, outcome: str, stakes: Sequence[Stake], total: int) -> Settlement:
+    settlement = Settlement(
+        stream_id=stream_id,
+        outcome=outcome,
+        total_pool_cents=total,
+        platform_fee_cents=0,
+        net_pool_cents=total,
+        refunded=True,
+    )
+    for stake in stakes:
+        settlement.bets.append(BetOutcome(stake.bet_id, "refunded", stake.amount_cents))
+        settlement.ledger.append(
+            LedgerEntry(stake.bettor_id, stake.amount_cents, "bet_refund", stake.bet_id)
+        )
+    return settlement
+
+
+def settle_stream_pool(stream_id: str, outcome: str, stakes: Iterable[Stake]) -> Settlement:
+    """
+    Settle a stream pool for the verified outcome
+
+    Winners share the net pool (total minus the 10% fee) in proportion to
+    their stake. Each payout is floored to the cent; the leftover cents go one
+    each to the winners with the largest fractional remainders (ties by pool
+    order), so payouts always sum to exactly the net pool. A pool with no
+    winners or no losers is refunded in full with no fee (no contest).
+    """
+    if outcome not in PREDICTIONS:
+        raise ValueError(f"Unknown outcome: {outcome}")
+
+    stakes = list(stakes)
+    total = 0
+    winning_pool = 0
+    for stake in stakes:
+        if stake.prediction not in PREDICTIONS:
+            raise ValueError(f"Unknown prediction for bet {stake.bet_id}: {stake.prediction}")
+        if stake.amount_cents <= 0:
+            raise ValueError(f"Stake must be positive for bet {stake.bet_id}")
+        total += stake.amount_cents
+        if stake.prediction == outcome:
+            winning_pool += stake.amount_cents
+
+    if winning_pool == 0 or winning_pool == total:
+        return _refund_all(stream_id, outcome, stakes, total)
+
+    fee = platform_fee(total)
+    net = total - fee
+
+    # Single pass: floored share and remainder for every winner
+    shares = [0] * len(stakes)
+    remainders = []
+    distributed = 0
+    for i, stake in enumerate(stakes):
+        if stake.prediction == outcome:
+            share, remainder = divmod(stake.amount_cents * net, winning_pool)
+            shares[i] = share
+            distributed += share
+            remainders.append((remainder, -i))
+
+    # Largest remainder method for the leftover cents (fewer than the number of winners)
+    for _, neg_index in heapq.nlargest(net - distributed, remainders):
+        shares[-neg_index] += 1
+
+    settlement = Settlement(
+        stream_id=stream_id,
+        outcome=outcome,
+        total_pool_cents=total,
+        platform_fee_cents=fee,
+        net_pool_cents=net,
+        refunded=False,
+    )
+    bets = settlement.bets
+    ledger = settlement.ledger
+    for stake, payout in zip(stakes, shares):
+        if stake.prediction == outcome:
+            bets.append(BetOutcome(stake.bet_id, "won", payout))
+            ledger.append(LedgerEntry(stake.bettor_id, payout, "bet_won", stake.bet_id))
+        else:
+            bets.append(BetOutcome(stake.bet_id, "lost", 0))
+    ledger.append(LedgerEntry(PLATFORM_USER_ID, fee, "platform_fee", stream_id))
+
+    return settlement
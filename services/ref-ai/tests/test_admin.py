@@ -0,0 +1,43 @@
+"""
+Admin Endpoint Tests
+The profiler router and token checks
+"""
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+
+def test_profile_is_hidden_without_a_configured_token(monkeypatch):
+    monkeypatch.delenv("PROFILER_ADMIN_TOKEN", raising=False)
+    assert client.get("/admin/profile", headers={"X-Admin-Token": "anything"}).status_code == 404
+
+
+def test_profile_requires_the_admin_token(monkeypatch):
+    monkeypatch.setenv("PROFILER_ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/profile").status_code == 403
+    assert client.get("/admin/profile", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    # Non-ASCII header values are compared as bytes, not a 500
+    assert client.get("/admin/profile", headers={"X-Admin-Token": "s3crét".encode("latin-1")}).status_code == 403
+
+    response = client.get("/admin/profile", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert set(response.json()) >= {"sample_rate", "stages", "slow_requests"}
+
+
+def test_sample_rate_is_validated(monkeypatch):
+    monkeypatch.setenv("PROFILER_ADMIN_TOKEN", "s3cret")
+    headers = {"X-Admin-Token": "s3cret"}
+    assert client.put("/admin/profile/sample-rate", params={"rate": 2}, headers=headers).status_code == 400
+    response = client.put("/admin/profile/sample-rate", params={"rate": 0}, headers=headers)
+    assert response.json() == {"sample_rate": 0.0}
+
+
+def test_stake_ingest_requires_the_service_token(monkeypatch):
+    monkeypatch.delenv("ODDS_INGEST_TOKEN", raising=False)
+    stake = {"bet_id": "b1", "prediction": "success", "amount": "5.00"}
+    assert client.post("/odds/s1/stakes", json=stake).status_code == 404
+
+    monkeypatch.setenv("ODDS_INGEST_TOKEN", "svc")
+    assert client.post("/odds/s1/stakes", json=stake, headers={"X-Service-Token": "nope"}).status_code == 403
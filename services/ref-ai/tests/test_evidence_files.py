@@ -0,0 +1,55 @@
+"""
+Evidence File Reference Tests
+/verify only reads files the service stored, referenced by their sha256
+"""
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import BetRule, EvidenceType, RuleCondition, RuleEngine, RuleOperator, app
+from uploads import UploadStore
+
+
+@pytest.fixture
+def client(tmp_path):
+    app.state.uploads = UploadStore(directory=str(tmp_path / "uploads"))
+    app.state.rule_engine = RuleEngine()
+    app.state.rule_engine.add_rule(BetRule(
+        rule_id="photo-rule",
+        name="Photo",
+        description="Ball in frame",
+        conditions=[RuleCondition(field="photo", operator=RuleOperator.IMAGE_MATCH, value="ball")],
+        evidence_required=[EvidenceType.PHOTO],
+    ))
+    return TestClient(app)
+
+
+def _verify(client: TestClient, data: dict):
+    return client.post("/verify", data={
+        "bet_id": "bet-1",
+        "user_id": "user-1",
+        "rule_id": "photo-rule",
+        "evidence_type": "photo",
+        "data": json.dumps(data),
+    })
+
+
+@pytest.mark.parametrize("data", [
+    {"file_path": "/etc/passwd"},
+    {"file_path": "http://169.254.169.254/latest/meta-data"},
+    {"sha256": "../../etc/passwd"},
+    {"sha256": "0" * 64},  # Well-formed but never uploaded
+])
+def test_client_paths_and_unknown_digests_are_rejected(client, data):
+    assert _verify(client, data).status_code == 400
+
+
+def test_uploaded_digest_is_resolved_to_the_stored_file(client):
+    digest, _ = app.state.uploads.save(io.BytesIO(b"photo bytes"))
+
+    response = _verify(client, {"sha256": digest, "file_path": "/etc/passwd"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "needs_review"  # No image model configured
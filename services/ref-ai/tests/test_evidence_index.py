@@ -0,0 +1,88 @@
+"""
+Evidence Index Tests
+Content-digest keying: each file is hashed and indexed once
+"""
+import asyncio
+
+from evidence_index import EvidenceIndex
+
+DIGEST_A = "a" * 64
+DIGEST_B = "b" * 64
+
+
+def _index(tmp_path, hashes):
+    index = EvidenceIndex(radius=8, snapshot_path=str(tmp_path / "index.json"))
+    calls = []
+
+    def hash_file(file_path, video):
+        calls.append(file_path)
+        return hashes[file_path]
+
+    index._hash_file = hash_file
+    return index, calls
+
+
+def test_same_content_is_hashed_once_across_bets_and_paths(tmp_path):
+    index, calls = _index(tmp_path, {"/a": (0x0F0F0F0F0F0F0F0F,), "/copy-of-a": (0x0F0F0F0F0F0F0F0F,)})
+
+    async def run():
+        await asyncio.gather(
+            index.register_upload("bet-1", DIGEST_A, "/a"),
+            index.register_upload("bet-1", DIGEST_A, "/a"),
+        )
+        return await index.check("bet-2", DIGEST_A, "/copy-of-a")
+
+    duplicate = asyncio.run(run())
+    assert calls == ["/a"]
+    assert len(index) == 1
+    assert (duplicate.bet_id, duplicate.distance) == ("bet-1", 0)
+
+
+def test_snapshot_restore_keeps_digests(tmp_path):
+    index, _ = _index(tmp_path, {"/a": (1, 2, 3)})
+    asyncio.run(index.register_upload("bet-1", DIGEST_A, "/a", video=True))
+    index.save_snapshot()
+
+    restored, calls = _index(tmp_path, {})
+    assert restored.load_snapshot()
+    assert restored.values(DIGEST_A) == (1, 2, 3)
+    assert asyncio.run(restored.check("bet-1", DIGEST_A, "/a", video=True)) is None
+    assert calls == []  # No re-hash (or video decode) on the verify path
+    assert len(restored) == 3
+
+
+def test_undecodable_files_are_not_retried(tmp_path):
+    index, calls = _index(tmp_path, {})
+
+    def failing(file_path, video):
+        calls.append(file_path)
+        raise OSError("not an image")
+
+    index._hash_file = failing
+    asyncio.run(index.register_upload("bet-1", DIGEST_B, "/b"))
+    assert asyncio.run(index.check("bet-1", DIGEST_B, "/b")) is None
+    assert calls == ["/b"]
+
+
+def test_log_survives_a_crash_without_snapshot(tmp_path):
+    index, _ = _index(tmp_path, {"/a": (7,), "/b": (9, 10)})
+
+    async def run():
+        await index.register_upload("bet-1", DIGEST_A, "/a")
+        await index.register_upload("bet-2", DIGEST_B, "/b", video=True)
+
+    asyncio.run(run())
+    with open(index.log_path, "a") as f:
+        f.write('{"bet": "bet-3", "dig')  # Torn write at the moment of the crash
+    # No save_snapshot() - the process died
+
+    restored, calls = _index(tmp_path, {})
+    assert restored.load_snapshot()
+    assert restored.values(DIGEST_A) == (7,)
+    assert restored.values(DIGEST_B) == (9, 10)
+    assert len(restored) == 3
+    # Compacted: the log is folded into a snapshot and a fresh log starts
+    assert not (tmp_path / "index.json.log").exists()
+    again, _ = _index(tmp_path, {})
+    again.load_snapshot()
+    assert len(again) == 3
@@ -0,0 +1,24 @@
+"""
+Inference Tests
+The backend interface and the fake model
+"""
+import pytest
+
+from inference import FakeImageModel, ImageModel
+
+
+def test_backend_missing_a_method_fails_at_construction():
+    class NoBatch(ImageModel):
+        def preprocess(self, data):
+            return data
+
+    with pytest.raises(TypeError):
+        NoBatch()
+
+
+def test_fake_model_scores_are_deterministic():
+    model = FakeImageModel(labels=("ball", "person"))
+    first, again, other = model.predict_batch([model.preprocess(b"a"), model.preprocess(b"a"), model.preprocess(b"b")])
+    assert first == again != other
+    assert set(first) == {"ball", "person"}
+    assert all(0.0 <= score <= 1.0 for score in first.values())
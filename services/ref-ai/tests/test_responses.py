@@ -0,0 +1,84 @@
+"""
+Response Schema Tests
+Endpoints returning ModelResponse skip response_model validation, so each
+body is checked against its route's schema and FastAPI's own rendering
+"""
+import inspect
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from main import RuleEngine, app
+from odds import OddsService
+
+RULE = {
+    "rule_id": "score-rule",
+    "name": "Score",
+    "description": "Final score over 100",
+    "conditions": [{"field": "score", "operator": "greater_than", "value": 100}],
+    "evidence_required": ["numeric"],
+}
+
+# (method, path, route path, request kwargs) for every ModelResponse endpoint
+CALLS = [
+    ("POST", "/rules", "/rules", {"json": RULE}),
+    ("GET", "/rules/score-rule", "/rules/{rule_id}", {}),
+    ("POST", "/verify", "/verify", {"data": {
+        "bet_id": "bet-1",
+        "user_id": "user-1",
+        "rule_id": "score-rule",
+        "evidence_type": "numeric",
+        "data": json.dumps({"score": 102}),
+    }}),
+    ("POST", "/verify/text-batch", "/verify/text-batch", {"json": {
+        "rule_id": "score-rule",
+        "submissions": [
+            {"bet_id": "bet-2", "user_id": "user-2", "data": {"score": "99"}},
+            {"bet_id": "bet-3", "user_id": "user-3", "data": {}},
+        ],
+    }}),
+    ("POST", "/settle/stream", "/settle/stream", {"json": {
+        "stream_id": "stream-1",
+        "status": "verified",
+        "stakes": [
+            {"bet_id": "s1", "bettor_id": "u1", "prediction": "success", "amount": "10.00"},
+            {"bet_id": "s2", "bettor_id": "u2", "prediction": "fail", "amount": "5.50"},
+        ],
+    }}),
+]
+
+
+def _routes():
+    return {route.path: route for route in app.routes if isinstance(route, APIRoute)}
+
+
+@pytest.fixture(scope="module")
+def client():
+    app.state.rule_engine = RuleEngine()
+    app.state.odds = OddsService()
+    return TestClient(app)
+
+
+def test_every_model_response_endpoint_is_covered():
+    converted = {
+        path for path, route in _routes().items()
+        if "ModelResponse(" in inspect.getsource(route.endpoint)
+    }
+    assert converted == {route_path for _, _, route_path, _ in CALLS}
+
+
+def test_bodies_match_the_response_model(client):
+    routes = _routes()
+    for method, path, route_path, kwargs in CALLS:
+        response = client.request(method, path, **kwargs)
+        assert response.status_code == 200, (path, response.text)
+        assert response.headers["content-type"] == "application/json"
+
+        # Valid against the schema, and identical to FastAPI's response_model rendering
+        model = routes[route_path].response_model
+        validated = TypeAdapter(model).validate_json(response.content)
+        assert response.json() == jsonable_encoder(validated), path
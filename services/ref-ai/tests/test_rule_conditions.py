@@ -0,0 +1,56 @@
+"""
+Rule Condition Tests
+Evidence types are implied only by unambiguous operators; the rest must be explicit
+"""
+import pytest
+
+from main import Condition, EvidenceType, RuleCondition, RuleOperator
+
+
+def _compile(operator: RuleOperator, value, evidence_type=None) -> Condition:
+    return Condition.from_model(
+        RuleCondition(field="f", operator=operator, value=value, evidence_type=evidence_type)
+    )
+
+
+@pytest.mark.parametrize("operator, value, expected", [
+    (RuleOperator.GREATER_THAN, 10, EvidenceType.NUMERIC),
+    (RuleOperator.LESS_THAN, "60", EvidenceType.NUMERIC),
+    (RuleOperator.IN_RANGE, [20, 40], EvidenceType.NUMERIC),
+    (RuleOperator.CONTAINS, "final", EvidenceType.TEXT),
+    (RuleOperator.REGEX, r"\d+", EvidenceType.TEXT),
+    (RuleOperator.IMAGE_MATCH, "ball", EvidenceType.PHOTO),
+    (RuleOperator.VIDEO_CONTAINS, "goal", EvidenceType.VIDEO),
+])
+def test_unambiguous_operators_imply_evidence_type(operator, value, expected):
+    assert _compile(operator, value).evidence_type is expected
+
+
+@pytest.mark.parametrize("operator, value", [
+    (RuleOperator.EQUALS, "42"),
+    (RuleOperator.EQUALS, "lakers"),
+    (RuleOperator.EQUALS, 3),
+    (RuleOperator.NOT_EQUALS, "lakers"),
+    (RuleOperator.IN_RANGE, [40.7, -74.0, 5]),
+])
+def test_ambiguous_conditions_require_evidence_type(operator, value):
+    with pytest.raises(ValueError, match="evidence_type is required"):
+        _compile(operator, value)
+
+
+def test_explicit_evidence_type_disambiguates():
+    assert _compile(RuleOperator.EQUALS, "42", EvidenceType.TEXT).evidence_type is EvidenceType.TEXT
+    assert _compile(RuleOperator.EQUALS, "42", EvidenceType.NUMERIC).value == 42.0
+    gps = _compile(RuleOperator.IN_RANGE, [40.7, -74.0, 5], EvidenceType.GPS)
+    assert gps.value == (40.7, -74.0, 5.0)
+
+
+@pytest.mark.parametrize("operator, value, evidence_type", [
+    (RuleOperator.CONTAINS, "x", EvidenceType.NUMERIC),
+    (RuleOperator.EQUALS, "lakers", EvidenceType.NUMERIC),
+    (RuleOperator.IN_RANGE, [1, 2], EvidenceType.GPS),
+    (RuleOperator.IMAGE_MATCH, "ball", EvidenceType.GPS),
+])
+def test_incompatible_evidence_type_is_rejected(operator, value, evidence_type):
+    with pytest.raises(ValueError):
+        _compile(operator, value, evidence_type)
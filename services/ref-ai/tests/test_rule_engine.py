@@ -0,0 +1,50 @@
+"""
+Rule Engine Tests
+Multi-evidence state across submissions and rule re-posts
+"""
+import asyncio
+
+from main import BetRule, Evidence, EvidenceType, RuleCondition, RuleEngine, RuleOperator, VerificationStatus
+
+
+def _rule(*fields: str) -> BetRule:
+    return BetRule(
+        rule_id="rule-1",
+        name="Rule",
+        description="Numeric thresholds",
+        conditions=[
+            RuleCondition(field=field, operator=RuleOperator.GREATER_THAN, value=10)
+            for field in fields
+        ],
+        evidence_required=[EvidenceType.NUMERIC],
+    )
+
+
+def _verify(engine: RuleEngine, data: dict):
+    rule = engine.compiled_rules["rule-1"]
+    return asyncio.run(engine.verify_evidence(rule, Evidence("bet-1", "user-1", EvidenceType.NUMERIC, data)))
+
+
+def test_state_carries_over_between_submissions():
+    engine = RuleEngine()
+    engine.add_rule(_rule("a", "b"))
+
+    first = _verify(engine, {"a": 20})
+    assert first.status is VerificationStatus.PENDING
+    second = _verify(engine, {"b": 20})
+    assert second.status is VerificationStatus.VERIFIED
+    assert second.matched_conditions == ["a", "b"]
+
+
+def test_reposted_rule_with_more_conditions_starts_fresh_state():
+    engine = RuleEngine()
+    engine.add_rule(_rule("a"))
+    _verify(engine, {"a": 0})
+
+    engine.add_rule(_rule("a", "b", "c"))
+    verdict = _verify(engine, {"c": 20})
+
+    # Evaluated against the new conditions only - no IndexError, no stale "a"
+    assert verdict.status is VerificationStatus.PENDING
+    assert verdict.matched_conditions == ["c"]
+    assert verdict.failed_conditions == []
@@ -0,0 +1,123 @@
+"""
+Stream Pool Settlement Tests
+Fee rounding, exact payout sums and no-contest refunds
+"""
+from decimal import Decimal
+
+import pytest
+
+from settlement import PLATFORM_USER_ID, Stake, platform_fee, settle_stream_pool, to_cents
+
+
+def _stake(i: int, prediction: str, cents: int) -> Stake:
+    return Stake(bet_id=f"bet-{i}", bettor_id=f"user-{i}", prediction=prediction, amount_cents=cents)
+
+
+# ==================== Fee ====================
+
+def test_platform_fee_rounds_half_up():
+    # docs/FEE_CALCULATION.md: $7.77 x 10% = $0.777 -> $0.78, net $6.99
+    assert platform_fee(777) == 78
+    assert 777 - platform_fee(777) == 699
+
+
+@pytest.mark.parametrize("total, fee", [(5, 1), (4, 0), (15, 2), (14, 1), (100, 10), (0, 0)])
+def test_platform_fee_half_cent_boundaries(total, fee):
+    assert platform_fee(total) == fee
+
+
+def test_to_cents_rejects_sub_cent_amounts():
+    assert to_cents(Decimal("7.77")) == 777
+    with pytest.raises(ValueError):
+        to_cents(Decimal("0.001"))
+
+
+# ==================== Payouts ====================
+
+def test_payouts_sum_to_net_pool_exactly():
+    stakes = [
+        _stake(0, "success", 333),
+        _stake(1, "success", 777),
+        _stake(2, "success", 1),
+        _stake(3, "fail", 1009),
+        _stake(4, "fail", 250),
+    ]
+    settlement = settle_stream_pool("stream-1", "success", stakes)
+
+    total = sum(stake.amount_cents for stake in stakes)
+    assert settlement.total_pool_cents == total
+    assert settlement.platform_fee_cents == platform_fee(total)
+    assert settlement.net_pool_cents == total - settlement.platform_fee_cents
+    assert sum(bet.payout_cents for bet in settlement.bets) == settlement.net_pool_cents
+    # Every cent of the pool is accounted for in the ledger
+    assert sum(entry.amount_cents for entry in settlement.ledger) == total
+
+
+def test_payouts_are_proportional_within_a_cent():
+    stakes = [_stake(0, "success", 100), _stake(1, "success", 300), _stake(2, "fail", 611)]
+    settlement = settle_stream_pool("stream-1", "success", stakes)
+
+    net = settlement.net_pool_cents
+    for stake, bet in zip(stakes[:2], settlement.bets[:2]):
+        exact = stake.amount_cents * net / 400
+        assert abs(bet.payout_cents - exact) < 1
+    assert settlement.bets[2].status == "lost"
+    assert settlement.bets[2].payout_cents == 0
+
+
+def test_leftover_cents_go_to_earliest_stakes_on_ties():
+    # Total 401 -> fee 40, net 361 shared by three equal stakes: 120.33 each
+    stakes = [
+        _stake(0, "success", 100),
+        _stake(1, "success", 100),
+        _stake(2, "success", 100),
+        _stake(3, "fail", 101),
+    ]
+    settlement = settle_stream_pool("stream-1", "success", stakes)
+
+    assert settlement.net_pool_cents == 361
+    assert [bet.payout_cents for bet in settlement.bets[:3]] == [121, 120, 120]
+
+
+def test_leftover_cents_follow_largest_remainder():
+    # Net 90 over stakes 1/2/4 of 7: 12.86, 25.71, 51.43 -> floors 12/25/51 leave two cents,
+    # which go to the two largest remainders (6/7 and 5/7), not to the largest stake
+    stakes = [_stake(0, "fail", 1), _stake(1, "fail", 2), _stake(2, "fail", 4), _stake(3, "success", 93)]
+    settlement = settle_stream_pool("stream-1", "fail", stakes)
+
+    assert settlement.net_pool_cents == 90
+    assert [bet.payout_cents for bet in settlement.bets[:3]] == [13, 26, 51]
+
+
+def test_platform_fee_ledger_entry():
+    stakes = [_stake(0, "success", 500), _stake(1, "fail", 500)]
+    settlement = settle_stream_pool("stream-9", "success", stakes)
+
+    fee_entries = [entry for entry in settlement.ledger if entry.type == "platform_fee"]
+    assert len(fee_entries) == 1
+    assert fee_entries[0].user_id == PLATFORM_USER_ID
+    assert fee_entries[0].amount_cents == 100
+    assert fee_entries[0].reference_id == "stream-9"
+
+
+# ==================== No contest ====================
+
+@pytest.mark.parametrize("outcome", ["success", "fail"])
+def test_one_sided_pool_is_refunded_without_fee(outcome):
+    stakes = [_stake(0, "success", 250), _stake(1, "success", 777)]
+    settlement = settle_stream_pool("stream-1", outcome, stakes)
+
+    assert settlement.refunded
+    assert settlement.platform_fee_cents == 0
+    assert settlement.net_pool_cents == settlement.total_pool_cents == 1027
+    assert [(bet.status, bet.payout_cents) for bet in settlement.bets] == [("refunded", 250), ("refunded", 777)]
+    assert [entry.type for entry in settlement.ledger] == ["bet_refund", "bet_refund"]
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError):
+        settle_stream_pool("stream-1", "draw", [])
+    with pytest.raises(ValueError):
+        settle_stream_pool("stream-1", "success", [_stake(0, "maybe", 100)])
+    with pytest.raises(ValueError):
+        settle_stream_pool("stream-1", "success", [_stake(0, "success", 0)])
@@ -0,0 +1,99 @@
+"""
+Text Matching Tests
+Normalized literals, pattern validation and the backtracking budget
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import text_match
+from main import Condition, RuleCondition, RuleEngine, RuleOperator, app
+from text_match import TextMatcher, compile_text_pattern, normalize_text
+
+CATASTROPHIC = r"^(a+)+$"
+
+
+# ==================== Literals ====================
+
+def test_normalize_text_folds_case_and_whitespace():
+    assert normalize_text("  Lakers \n WIN\t") == "lakers win"
+    assert normalize_text(42) == "42"
+
+
+@pytest.mark.parametrize("operator, value, text, expected", [
+    ("equals", "Lakers Win", "  lakers   WIN ", True),
+    ("equals", "Lakers Win", "Lakers lose", False),
+    ("not_equals", "Lakers Win", "LAKERS WIN", False),
+    ("not_equals", "Lakers Win", "Celtics win", True),
+    ("contains", "Final  Score", "FINAL SCORE: 102-99", True),
+    ("contains", "overtime", "FINAL SCORE: 102-99", False),
+    ("equals", 42, "42", True),
+])
+def test_literal_operators_compare_normalized_text(operator, value, text, expected):
+    pattern = compile_text_pattern(operator, value)
+    assert pattern.linear
+    assert pattern.matches(text) is expected
+
+
+# ==================== Validation ====================
+
+@pytest.mark.parametrize("operator, value", [
+    ("regex", "(unclosed"),
+    ("regex", "a" * (text_match.MAX_PATTERN_LENGTH + 1)),
+    ("contains", ["not", "text"]),
+    ("greater_than", "10"),
+])
+def test_invalid_patterns_raise(operator, value):
+    with pytest.raises(ValueError):
+        compile_text_pattern(operator, value)
+
+
+def test_invalid_regex_rule_is_rejected_with_400():
+    app.state.rule_engine = RuleEngine()
+    client = TestClient(app)
+    response = client.post("/rules", json={
+        "rule_id": "bad-regex",
+        "name": "Bad regex",
+        "description": "Unclosed group",
+        "conditions": [{"field": "score", "operator": "regex", "value": "(unclosed"}],
+        "evidence_required": ["text"],
+    })
+    assert response.status_code == 400
+    assert "bad-regex" not in app.state.rule_engine.compiled_rules
+
+
+# ==================== Budget ====================
+
+def test_catastrophic_regex_hits_budget_without_blocking(monkeypatch):
+    monkeypatch.setattr(text_match, "re2", None)  # Force the backtracking engine
+    condition = Condition.from_model(
+        RuleCondition(field="score", operator=RuleOperator.REGEX, value=CATASTROPHIC)
+    )
+    assert not condition.value.linear
+
+    async def run():
+        engine = RuleEngine(text_matcher=TextMatcher(timeout=0.2))
+        await engine.text_matcher._get_pool()  # Worker start-up isn't part of the budget
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        started = time.monotonic()
+        try:
+            result = await engine.evaluate_text(condition, "a" * 40 + "b")
+        finally:
+            task.cancel()
+            engine.text_matcher.close()
+        return result, time.monotonic() - started, ticks
+
+    result, elapsed, ticks = asyncio.run(run())
+    assert result == (False, 0.5)  # Undecided - left to manual review
+    assert elapsed < 2.0
+    assert ticks >= 5  # The event loop kept running while the worker was stuck
@@ -0,0 +1,87 @@
+"""
+Upload Store Tests
+Resumable appends, content-addressed finals and the expiry sweep
+"""
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from uploads import ChecksumMismatch, OffsetMismatch, UploadStore, UploadTooLarge
+
+
+async def _body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _dropped(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+    raise ConnectionError("client went away")
+
+
+def test_resumed_upload_finalizes_under_the_evidence_dir(tmp_path):
+    store = UploadStore(directory=str(tmp_path))
+    data = b"x" * 3000 + b"y" * 3000
+
+    async def run():
+        upload = store.create("bet-1", "photo", "../../etc/passwd", len(data))
+        with pytest.raises(ConnectionError):
+            await store.append(upload.upload_id, 0, _dropped(data[:1000], data[1000:2500]))
+        assert upload.offset == 2500  # Everything received before the drop is kept
+        with pytest.raises(OffsetMismatch):
+            await store.append(upload.upload_id, 0, _body(data))
+        await store.append(upload.upload_id, 2500, _body(data[2500:]))
+        with pytest.raises(ChecksumMismatch):
+            await store.finalize(upload.upload_id, "0" * 64)
+        return await store.finalize(upload.upload_id, hashlib.sha256(data).hexdigest())
+
+    digest = asyncio.run(run())
+    path = store.evidence_path(digest)
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), "evidence")
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_save_copies_and_hashes_in_chunks(tmp_path):
+    store = UploadStore(directory=str(tmp_path), max_size=10)
+    digest, size = store.save(io.BytesIO(b"evidence"))
+    assert (digest, size) == (hashlib.sha256(b"evidence").hexdigest(), 8)
+    with pytest.raises(UploadTooLarge):
+        store.save(io.BytesIO(b"much too large"))
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_sweep_expires_idle_uploads_without_new_creates(tmp_path):
+    now = [0.0]
+    store = UploadStore(directory=str(tmp_path), expiry_seconds=10, clock=lambda: now[0])
+    upload = store.create("bet-1", "video", "clip.mp4", 100)
+
+    async def run():
+        now[0] = 60.0
+        store.start(interval=0.01)
+        await asyncio.sleep(0.05)
+        await store.stop()
+
+    asyncio.run(run())
+    assert len(store) == 0
+    assert not os.path.exists(upload.path)
+
+
+@pytest.mark.parametrize("bet_id", ["../etc", "a/b", "", "x" * 65])
+def test_unsafe_bet_ids_are_rejected(bet_id):
+    client = TestClient(app)
+    response = client.post("/uploads", json={"bet_id": bet_id, "evidence_type": "photo", "filename": "a.jpg", "length": 1})
+    assert response.status_code == 422
+    response = client.post(
+        "/upload-evidence",
+        data={"bet_id": bet_id, "evidence_type": "photo"},
+        files={"file": ("a.jpg", b"x")},
+    )
+    assert response.status_code == 422
@@ -0,0 +1,170 @@
+"""
+Text Evidence Matching
+Pre-compiled text operators with a linear-time engine or an execution budget
+"""
+import asyncio
+import logging
+import multiprocessing
+import re
+from typing import Any, List, Optional
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional dependency
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+MAX_PATTERN_LENGTH = 1000
+
+TEXT_OPERATORS = ("equals", "not_equals", "contains", "regex")
+
+
+def normalize_text(text: Any) -> str:
+    """Case- and whitespace-insensitive form, so OCR spacing/case noise doesn't fail a match"""
+    return " ".join(str(text).split()).casefold()
+
+
+class TextPattern:
+    """
+    Text condition compiled once at rule creation
+
+    equals / not_equals / contains compare normalized literals. Regexes are
+    compiled with RE2 when google-re2 is installed (linear time, safe inline);
+    otherwise they are validated with re and run in a worker process under a
+    budget (see TextMatcher).
+    """
+    __slots__ = ("operator", "source", "literal", "regex", "linear")
+
+    def __init__(self, operator: str, source: str):
+        self.operator = operator
+        self.source = source
+        self.literal: Optional[str] = None
+        self.regex = None
+        self.linear = True
+
+        if operator == "regex":
+            if len(source) > MAX_PATTERN_LENGTH:
+                raise ValueError(f"Pattern longer than {MAX_PATTERN_LENGTH} characters")
+            if re2 is not None:
+                try:
+                    self.regex = re2.compile(source)
+                except re2.error as e:
+                    raise ValueError(f"Invalid or unsupported pattern: {e}") from e
+            else:
+                try:
+                    re.compile(source)
+                except re.error as e:
+                    raise ValueError(f"Invalid pattern: {e}") from e
+                self.linear = False
+        else:
+            self.literal = normalize_text(source)
+
+    def matches(self, text: str) -> bool:
+        """Inline match - only valid for linear patterns"""
+        if self.operator == "regex":
+            return self.regex.search(text) is not None
+        if self.operator == "contains":
+            return self.literal in normalize_text(text)
+        if self.operator == "equals":
+            return normalize_text(text) == self.literal
+        return normalize_text(text) != self.literal  # not_equals
+
+
+def compile_text_pattern(operator: str, value: Any) -> TextPattern:
+    """Compile a text condition value; ValueError for unsupported operators or bad patterns"""
+    if operator not in TEXT_OPERATORS:
+        raise ValueError(f"Operator {operator} does not apply to text evidence")
+    if not isinstance(value, (str, int, float)):
+        raise ValueError(f"Text condition value must be a string, got {type(value).__name__}")
+    return TextPattern(operator, str(value))
+
+
+# ==================== Budgeted Execution ====================
+
+def _search_all(source: str, texts: List[str]) -> List[bool]:
+    regex = re.compile(source)  # Cached by re inside the worker
+    return [regex.search(text) is not None for text in texts]
+
+
+def _warm_up() -> None:
+    return None
+
+
+def _resolve(future: asyncio.Future, result: Any, error: bool = False) -> None:
+    if future.done():
+        return  # Budget already expired
+    if error:
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+class TextMatcher:
+    """
+    Runs compiled text patterns against evidence text
+
+    Linear patterns run inline. Backtracking regexes (no RE2) run in a
+    worker process; if a call exceeds timeout seconds per text (catastrophic
+    backtracking on a user-supplied pattern) the workers are killed and the
+    texts come back as None - undecided - instead of stalling the event loop.
+    A batch sends one pattern and many texts to a worker in a single call.
+    """
+
+    def __init__(self, timeout: float = 0.1, workers: int = 1):
+        self.timeout = timeout
+        self.workers = workers
+        self._pool = None
+        self._starting = asyncio.Lock()
+
+    async def match(self, pattern: TextPattern, text: str) -> Optional[bool]:
+        return (await self.match_many(pattern, [text]))[0]
+
+    async def match_many(self, pattern: TextPattern, texts: List[str]) -> List[Optional[bool]]:
+        """Match one pattern against many texts; None where the budget ran out"""
+        if pattern.linear:
+            return [pattern.matches(text) for text in texts]
+        if not texts:
+            return []
+
+        pool = await self._get_pool()
+        try:
+            return await asyncio.wait_for(
+                self._submit(pool, _search_all, (pattern.source, texts)),
+                timeout=self.timeout * len(texts),
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Regex exceeded its budget, killing workers: {pattern.source[:100]!r}")
+            self._discard(pool)
+            return [None] * len(texts)
+
+    async def _get_pool(self):
+        async with self._starting:
+            if self._pool is None:
+                pool = multiprocessing.get_context("spawn").Pool(processes=self.workers)
+                await self._submit(pool, _warm_up, ())  # Process start-up is not part of the budget
+                self._pool = pool
+            return self._pool
+
+    @staticmethod
+    def _submit(pool, func, args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pool.apply_async(
+            func,
+            args,
+            callback=lambda result: loop.call_soon_threadsafe(_resolve, future, result),
+            error_callback=lambda exc: loop.call_soon_threadsafe(_resolve, future, exc, True),
+        )
+        return future
+
+    def _discard(self, pool) -> None:
+        if self._pool is pool:
+            self._pool = None
+        # terminate() joins the workers - keep it off the event loop
+        asyncio.get_running_loop().run_in_executor(None, pool.terminate)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
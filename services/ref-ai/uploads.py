@@ -0,0 +1,290 @@
+"""
+Resumable Uploads
+tus-style chunked evidence uploads with on-disk partial files
+
+A client creates an upload with its total length, then PATCHes bytes at the
+current offset; a dropped connection keeps everything written so far, and
+HEAD tells the client where to resume, so a retry only resends the missing
+bytes. The SHA-256 is fed as chunks arrive, so finalizing never re-reads
+the file. Abandoned uploads expire and their partial files are removed.
+
+Finished evidence is content-addressed: UPLOAD_DIR/evidence/<sha256>. Partial
+files live in UPLOAD_DIR too, so finalizing is a same-filesystem rename, and
+no client-supplied name or id ever becomes part of a path.
+"""
+import asyncio
+import glob
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+from typing import IO, Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bet ids accepted by the upload endpoints (UUIDs and similar opaque ids)
+BET_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+# Stored evidence is named by its hex SHA-256
+CONTENT_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+WRITE_BUFFER_BYTES = 1024 * 1024  # Request chunks are coalesced into writes this size
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadNotFound(LookupError):
+    pass
+
+
+class OffsetMismatch(ValueError):
+    """PATCH offset isn't the upload's current offset (client must HEAD and resume)"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class UploadBusy(RuntimeError):
+    """Another PATCH is still writing to the upload"""
+
+
+class ChecksumMismatch(ValueError):
+    pass
+
+
+class Upload:
+    """One in-progress upload"""
+    __slots__ = (
+        "upload_id",
+        "bet_id",
+        "evidence_type",
+        "filename",
+        "length",
+        "offset",
+        "path",
+        "hasher",
+        "lock",
+        "updated_at",
+    )
+
+    def __init__(self, upload_id: str, bet_id: str, evidence_type: str, filename: str, length: int, path: str, now: float):
+        self.upload_id = upload_id
+        self.bet_id = bet_id
+        self.evidence_type = evidence_type
+        self.filename = filename
+        self.length = length
+        self.offset = 0
+        self.path = path
+        self.hasher = hashlib.sha256()
+        self.lock = asyncio.Lock()
+        self.updated_at = now
+
+    @property
+    def complete(self) -> bool:
+        return self.offset == self.length
+
+
+class UploadStore:
+    """
+    In-progress uploads keyed by id
+
+    Hash state lives in memory, so uploads don't survive a restart - leftover
+    partial files are removed at startup. Uploads idle for expiry_seconds
+    are dropped by the periodic sweep (start()) and on create. File writes,
+    hashing and renames run in the default executor, off the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str = "/tmp/ref-ai-uploads",
+        max_size: int = 500 * 1024 * 1024,
+        expiry_seconds: float = 24 * 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.expiry_seconds = expiry_seconds
+        self.clock = clock
+        self.evidence_dir = os.path.join(directory, "evidence")
+        self._uploads: Dict[str, Upload] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        os.makedirs(self.evidence_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.part")):
+            os.remove(path)
+
+    def __len__(self) -> int:
+        return len(self._uploads)
+
+    def create(self, bet_id: str, evidence_type: str, filename: str, length: int) -> Upload:
+        if length < 0:
+            raise ValueError("Upload length must be non-negative")
+        if length > self.max_size:
+            raise UploadTooLarge(f"Upload exceeds {self.max_size} bytes")
+        now = self.clock()
+        self.expire(now)
+        upload_id = uuid.uuid4().hex
+        path = os.path.join(self.directory, f"{upload_id}.part")
+        open(path, "wb").close()
+        upload = Upload(upload_id, bet_id, evidence_type, os.path.basename(filename), length, path, now)
+        self._uploads[upload_id] = upload
+        return upload
+
+    def evidence_path(self, digest: str) -> str:
+        return os.path.join(self.evidence_dir, digest)
+
+    def resolve(self, digest: Any) -> str:
+        """Path of stored evidence by SHA-256; UploadNotFound unless it is a stored digest"""
+        if not isinstance(digest, str) or not CONTENT_HASH.match(digest):
+            raise UploadNotFound(digest)
+        path = self.evidence_path(digest)
+        if not os.path.isfile(path):
+            raise UploadNotFound(digest)
+        return path
+
+    def get(self, upload_id: str) -> Upload:
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise UploadNotFound(upload_id)
+        return upload
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> Upload:
+        """
+        Write a request body at offset
+
+        Chunks are coalesced into WRITE_BUFFER_BYTES writes, each written and
+        hashed in the executor. Bytes are committed (offset, hash) as each
+        write lands, and whatever is buffered is written when the body ends
+        early, so a dropped connection still advances the offset.
+        """
+        upload = self.get(upload_id)
+        if upload.lock.locked():
+            raise UploadBusy(upload_id)
+        async with upload.lock:
+            if offset != upload.offset:
+                raise OffsetMismatch(upload.offset)
+            loop = asyncio.get_running_loop()
+            f = await loop.run_in_executor(None, open, upload.path, "r+b")
+            try:
+                buffer = bytearray()
+                try:
+                    async for chunk in chunks:
+                        if not chunk:
+                            continue
+                        if upload.offset + len(buffer) + len(chunk) > upload.length:
+                            raise UploadTooLarge("Chunk runs past the declared upload length")
+                        buffer += chunk
+                        if len(buffer) >= WRITE_BUFFER_BYTES:
+                            await loop.run_in_executor(None, self._write, f, upload, bytes(buffer))
+                            buffer.clear()
+                finally:
+                    if buffer:
+                        await loop.run_in_executor(None, self._write, f, upload, bytes(buffer))
+            finally:
+                upload.updated_at = self.clock()
+                await loop.run_in_executor(None, f.close)
+        return upload
+
+    @staticmethod
+    def _write(f: IO[bytes], upload: Upload, data: bytes) -> None:
+        f.seek(upload.offset)
+        f.write(data)
+        upload.hasher.update(data)
+        upload.offset += len(data)
+
+    async def finalize(self, upload_id: str, sha256: Optional[str] = None) -> str:
+        """Move a complete upload into the evidence directory; returns its hex SHA-256"""
+        upload = self.get(upload_id)
+        if upload.lock.locked():
+            raise UploadBusy(upload_id)
+        if not upload.complete:
+            raise OffsetMismatch(upload.offset)
+        digest = upload.hasher.hexdigest()
+        if sha256 is not None and sha256.lower() != digest:
+            raise ChecksumMismatch("Uploaded content doesn't match the checksum")
+        del self._uploads[upload_id]
+        await asyncio.get_running_loop().run_in_executor(None, os.replace, upload.path, self.evidence_path(digest))
+        return digest
+
+    def save(self, source: IO[bytes]) -> Tuple[str, int]:
+        """
+        Copy a whole file (a multipart upload) into the evidence directory;
+        returns (hex SHA-256, size). Blocking - run it in a thread.
+        """
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.part")
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with open(path, "wb") as f:
+                while True:
+                    chunk = source.read(COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise UploadTooLarge(f"Upload exceeds {self.max_size} bytes")
+                    f.write(chunk)
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            os.replace(path, self.evidence_path(digest))
+        except BaseException:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            raise
+        return digest, size
+
+    def delete(self, upload_id: str) -> None:
+        upload = self._uploads.pop(upload_id, None)
+        if upload is None:
+            raise UploadNotFound(upload_id)
+        self._remove(upload)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop uploads idle for longer than expiry_seconds"""
+        cutoff = (self.clock() if now is None else now) - self.expiry_seconds
+        expired = [
+            upload for upload in self._uploads.values()
+            if upload.updated_at < cutoff and not upload.lock.locked()
+        ]
+        for upload in expired:
+            del self._uploads[upload.upload_id]
+            self._remove(upload)
+        if expired:
+            logger.info(f"Expired {len(expired)} abandoned uploads")
+        return len(expired)
+
+    def start(self, interval: float = 300.0) -> None:
+        """Sweep expired uploads every interval seconds, not only when a new one is created"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep(interval))
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def _sweep(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.expire()
+            except Exception as e:
+                logger.warning(f"Upload expiry sweep failed: {e}")
+
+    @staticmethod
+    def _remove(upload: Upload) -> None:
+        try:
+            os.remove(upload.path)
+        except FileNotFoundError:
+            pass
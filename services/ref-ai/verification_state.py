@@ -0,0 +1,117 @@
+"""
+Per-Bet Verification State
+Incremental multi-evidence accumulation with TTL eviction
+"""
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Sequence
+
+PENDING = -1.0  # Confidence slot value for a condition with no evidence yet
+
+
+class BetAccumulator:
+    """
+    Best confidence per condition plus the running weighted sum
+
+    Each new result only adjusts the sum by weight * (new_best - old_best),
+    so a verdict never replays earlier evidence. duplicate_of is set once
+    any of the bet's evidence near-duplicates another bet's, and keeps the
+    bet in review for the rest of its life.
+    """
+    __slots__ = ("confidences", "matches", "weighted_sum", "pending", "settled", "duplicate_of")
+
+    def __init__(self, condition_count: int):
+        self.confidences = array("d", [PENDING]) * condition_count
+        self.matches = bytearray(condition_count)
+        self.weighted_sum = 0.0
+        self.pending = condition_count
+        self.settled = False
+        self.duplicate_of: Optional[tuple] = None  # (bet_id, hamming distance)
+
+    def update(self, position: int, match: bool, confidence: float, weight: float) -> None:
+        """Record an evaluation; keeps the best confidence seen for the condition"""
+        previous = self.confidences[position]
+        if previous == PENDING:
+            self.pending -= 1
+            previous = 0.0
+        elif confidence <= previous:
+            if match:
+                self.matches[position] = 1
+            return
+
+        self.confidences[position] = confidence
+        self.weighted_sum += (confidence - previous) * weight
+        if match:
+            self.matches[position] = 1
+
+
+class VerificationStore:
+    """
+    Accumulators keyed by (rule_id, rule version, bet_id)
+
+    Open bets expire ttl_seconds after their last evidence; settled bets are
+    kept for settled_ttl_seconds (late duplicate uploads) and then dropped.
+    Each bucket is ordered by last touch, so eviction pops from the front.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 7 * 24 * 3600,
+        settled_ttl_seconds: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.settled_ttl_seconds = settled_ttl_seconds
+        self.clock = clock
+        self._open: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._settled: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._open) + len(self._settled)
+
+    def get(self, key: Hashable, condition_count: int) -> BetAccumulator:
+        """Accumulator for a bet, created on first evidence"""
+        now = self.clock()
+        self._evict(now)
+        entry = self._settled.get(key) or self._open.get(key)
+        if entry is None:
+            accumulator = BetAccumulator(condition_count)
+        else:
+            accumulator = entry[1]
+        self.touch(key, accumulator, now)
+        return accumulator
+
+    def touch(self, key: Hashable, accumulator: BetAccumulator, now: Optional[float] = None) -> None:
+        """Move a bet to the back of its bucket (settled or open)"""
+        now = self.clock() if now is None else now
+        self._open.pop(key, None)
+        self._settled.pop(key, None)
+        bucket = self._settled if accumulator.settled else self._open
+        bucket[key] = (now, accumulator)
+
+    def _evict(self, now: float) -> None:
+        for bucket, ttl in ((self._open, self.ttl_seconds), (self._settled, self.settled_ttl_seconds)):
+            while bucket:
+                touched_at = next(iter(bucket.values()))[0]
+                if now - touched_at < ttl:
+                    break
+                bucket.popitem(last=False)
+
+
+def weighted_confidence(accumulator: BetAccumulator, total_weight: float) -> float:
+    return accumulator.weighted_sum / total_weight if total_weight > 0 else 0.0
+
+
+def split_conditions(accumulator: BetAccumulator, fields: Sequence[str]):
+    """(matched, failed) field names; pending conditions are in neither"""
+    matched = []
+    failed = []
+    for field, confidence, match in zip(fields, accumulator.confidences, accumulator.matches):
+        if confidence == PENDING:
+            continue
+        if match:
+            matched.append(field)
+        else:
+            failed.append(field)
+    return matched, failed
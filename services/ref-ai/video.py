@@ -0,0 +1,99 @@
+"""
+Video Keyframes
+Lazy decode of evidence clips into sampled keyframes
+
+Frames are decoded one at a time with PyAV and yielded as JPEG bytes (the
+input the image models take) when the sampling interval has passed or the
+picture changed enough to be a new scene. Nothing beyond the current frame
+is held in memory, and closing the generator stops decoding - evaluators
+that reach their threshold early never touch the rest of the clip.
+"""
+import io
+import logging
+from typing import Iterator, Optional
+
+try:
+    import av
+except ImportError:  # pragma: no cover - optional dependency
+    av = None
+
+logger = logging.getLogger(__name__)
+
+THUMB_SIZE = 16  # Scene-change detection compares 16x16 grayscale thumbnails
+
+
+class Keyframe:
+    """One sampled frame"""
+    __slots__ = ("timestamp", "data")
+
+    def __init__(self, timestamp: float, data: bytes):
+        self.timestamp = timestamp
+        self.data = data
+
+
+def _thumbnail(frame) -> bytes:
+    """16x16 grayscale pixels, scaled by the decoder (no full-size conversion)"""
+    small = frame.reformat(width=THUMB_SIZE, height=THUMB_SIZE, format="gray")
+    plane = small.planes[0]
+    rows = bytes(plane)
+    stride = plane.line_size  # Rows may be padded for alignment
+    return b"".join(rows[i * stride:i * stride + THUMB_SIZE] for i in range(THUMB_SIZE))
+
+
+def _difference(a: bytes, b: bytes) -> float:
+    """Mean absolute pixel difference, 0..1"""
+    return sum(abs(x - y) for x, y in zip(a, b)) / (len(a) * 255)
+
+
+class KeyframeSampler:
+    """
+    Keyframe sampling policy
+
+    A frame is kept when sample_interval seconds have passed since the last
+    kept frame, or when its thumbnail differs from the last kept one by more
+    than scene_threshold (0 disables scene detection). At most max_frames
+    frames are produced per clip.
+    """
+
+    def __init__(self, sample_fps: float = 1.0, scene_threshold: float = 0.3, max_frames: int = 120):
+        self.sample_interval = 1.0 / sample_fps if sample_fps > 0 else float("inf")
+        self.scene_threshold = scene_threshold
+        self.max_frames = max_frames
+
+    @property
+    def available(self) -> bool:
+        return av is not None
+
+    def frames(self, path: str) -> Iterator[Keyframe]:
+        """Generator of sampled keyframes - close it to stop decoding"""
+        if av is None:
+            raise RuntimeError("Video decoding needs PyAV installed")
+        container = av.open(path)
+        try:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            last_time: Optional[float] = None
+            last_thumb: Optional[bytes] = None
+            produced = 0
+            for frame in container.decode(stream):
+                timestamp = frame.time or 0.0
+                due = last_time is None or timestamp - last_time >= self.sample_interval
+                thumb = None
+                if not due and self.scene_threshold > 0:
+                    thumb = _thumbnail(frame)
+                    due = _difference(thumb, last_thumb) > self.scene_threshold
+                if not due:
+                    continue
+
+                if self.scene_threshold > 0:
+                    last_thumb = thumb or _thumbnail(frame)
+                last_time = timestamp
+                buffer = io.BytesIO()
+                frame.to_image().save(buffer, format="JPEG", quality=90)
+                yield Keyframe(timestamp, buffer.getvalue())
+
+                produced += 1
+                if produced >= self.max_frames:
+                    return
+        finally:
+            container.close()